@@ -1,121 +1,218 @@
 #!/usr/bin/env python3
 
+import argparse
 import random
+from typing import List, Optional
 
-from helpers import clear_console, centred_text
+from helpers import clear_console, centred_text, input_text, print_text
 
 # Refactoring of the "Acey Ducey" BASIC game from the 1978 book BASIC Computer
 # Games by Creative Computing into Python 3
 # Original author is Bill Palmby of Prairie View, Illinois
 
-def main() -> None:
-    """Main game loop
-    """
+STARTING_MONEY = 100
+
+# Cards run from 2 to 14 (Ace=14)
+LOWEST_CARD = 2
+HIGHEST_CARD = 14
+
+# Names of the picture cards - other cards are shown as their number
+CARD_NAMES = {11: "JACK", 12: "QUEEN", 13: "KING", 14: "ACE"}
+
+INTRO_TEXT = (
+    "ACEY-DUCEY IS PLAYED IN THE FOLLOWING MANNER \n"
+    "THE DEALER (COMPUTER) DEALS TWO CARDS FACE UP\n"
+    "YOU HAVE AN OPTION TO BET OR NOT BET DEPENDING\n"
+    "ON WHETHER OR NOT YOU FEEL THE CARD WILL HAVE\n"
+    "A VALUE BETWEEN THE FIRST TWO.\n"
+    "IF YOU DO NOT WANT TO BET, INPUT A 0\n"
+    )
 
-    def random_card() -> int:
+BET_PROMPT = "WHAT IS YOUR BET\n"
+TRY_AGAIN_PROMPT = "TRY AGAIN (YES OR NO)\n"
+
+
+def card_name(card: int) -> str:
+    """
+    Returns the integer or text value of a playing card.
+    Args:
+        card: int- An integer representing a playing card
+    Returns:
+        str: the name of the card
+    """
+    return CARD_NAMES.get(card, str(card))
+
+
+class AceyDuceyGame:
+    """Acey Ducey as a state machine that takes lines of input and returns
+    the text to show, so that a game can be driven by a console, a network
+    session or a test without blocking on input().
+    Attributes:
+    -----------
+    rng: random.Random
+        Source of the cards.
+    current_money: int
+        The player's money.
+    state: str
+        "bet" while waiting for a bet, "try_again" while waiting for an
+        answer to TRY AGAIN, and "over" once the game has finished.
+    first_card, second_card: int
+        The two cards dealt face up.
+    hints: bool
+        Whether each deal shows the exact odds and a suggested bet from
+        aceyducey_odds.
+    Methods:
+    --------
+    start() -> str:
+        Returns the introduction and the first deal, ending with the prompt
+        for a bet.
+    send(line: str) -> str:
+        Plays a line of input and returns the text up to the next prompt.
+    """
+    def __init__(
+            self, rng: Optional[random.Random]=None, hints: bool=False
+            ) -> None:
+        self.rng = rng if rng is not None else random.Random()
+        self.hints = hints
+        self.current_money = STARTING_MONEY
+        self.state = "bet"
+        self.first_card = 0
+        self.second_card = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.state == "over"
+
+    def random_card(self) -> int:
         """
         Generates a random playing card, represented as an integer from 2 to 
         14 (Ace=14).
-        Args:
-            None
-        Returns:
-            A random integer in the range 2-14
         """
-        return random.randint(2, 14)
-
+        return self.rng.randint(LOWEST_CARD, HIGHEST_CARD)
+
+    def start(self) -> str:
+        """Returns the introduction and the first deal."""
+        output = [
+            centred_text("ACEY DUCEY CARD GAME"), "\n",
+            centred_text("CREATIVE COMPUTING  MORRISTOWN, NEW JERSEY"), "\n",
+            "\n" * 3, INTRO_TEXT,
+            ]
+        self._deal(output)
+        return "".join(output)
+
+    def _deal(self, output: List[str]) -> None:
+        """Deals the next two cards and asks for a bet."""
+        first_card = self.random_card()
+        second_card = self.random_card()
+
+        output.append(f"YOU NOW HAVE {self.current_money} DOLLARS\n")
+        output.append("\n")
+        output.append("HERE ARE YOUR NEXT TWO CARDS: \n")
 
-    def print_card(card: int) -> None:
+        # reshuffle if the first card is greater or equal to the second card
+        while first_card >= second_card:
+            first_card = self.random_card()
+            second_card = self.random_card()
+        self.first_card = first_card
+        self.second_card = second_card
+
+        output.append(f"{card_name(first_card)}\n")
+        output.append(f"{card_name(second_card)}\n")
+        output.append("\n" * 2)
+        if self.hints:
+            # Imported here as the odds tables are only needed for hints
+            from aceyducey_odds import hint_text
+
+            output.append(
+                hint_text(first_card, second_card, self.current_money) + "\n"
+                )
+        output.append(BET_PROMPT)
+
+    def send(self, line: str) -> str:
+        """Plays a line of input and returns the text up to the next
+        prompt. A bet that is not a whole number is asked for again.
         """
-        Prints the integer or text value of a playing card.
-        Args:
-            Card: int- An integer representing a playing card
-        Returns:
-            None
-        """    
-        if card == 11:
-            print("JACK")
-        elif card == 12:
-            print("QUEEN")
-        elif card == 13:
-            print("KING")
-        elif card == 14:
-            print("ACE")
+        output: List[str] = []
+        if self.state == "bet":
+            self._bet(line, output)
+        elif self.state == "try_again":
+            self._try_again(line, output)
+        return "".join(output)
+
+    def _bet(self, line: str, output: List[str]) -> None:
+        """Plays a bet on the cards dealt."""
+        try:
+            bet = int(line)
+        except ValueError:
+            output.append(BET_PROMPT)
+            return
+        if bet > self.current_money:
+            output.append("SORRY, MY FRIEND, BUT YOU BET TOO MUCH.\n")
+            output.append(
+                f"YOU ONLY HAVE {self.current_money} DOLLARS LEFT TO BET.\n"
+                )
+            output.append(BET_PROMPT)
+            return
+        if bet == 0:
+            output.append("CHICKEN!!\n")
+            output.append("\n")
+            self._deal(output)
+            return
+        if bet < 0:
+            output.append(BET_PROMPT)
+            return
+
+        third_card = self.random_card()
+        output.append(f"{card_name(third_card)}\n")
+        if self.first_card < third_card < self.second_card:
+            output.append("YOU WIN!!!\n")
+            output.append("\n")
+            self.current_money += bet
         else:
-            print(card)
-
+            output.append("SORRY, YOU LOSE\n")
+            self.current_money -= bet
+            if self.current_money <= 0:
+                output.append("\n" * 2)
+                output.append("SORRY, FRIEND, BUT YOU BLEW YOUR WAD.\n")
+                output.append("\n" * 2)
+                output.append(TRY_AGAIN_PROMPT)
+                self.state = "try_again"
+                return
+        self._deal(output)
+
+    def _try_again(self, line: str, output: List[str]) -> None:
+        """Handles the answer to TRY AGAIN after the money has run out."""
+        output.append("\n" * 2)
+        answer = line.upper()
+        if answer == "YES":
+            self.current_money = STARTING_MONEY
+            self.state = "bet"
+            self._deal(output)
+        elif answer == "NO":
+            output.append("O.K., HOPE YOU HAD FUN!\n")
+            self.state = "over"
+        else:
+            output.append(TRY_AGAIN_PROMPT)
 
-    current_money: int = 100
-    game_over: bool = False
 
+def main() -> None:
+    """Main game loop
+    """
+    parser = argparse.ArgumentParser(
+        prog="Acey Ducey",
+        description="The Acey Ducey card game",
+        )
+    parser.add_argument(
+        "--hints", action="store_true",
+        help="show the odds of each deal and a suggested bet",
+        )
+    args = parser.parse_args()
+
+    game = AceyDuceyGame(hints=args.hints)
     clear_console()
-    print(centred_text("ACEY DUCEY CARD GAME"))
-    print(centred_text("CREATIVE COMPUTING  MORRISTOWN, NEW JERSEY"))
-    print("\n" * 3, end = "")
-    print("ACEY-DUCEY IS PLAYED IN THE FOLLOWING MANNER ")
-    print("THE DEALER (COMPUTER) DEALS TWO CARDS FACE UP")
-    print("YOU HAVE AN OPTION TO BET OR NOT BET DEPENDING")
-    print("ON WHETHER OR NOT YOU FEEL THE CARD WILL HAVE")
-    print("A VALUE BETWEEN THE FIRST TWO.")
-    print("IF YOU DO NOT WANT TO BET, INPUT A 0")
-
-    while not game_over:
-        bet: bool = False
-        first_card: int = random_card()
-        second_card: int = random_card()
-
-        print(f"YOU NOW HAVE {current_money} DOLLARS")
-        print() 
-        print("HERE ARE YOUR NEXT TWO CARDS: ")
-
-        # reshuffle if the first card is greater or equal to the second card
-        while first_card >= second_card:
-            first_card = random_card()
-            second_card = random_card()
-
-        print_card(first_card)
-        print_card(second_card)
-        print("\n" * 2, end = "")
-
-        while not bet:
-            bet_input = int(input("WHAT IS YOUR BET\n"))
-            if bet_input > current_money:
-                print("SORRY, MY FRIEND, BUT YOU BET TOO MUCH.") 
-                print(f"YOU ONLY HAVE {current_money} DOLLARS LEFT TO BET.")  
-                continue              
-            elif bet_input == 0:
-                print("CHICKEN!!")
-                print()
-                break
-            elif bet_input > 0:
-                bet = True
-
-        if not bet:
-            continue
-
-        third_card: int = random_card()
-        print_card(third_card)
-        if third_card > first_card and third_card < second_card:
-            print("YOU WIN!!!")
-            print() 
-            current_money += bet_input
-        else:
-            print("SORRY, YOU LOSE")
-            current_money -= bet_input
-            if current_money <= 0:
-                print("\n" * 2, end = "")
-                print("SORRY, FRIEND, BUT YOU BLEW YOUR WAD.")
-                print("\n" * 2, end = "")
-                while not game_over:
-                    try_again = input("TRY AGAIN (YES OR NO)\n")
-                    print("\n" * 2, end = "")
-                    if try_again.upper() == "YES":
-                        current_money = 100
-                        break
-                    elif try_again.upper() == "NO":
-                        print("O.K., HOPE YOU HAD FUN!")
-                        game_over = True  
-                    else:
-                         continue 
+    print_text(game.start(), end = "")
+    while not game.finished:
+        print_text(game.send(input_text()), end = "")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+
+import argparse
+from collections import namedtuple
+from fractions import Fraction
+from typing import List, Optional, Tuple
+
+from aceyducey import HIGHEST_CARD, LOWEST_CARD, card_name
+
+# Exact odds for Acey Ducey. Every card is drawn uniformly from 2 to 14, so
+# each ordered pair of cards has probability 1/169. The game deals again
+# until the first card is lower than the second - summing the rerolls as a
+# geometric series, each of the 78 pairs with first < second is dealt with
+# probability (1/169) / (78/169) = 1/78. The third card wins when it lies
+# strictly between the two, so a pair with n cards between them wins with
+# probability n/13.
+
+# Tables are indexed directly by card value, e.g. WIN_PROBABILITY[4][12],
+# so that every lookup takes constant time. Rows and columns below
+# LOWEST_CARD are never dealt and hold 0.
+
+# usage: python aceyducey_odds.py [--validate HANDS] [--seed SEED]
+
+CARDS = range(LOWEST_CARD, HIGHEST_CARD + 1)
+CARD_PROBABILITY = Fraction(1, len(CARDS))
+
+Table = Tuple[Tuple[Fraction, ...], ...]
+
+
+def _table(value) -> Table:
+    """Builds a table of value(first, second) for every pair of cards."""
+    return tuple(
+        tuple(
+            value(first, second)
+            if first in CARDS and second in CARDS else Fraction(0)
+            for second in range(HIGHEST_CARD + 1)
+            )
+        for first in range(HIGHEST_CARD + 1)
+        )
+
+
+# Probability of drawing each ordered pair before any reroll
+DRAW_PROBABILITY = _table(lambda first, second: CARD_PROBABILITY ** 2)
+
+# Probability that a draw is kept rather than dealt again
+KEEP_PROBABILITY = sum(
+    DRAW_PROBABILITY[first][second]
+    for first in CARDS for second in CARDS if first < second
+    )
+
+# Probability of each pair being the one dealt, after the rerolls
+DEAL_PROBABILITY = _table(
+    lambda first, second: DRAW_PROBABILITY[first][second] / KEEP_PROBABILITY
+    if first < second else Fraction(0)
+    )
+
+# Probability of the third card landing strictly between the two
+WIN_PROBABILITY = _table(
+    lambda first, second:
+    max(second - first - 1, 0) * CARD_PROBABILITY
+    )
+
+# Probability of winning a hand before the cards are seen
+OVERALL_WIN_PROBABILITY = sum(
+    DEAL_PROBABILITY[first][second] * WIN_PROBABILITY[first][second]
+    for first in CARDS for second in CARDS
+    )
+
+# Float copies of the tables for fast arithmetic
+WIN_PROBABILITY_FLOAT = tuple(
+    tuple(float(probability) for probability in row)
+    for row in WIN_PROBABILITY
+    )
+
+BetAdvice = namedtuple(
+    "BetAdvice", "win_probability, expected_value, kelly_fraction, bet"
+    )
+BetAdvice.__doc__ = '''Advice for a hand.
+    win_probability: Fraction - exact chance of the third card winning
+    expected_value: Fraction - expected winnings per dollar bet
+    kelly_fraction: Fraction - fraction of the money to bet
+    bet: int - the bet, in whole dollars
+    '''
+
+
+def expected_value(first: int, second: int, bet: int=1) -> Fraction:
+    '''
+    Returns the exact expected winnings of a bet on a pair of cards. A bet
+    is won or lost at even money.
+    Args:
+        first: int - first card dealt
+        second: int - second card dealt
+        bet: int - amount bet
+    Returns:
+        Fraction - expected winnings, negative for a losing bet
+    '''
+    return (2 * WIN_PROBABILITY[first][second] - 1) * bet
+
+
+def kelly_fraction(first: int, second: int) -> Fraction:
+    '''
+    Returns the Kelly criterion fraction of the player's money to bet on a
+    pair of cards - for an even money bet, 2p - 1 when that is positive and
+    nothing otherwise.
+    Args:
+        first: int - first card dealt
+        second: int - second card dealt
+    Returns:
+        Fraction - fraction of the money to bet
+    '''
+    return max(2 * WIN_PROBABILITY[first][second] - 1, Fraction(0))
+
+
+def kelly_bet(
+        first: int, second: int, money: int, multiplier: float=1.0
+        ) -> int:
+    '''
+    Returns the Kelly bet in whole dollars, optionally scaled down - e.g. a
+    multiplier of 0.5 for half Kelly.
+    Args:
+        first: int - first card dealt
+        second: int - second card dealt
+        money: int - the player's money
+        multiplier: float - fraction of the Kelly bet to make
+    Returns:
+        int - the bet
+    '''
+    edge = 2 * WIN_PROBABILITY_FLOAT[first][second] - 1
+    if edge <= 0:
+        return 0
+    return min(int(money * edge * multiplier), money)
+
+
+def advise(first: int, second: int, money: int) -> BetAdvice:
+    '''
+    Returns the exact odds and the Kelly bet for a hand.
+    Args:
+        first: int - first card dealt
+        second: int - second card dealt
+        money: int - the player's money
+    Returns:
+        BetAdvice - the advice
+    '''
+    return BetAdvice(
+        WIN_PROBABILITY[first][second], expected_value(first, second),
+        kelly_fraction(first, second), kelly_bet(first, second, money)
+        )
+
+
+def hint_text(first: int, second: int, money: int) -> str:
+    '''
+    Returns a one line hint for a hand, as shown in the game.
+    Args:
+        first: int - first card dealt
+        second: int - second card dealt
+        money: int - the player's money
+    Returns:
+        str - the hint
+    '''
+    advice = advise(first, second, money)
+    between = max(second - first - 1, 0)
+    return (
+        f"HINT: {between} CARDS OF {len(CARDS)} WIN "
+        f"({float(advice.win_probability):.0%}), "
+        f"SUGGESTED BET {advice.bet}"
+        )
+
+
+def format_table() -> List[str]:
+    '''
+    Formats the exact win probability of every pair that can be dealt,
+    with the rows for the first card and the columns for the second.
+    Returns:
+        List[str] - the table
+    '''
+    lines = [
+        "     " + "".join(f"{card_name(card)[:5] : >6}" for card in CARDS)
+        ]
+    for first in CARDS:
+        cells = []
+        for second in CARDS:
+            if first < second:
+                probability = WIN_PROBABILITY[first][second]
+                cells.append(f"{str(probability) : >6}")
+            else:
+                cells.append(f"{'' : >6}")
+        lines.append(f"{card_name(first)[:5] : <5}" + "".join(cells))
+    lines.append("")
+    lines.append(f"EACH PAIR IS DEALT WITH PROBABILITY "
+                 f"{DEAL_PROBABILITY[LOWEST_CARD][HIGHEST_CARD]}")
+    lines.append(f"A HAND IS WON WITH PROBABILITY {OVERALL_WIN_PROBABILITY}"
+                 f" ({float(OVERALL_WIN_PROBABILITY):.4f})")
+    return lines
+
+
+def validate(hands: int, seed: Optional[int]=None) -> List[str]:
+    '''
+    Deals a large number of hands the way the game does, rerolls included,
+    and compares how often each pair is dealt and won with the exact
+    tables. Deviations are reported in standard errors.
+    Args:
+        hands: int - number of hands to deal
+        seed: int | None - seed for the cards
+    Returns:
+        List[str] - the report, ending with PASS or FAIL
+    '''
+    # Imported here as NumPy is only needed for the validation
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+
+    def deal(count):
+        """Deals hands as the game does, dealing both cards again until
+        the first is lower than the second."""
+        first = rng.integers(LOWEST_CARD, HIGHEST_CARD + 1, count)
+        second = rng.integers(LOWEST_CARD, HIGHEST_CARD + 1, count)
+        reroll = np.flatnonzero(first >= second)
+        while reroll.size:
+            first[reroll] = rng.integers(
+                LOWEST_CARD, HIGHEST_CARD + 1, reroll.size
+                )
+            second[reroll] = rng.integers(
+                LOWEST_CARD, HIGHEST_CARD + 1, reroll.size
+                )
+            reroll = reroll[first[reroll] >= second[reroll]]
+        third = rng.integers(LOWEST_CARD, HIGHEST_CARD + 1, count)
+        return first, second, third
+
+    size = HIGHEST_CARD + 1
+    dealt = np.zeros((size, size), dtype=np.int64)
+    won = np.zeros((size, size), dtype=np.int64)
+    remaining = hands
+    while remaining:
+        batch = min(remaining, 1_000_000)
+        first, second, third = deal(batch)
+        pair = first * size + second
+        dealt += np.bincount(pair, minlength=size * size).reshape(size, size)
+        win = (first < third) & (third < second)
+        won += np.bincount(
+            pair[win], minlength=size * size
+            ).reshape(size, size)
+        remaining -= batch
+
+    worst_deal = worst_win = 0.0
+    for first in CARDS:
+        for second in CARDS:
+            p_deal = float(DEAL_PROBABILITY[first][second])
+            count = dealt[first, second]
+            if p_deal == 0:
+                if count:
+                    worst_deal = float("inf")
+                continue
+            error = np.sqrt(hands * p_deal * (1 - p_deal))
+            worst_deal = max(
+                worst_deal, abs(count - hands * p_deal) / error
+                )
+            p_win = float(WIN_PROBABILITY[first][second])
+            if 0 < p_win < 1:
+                error = np.sqrt(count * p_win * (1 - p_win))
+                worst_win = max(
+                    worst_win,
+                    abs(won[first, second] - count * p_win) / error
+                    )
+    overall = won.sum() / hands
+    # 78 pairs dealt and won - a deviation of 5 standard errors is very
+    # unlikely by chance
+    passed = worst_deal < 5 and worst_win < 5
+    return [
+        f"HANDS            {hands:,}",
+        f"WIN RATE         {overall:.5f} "
+        f"(EXACT {float(OVERALL_WIN_PROBABILITY):.5f})",
+        f"WORST PAIR DEAL  {worst_deal:.2f} STANDARD ERRORS",
+        f"WORST PAIR WIN   {worst_win:.2f} STANDARD ERRORS",
+        "PASS" if passed else "FAIL",
+        ]
+
+
+def main() -> None:
+    """Prints the odds table, or checks it against a simulation
+    """
+    parser = argparse.ArgumentParser(
+        prog="Acey Ducey Odds",
+        description="Exact odds for every pair of cards in Acey Ducey",
+        )
+    parser.add_argument(
+        "--validate", type=int, metavar="HANDS", default=None,
+        help="compare the odds with this many simulated hands",
+        )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if args.validate is None:
+        lines = format_table()
+    else:
+        lines = validate(args.validate, args.seed)
+    for line in lines:
+        print(line)
+    if lines[-1] == "FAIL":
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,713 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import time
+from collections import namedtuple
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from aceyducey import STARTING_MONEY
+from aceyducey_odds import CARDS, DEAL_PROBABILITY, WIN_PROBABILITY
+from aceyducey_sim import STRATEGIES, Strategy, parse_strategy, simulate
+
+# Exact ruin probabilities for Acey Ducey. A player betting with a strategy
+# is a Markov chain over their money - each hand moves them from m to m + b
+# or m - b, where the bet b depends on the cards dealt and on m. The chain
+# stops when the money runs out (SORRY, FRIEND, BUT YOU BLEW YOUR WAD) or
+# reaches a target at which the player stops playing. For every starting
+# amount from 1 to target - 1, solving (I - Q) x = r, where Q holds the
+# moves between these amounts, gives the probability of ruin and the
+# expected number of hands played.
+
+# Q is never stored as a matrix. Most strategies make only a few different
+# bets, so deals giving the same bet in every state are merged and each
+# merged bet becomes one move - arrays of the states it leaves from and
+# arrives at, with its probability. Chains that move at most a few dollars
+# a hand are banded and are solved directly by block cyclic reduction.
+# Wider chains, such as those of strategies betting a fraction of the
+# money, are solved iteratively with BiCGSTAB. Its preconditioner solves
+# the chain exactly on a coarse grid of amounts growing by 1%, which
+# carries the solution across the many hands that small bets take to cross
+# large amounts of money, then runs symmetric Gauss-Seidel sweeps over what
+# the coarse grid leaves. BiCGSTAB raises an error rather than returning
+# a solution that has not converged.
+
+# usage: python aceyducey_ruin.py [--strategy flat:10] [--money 100]
+#                                 [--target 1000] [--method auto]
+#                                 [--check PLAYERS] [--seed SEED]
+
+# Widest band, in dollars, solved directly - memory grows with the square
+# of the band
+BAND_LIMIT = 16
+
+# Number of the lowest amounts solved exactly when preconditioning BiCGSTAB
+DENSE_STATES = 2048
+
+# Growth in money between neighbouring amounts of the coarse grid used when
+# preconditioning BiCGSTAB
+COARSE_SPACING = 0.01
+
+# BiCGSTAB iterations between restarts from the true residual
+RESTART_ITERATIONS = 40
+
+Move = Tuple[Union[slice, np.ndarray], np.ndarray, float]
+
+MarkovChain = namedtuple(
+    "MarkovChain",
+    "target, moves, stay, ruin, win_target, stalled, bandwidth, patterns"
+    )
+MarkovChain.__doc__ = '''Moves between amounts of money for a strategy.
+    Index i of each array is the state with i + 1 dollars.
+    target: int - money at which the player stops playing
+    moves: List[Move] - states moved from, as a slice when they are
+    consecutive, states moved to and the probability of the move, for each
+    bet won or lost below the target
+    stay: np.ndarray - probability of not betting in each state
+    ruin: np.ndarray - probability of being ruined in one hand
+    win_target: np.ndarray - probability of reaching the target in one hand
+    stalled: np.ndarray - states in which the player never bets
+    bandwidth: int - largest move between states below the target
+    patterns: int - number of different patterns of bets
+    '''
+
+RuinResult = namedtuple(
+    "RuinResult", "ruin, target, expected_hands, method, iterations"
+    )
+RuinResult.__doc__ = '''Solution for every starting amount of money.
+    ruin: np.ndarray - probability of running out of money
+    target: np.ndarray - probability of reaching the target
+    expected_hands: np.ndarray - expected number of hands played, infinite
+    where the player can end up never betting
+    method: str - "banded" or "bicgstab"
+    iterations: int - most iterations taken by BiCGSTAB
+    '''
+
+
+def build_chain(strategy: Strategy, target: int) -> MarkovChain:
+    '''
+    Builds the Markov chain for a strategy from the exact odds of each deal.
+    Deals giving the same bets in every state are merged, so a strategy
+    depending only on the gap between the cards has at most one pattern of
+    bets per gap.
+    Args:
+        strategy: Strategy - the betting strategy
+        target: int - money at which the player stops playing
+    Returns:
+        MarkovChain - the chain
+    Raises:
+        ValueError: If the target is less than 2.
+    '''
+    if target < 2:
+        raise ValueError("target must be at least 2")
+    money = np.arange(1, target, dtype=np.int64)
+    states = money.size
+    bets: List[np.ndarray] = []
+    win_weights: List[float] = []
+    lose_weights: List[float] = []
+    for first in CARDS:
+        for second in CARDS:
+            deal = float(DEAL_PROBABILITY[first][second])
+            if deal == 0:
+                continue
+            win = float(WIN_PROBABILITY[first][second])
+            # Every state is dealt the same cards, so they are passed as
+            # one element arrays, which broadcast against the money
+            bet = strategy(np.array([first]), np.array([second]), money)
+            bet = np.clip(
+                np.floor(np.broadcast_to(bet, money.shape)).astype(np.int64),
+                0, money
+                )
+            for index, known in enumerate(bets):
+                if np.array_equal(known, bet):
+                    win_weights[index] += deal * win
+                    lose_weights[index] += deal * (1 - win)
+                    break
+            else:
+                bets.append(bet)
+                win_weights.append(deal * win)
+                lose_weights.append(deal * (1 - win))
+
+    state = money - 1
+    moves: List[Move] = []
+    ruin = np.zeros(states)
+    win_target = np.zeros(states)
+    stay = np.zeros(states)
+    stalled = np.ones(states, dtype=bool)
+    bandwidth = 0
+    for bet, win, lose in zip(bets, win_weights, lose_weights):
+        placed = bet > 0
+        stay += np.where(placed, 0, win + lose)
+        stalled &= ~placed
+        ruined = placed & (money - bet <= 0)
+        reached = placed & (money + bet >= target)
+        ruin += np.where(ruined, lose, 0)
+        win_target += np.where(reached, win, 0)
+        for moving, step, probability in (
+                (placed & ~reached, bet, win),
+                (placed & ~ruined, -bet, lose),
+                ):
+            if probability == 0 or not moving.any():
+                continue
+            rows = state[moving]
+            columns = rows + step[moving]
+            if rows[-1] - rows[0] + 1 == rows.size:
+                # Most strategies bet more with more money, so the states
+                # making a move are usually consecutive and can be sliced
+                rows = slice(int(rows[0]), int(rows[-1]) + 1)
+            moves.append((rows, columns, probability))
+            bandwidth = max(bandwidth, int(bet[moving].max()))
+    return MarkovChain(
+        target, moves, stay, ruin, win_target, stalled, bandwidth, len(bets)
+        )
+
+
+def _apply(
+        diagonal: np.ndarray, moves: List[Move], x: np.ndarray
+        ) -> np.ndarray:
+    """Multiplies a vector by I - Q, given the diagonal of I - Q."""
+    result = diagonal * x
+    for rows, columns, probability in moves:
+        result[rows] -= probability * x[columns]
+    return result
+
+
+def _sweep_plan(
+        moves: List[Move], states: int, start: int, upward: bool
+        ) -> List[Tuple[int, int, List[Move]]]:
+    '''
+    Splits the states from start upwards into runs of consecutive states
+    whose moves in one direction all leave the run, so that a Gauss-Seidel
+    sweep can update a whole run at once.
+    Args:
+        moves: List[Move] - the moves of the chain
+        states: int - number of states
+        start: int - first state swept
+        upward: bool - plan for the moves up, swept from the top, rather
+        than the moves down, swept from the bottom
+    Returns:
+        List[tuple] - first and last state + 1 of each run, in the order
+        swept, with the moves from the run relative to its first state
+    '''
+    state = np.arange(states)
+    selected = []
+    # Nearest state reached by a move in the direction of the sweep
+    if upward:
+        reach = np.full(states, states)
+    else:
+        reach = np.full(states, -1)
+    for rows, columns, probability in moves:
+        rows = state[rows]
+        if (columns[0] > rows[0]) != upward:
+            continue
+        selected.append((rows, columns, probability))
+        if upward:
+            reach[rows] = np.minimum(reach[rows], columns)
+        else:
+            reach[rows] = np.maximum(reach[rows], columns)
+
+    runs = []
+    if upward:
+        bound = np.minimum.accumulate(reach[::-1])[::-1]
+        high = states
+        while high > start:
+            low = max(start, int(np.searchsorted(bound, high)))
+            runs.append((low, high))
+            high = low
+    else:
+        bound = np.maximum.accumulate(reach)
+        low = start
+        while low < states:
+            high = int(np.searchsorted(bound, low))
+            runs.append((low, high))
+            low = high
+
+    plan = []
+    for low, high in runs:
+        parts = []
+        for rows, columns, probability in selected:
+            first, last = np.searchsorted(rows, (low, high))
+            if first < last:
+                part = rows[first:last] - low
+                if part[-1] - part[0] + 1 == part.size:
+                    part = slice(int(part[0]), int(part[-1]) + 1)
+                parts.append((part, columns[first:last], probability))
+        plan.append((low, high, parts))
+    return plan
+
+
+def _sweep(
+        plan: List[Tuple[int, int, List[Move]]], diagonal: np.ndarray,
+        vector: np.ndarray, result: np.ndarray
+        ) -> None:
+    """Runs a Gauss-Seidel sweep over the runs of a plan, into result."""
+    for low, high, parts in plan:
+        total = vector[low:high].copy()
+        for rows, columns, probability in parts:
+            total[rows] += probability * result[columns]
+        result[low:high] = total / diagonal[low:high]
+
+
+def _coarse_correction(
+        diagonal: np.ndarray, moves: List[Move]
+        ) -> Callable[[np.ndarray], np.ndarray]:
+    '''
+    Builds a coarse grid correction for I - Q. The grid holds every amount
+    up to 1 / COARSE_SPACING dollars, then amounts growing by COARSE_SPACING,
+    and the chain is solved exactly over the hat functions of these amounts
+    (P^T (I - Q) P for the linear interpolation P). Wide chains bet in
+    proportion to the money, so between these amounts the solution is close
+    to linear, and the correction carries it across the many hands that
+    Gauss-Seidel sweeps take to cross the chain.
+    Args:
+        diagonal: np.ndarray - the diagonal of I - Q
+        moves: List[Move] - the moves of the chain, over at least two states
+    Returns:
+        Callable - returns the coarse solution for a right hand side
+    '''
+    states = diagonal.size
+    nodes = [0]
+    while nodes[-1] < states - 1:
+        nodes.append(min(
+            states - 1,
+            max(nodes[-1] + 1, int(nodes[-1] * (1 + COARSE_SPACING))),
+            ))
+    size = len(nodes)
+    nodes = np.array(nodes)
+    # Each state lies between the nodes left and left + 1, weight of the
+    # way from one to the other
+    state = np.arange(states)
+    left = np.minimum(
+        np.searchsorted(nodes, state, side="right") - 1, size - 2
+        )
+    weight = (state - nodes[left]) / (nodes[left + 1] - nodes[left])
+
+    def hats(indexes):
+        return (
+            (left[indexes], 1 - weight[indexes]),
+            (left[indexes] + 1, weight[indexes]),
+            )
+
+    entries = [(state, state, diagonal)]
+    for rows, columns, probability in moves:
+        rows = state[rows]
+        entries.append((rows, columns, np.full(rows.size, -probability)))
+    coarse = np.zeros(size * size)
+    for rows, columns, values in entries:
+        for row, row_weight in hats(rows):
+            for column, column_weight in hats(columns):
+                coarse += np.bincount(
+                    row * size + column,
+                    weights=values * row_weight * column_weight,
+                    minlength=size * size,
+                    )
+    inverse = np.linalg.inv(coarse.reshape(size, size))
+
+    def correct(vector):
+        restricted = (
+            np.bincount(left, (1 - weight) * vector, minlength=size)
+            + np.bincount(left + 1, weight * vector, minlength=size)
+            )
+        solution = inverse @ restricted
+        return solution[left] * (1 - weight) + solution[left + 1] * weight
+
+    return correct
+
+
+def _preconditioner(
+        diagonal: np.ndarray, moves: List[Move]
+        ) -> Callable[[np.ndarray], np.ndarray]:
+    '''
+    Builds a two level preconditioner for I - Q - a coarse grid correction
+    followed by symmetric Gauss-Seidel sweeps over what it leaves. The
+    lowest DENSE_STATES states, where the bets are small and the chain
+    takes many hands to cross them, are solved together exactly. The rest
+    are swept upwards following the moves down and then downwards following
+    the moves up, so a chain drifting either way is followed in one
+    application.
+    Args:
+        diagonal: np.ndarray - the diagonal of I - Q
+        moves: List[Move] - the moves of the chain
+    Returns:
+        Callable - applies the preconditioner to a vector
+    '''
+    states = diagonal.size
+    size = min(DENSE_STATES, states)
+    state = np.arange(states)
+    block = np.diag(diagonal[:size])
+    leaving = []
+    for rows, columns, probability in moves:
+        rows = state[rows]
+        inside = (rows < size) & (columns < size)
+        block[rows[inside], columns[inside]] -= probability
+        out = (rows < size) & (columns >= size)
+        if out.any():
+            leaving.append((rows[out], columns[out], probability))
+    inverse = np.linalg.inv(block)
+    if size == states:
+        # The dense block is the whole chain
+        return lambda vector: inverse @ vector
+    down = _sweep_plan(moves, states, size, upward=False)
+    up = _sweep_plan(moves, states, size, upward=True)
+    correct = _coarse_correction(diagonal, moves)
+
+    def sweep(vector):
+        lower = np.empty_like(vector)
+        lower[:size] = inverse @ vector[:size]
+        _sweep(down, diagonal, vector, lower)
+        result = np.empty_like(vector)
+        _sweep(up, diagonal, diagonal * lower, result)
+        correction = np.zeros(size)
+        for rows, columns, probability in leaving:
+            correction[rows] += probability * result[columns]
+        result[:size] = lower[:size] + inverse @ correction
+        return result
+
+    def precondition(vector):
+        coarse = correct(vector)
+        return coarse + sweep(vector - _apply(diagonal, moves, coarse))
+
+    return precondition
+
+
+def _bicgstab(
+        diagonal: np.ndarray, moves: List[Move], rhs: np.ndarray,
+        precondition: Callable[[np.ndarray], np.ndarray],
+        tolerance: float=1e-12, max_iterations: int=1000
+        ) -> Tuple[np.ndarray, int]:
+    '''
+    Solves (I - Q) x = rhs with preconditioned BiCGSTAB.
+    Returns:
+        tuple - the solution and the number of iterations
+    Raises:
+        ArithmeticError: If the solution does not converge.
+    '''
+    x = np.zeros_like(rhs)
+    if not rhs.any():
+        return x, 0
+
+    def converged(residual, x):
+        # Relative to the size of the solution as well as the right hand
+        # side - a ruin of nearly 1 everywhere from a right hand side of a
+        # single state cannot be solved to a smaller residual. The rows of
+        # I - Q sum to at most 2.
+        return np.linalg.norm(residual) <= tolerance * (
+            np.linalg.norm(rhs) + 2 * np.linalg.norm(x)
+            )
+
+    # The usual shadow residual, the first residual, breaks down when the
+    # right hand side is a few states, as it is for ruin from a flat bet,
+    # so a fixed random one is used
+    shadow = np.random.default_rng(0).standard_normal(rhs.size)
+    iteration = 0
+    while iteration < max_iterations:
+        # Restarts from the true residual when the updated one has
+        # converged, as it drifts from the true one, and every
+        # RESTART_ITERATIONS iterations, as BiCGSTAB can stagnate on the
+        # expected number of hands of small bets
+        residual = rhs - _apply(diagonal, moves, x)
+        if converged(residual, x):
+            return x, iteration
+        rho = alpha = omega = 1.0
+        v = p = np.zeros_like(rhs)
+        restart = min(iteration + RESTART_ITERATIONS, max_iterations)
+        while iteration < restart:
+            iteration += 1
+            rho_next = shadow @ residual
+            beta = (rho_next / rho) * (alpha / omega)
+            rho = rho_next
+            p = residual + beta * (p - omega * v)
+            p_hat = precondition(p)
+            v = _apply(diagonal, moves, p_hat)
+            alpha = rho / (shadow @ v)
+            s = residual - alpha * v
+            if converged(s, x):
+                x = x + alpha * p_hat
+                break
+            s_hat = precondition(s)
+            t = _apply(diagonal, moves, s_hat)
+            omega = (t @ s) / (t @ t)
+            x = x + alpha * p_hat + omega * s_hat
+            residual = s - omega * t
+            if converged(residual, x):
+                break
+        if not np.isfinite(x).all():
+            break
+    raise ArithmeticError(
+        f"BiCGSTAB did not converge in {iteration} iterations"
+        )
+
+
+def _block_tridiagonal(
+        diagonal: np.ndarray, moves: List[Move], size: int
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Lays I - Q out as a block tridiagonal matrix with square blocks of the
+    given size, which must be at least the bandwidth. States are padded
+    with identity rows to fill the last block.
+    Returns:
+        tuple - blocks below, on and above the diagonal, each of shape
+        (blocks, size, size)
+    '''
+    states = diagonal.size
+    blocks = -(-states // size)
+    matrix = np.zeros((blocks, 3, size, size))
+    index = np.arange(blocks * size)
+    matrix[index // size, 1, index % size, index % size] = np.concatenate(
+        (diagonal, np.ones(blocks * size - states))
+        )
+    state = np.arange(states)
+    for rows, columns, probability in moves:
+        rows = state[rows]
+        # Rows are distinct within a move, so no entry is written twice
+        matrix[
+            rows // size, columns // size - rows // size + 1,
+            rows % size, columns % size,
+            ] -= probability
+    return matrix[:, 0], matrix[:, 1], matrix[:, 2]
+
+
+def _cyclic_reduction(
+        below: np.ndarray, diagonal: np.ndarray, above: np.ndarray,
+        rhs: np.ndarray
+        ) -> np.ndarray:
+    '''
+    Solves a block tridiagonal system by block cyclic reduction - the odd
+    numbered blocks are eliminated in one batch of small solves, leaving a
+    system of half the size over the even numbered blocks, which is solved
+    in the same way. No pivoting is needed as I - Q is an M-matrix.
+    Args:
+        below, diagonal, above: np.ndarray - blocks of shape (n, b, b)
+        rhs: np.ndarray - right hand sides of shape (n, b, k)
+    Returns:
+        np.ndarray - the solution, of shape (n, b, k)
+    '''
+    blocks = diagonal.shape[0]
+    if blocks == 1:
+        return np.linalg.solve(diagonal, rhs)
+    size = diagonal.shape[1]
+    columns = rhs.shape[2]
+
+    # Eliminate the odd blocks from their neighbours
+    solved = np.linalg.solve(
+        diagonal[1::2],
+        np.concatenate((below[1::2], above[1::2], rhs[1::2]), axis=2),
+        )
+    odd_below = solved[:, :, :size]
+    odd_above = solved[:, :, size:2 * size]
+    odd_rhs = solved[:, :, 2 * size:]
+
+    # Even block e has odd block e - 1 on its left and odd block e on its
+    # right, where they exist
+    evens = (blocks + 1) // 2
+    zero_block = np.zeros((1, size, size))
+    zero_rhs = np.zeros((1, size, columns))
+    left_below = np.concatenate((zero_block, odd_below))[:evens]
+    left_above = np.concatenate((zero_block, odd_above))[:evens]
+    left_rhs = np.concatenate((zero_rhs, odd_rhs))[:evens]
+    right_below = np.concatenate((odd_below, zero_block))[:evens]
+    right_above = np.concatenate((odd_above, zero_block))[:evens]
+    right_rhs = np.concatenate((odd_rhs, zero_rhs))[:evens]
+
+    even_below = below[0::2]
+    even_above = above[0::2]
+    even_solution = _cyclic_reduction(
+        -even_below @ left_below,
+        diagonal[0::2] - even_below @ left_above - even_above @ right_below,
+        -even_above @ right_above,
+        rhs[0::2] - even_below @ left_rhs - even_above @ right_rhs,
+        )
+
+    # Back substitute for the odd blocks
+    odds = blocks // 2
+    # The last odd block has no even block on its right when the number of
+    # blocks is even, but its block above is zero
+    right = np.concatenate((even_solution, zero_rhs))[1:odds + 1]
+    solution = np.empty_like(rhs)
+    solution[0::2] = even_solution
+    solution[1::2] = (
+        odd_rhs - odd_below @ even_solution[:odds] - odd_above @ right
+        )
+    return solution
+
+
+def solve_chain(chain: MarkovChain, method: str="auto") -> RuinResult:
+    '''
+    Solves a chain for the probability of ruin, the probability of reaching
+    the target and the expected number of hands from every starting amount.
+    States from which the player can end up never betting again have an
+    infinite expected number of hands.
+    Args:
+        chain: MarkovChain - the chain
+        method: str - "banded", "bicgstab", or "auto" to use the banded
+        solver when the bandwidth is at most BAND_LIMIT
+    Returns:
+        RuinResult - the solution
+    Raises:
+        ValueError: If the method is unknown.
+        ArithmeticError: If BiCGSTAB does not converge.
+    '''
+    states = chain.stay.size
+    # Stalled states are solved as absorbing, counting the hands played
+    # before reaching them
+    diagonal = np.where(chain.stalled, 1.0, 1 - chain.stay)
+    rhs = np.stack(
+        (chain.ruin, chain.win_target, np.where(chain.stalled, 0.0, 1.0)),
+        axis=1
+        )
+
+    if method == "auto":
+        method = "banded" if chain.bandwidth <= BAND_LIMIT else "bicgstab"
+    iterations = 0
+    if method == "banded":
+        size = max(chain.bandwidth, 1)
+        below, middle, above = _block_tridiagonal(
+            diagonal, chain.moves, size
+            )
+        padded = np.zeros((middle.shape[0] * size, rhs.shape[1]))
+        padded[:states] = rhs
+        solution = _cyclic_reduction(
+            below, middle, above,
+            padded.reshape(middle.shape[0], size, rhs.shape[1]),
+            ).reshape(-1, rhs.shape[1])[:states]
+    elif method == "bicgstab":
+        precondition = _preconditioner(diagonal, chain.moves)
+        solution = np.full_like(rhs, math.inf)
+        for column in range(rhs.shape[1]):
+            if column == 2 and chain.stalled.any():
+                ruin, target = solution[:, 0], solution[:, 1]
+                if (1 - ruin - target > 1e-9)[~chain.stalled].all():
+                    # Every game can stall, so none has a finite length
+                    break
+            solution[:, column], taken = _bicgstab(
+                diagonal, chain.moves, rhs[:, column], precondition
+                )
+            iterations = max(iterations, taken)
+    else:
+        raise ValueError(f"unknown method {method!r}")
+
+    ruin, target, hands = solution.T
+    if chain.stalled.any():
+        # Any chance of reaching a stalled state makes the game endless
+        never_ends = 1 - ruin - target > 1e-9
+        hands = np.where(never_ends, math.inf, hands)
+    return RuinResult(ruin, target, hands, method, iterations)
+
+
+def cross_check(
+        strategy: Strategy, money: int, target: int, result: RuinResult,
+        players: int, seed: Optional[int]=None
+        ) -> List[str]:
+    '''
+    Compares the exact solution for one starting amount with simulated
+    play, in standard errors of the simulation.
+    Args:
+        strategy: Strategy - the betting strategy
+        money: int - starting money
+        target: int - money at which the player stops playing
+        result: RuinResult - the exact solution
+        players: int - number of simulated players
+        seed: int | None - seed for the simulation
+    Returns:
+        List[str] - the report
+    '''
+    exact_ruin = result.ruin[money - 1]
+    exact_target = result.target[money - 1]
+    exact_hands = result.expected_hands[money - 1]
+    if math.isinf(exact_hands):
+        hands = 10_000
+    else:
+        hands = min(int(exact_hands * 20) + 100, 1_000_000)
+    simulated = simulate(
+        strategy, players, hands, seed, money, sample_players=0,
+        target=target
+        )
+    ended = np.maximum(simulated.ruin_hand, simulated.target_hand)
+    lines = [f"SIMULATED        {players:,} PLAYERS, UP TO {hands:,} HANDS"]
+    for label, hand, exact in (
+            ("RUIN", simulated.ruin_hand, exact_ruin),
+            ("REACH TARGET", simulated.target_hand, exact_target),
+            ):
+        rate = np.count_nonzero(hand > 0) / players
+        error = math.sqrt(max(exact * (1 - exact), 1e-12) / players)
+        lines.append(
+            f"{label : <17}{rate:.5f} SIMULATED, {exact:.5f} EXACT "
+            f"({(rate - exact) / error:+.2f} SE)"
+            )
+    if not math.isinf(exact_hands) and (ended > 0).all():
+        mean = ended.mean()
+        error = ended.std(ddof=1) / math.sqrt(players) or 1e-12
+        lines.append(
+            f"HANDS            {mean:.3f} SIMULATED, {exact_hands:.3f} EXACT "
+            f"({(mean - exact_hands) / error:+.2f} SE)"
+            )
+    return lines
+
+
+def main() -> None:
+    """Solves the chain for a strategy and prints the results
+    """
+    parser = argparse.ArgumentParser(
+        prog="Acey Ducey Ruin",
+        description="Exact ruin probabilities for Acey Ducey strategies",
+        )
+    parser.add_argument(
+        "--strategy", default="flat:10",
+        help="NAME[:ARG...] - one of " + ", ".join(sorted(STRATEGIES)),
+        )
+    parser.add_argument("--money", type=int, default=STARTING_MONEY)
+    parser.add_argument(
+        "--target", type=int, default=STARTING_MONEY * 10,
+        help="money at which the player stops playing",
+        )
+    parser.add_argument(
+        "--method", choices=["auto", "banded", "bicgstab"], default="auto"
+        )
+    parser.add_argument(
+        "--check", type=int, metavar="PLAYERS", default=None,
+        help="compare with this many simulated players",
+        )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if not 0 < args.money < args.target:
+        parser.error("--money must be between 1 and --target - 1")
+    try:
+        strategy = parse_strategy(args.strategy)
+    except (ValueError, TypeError) as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    chain = build_chain(strategy, args.target)
+    built = time.perf_counter()
+    try:
+        result = solve_chain(chain, args.method)
+    except ArithmeticError as error:
+        parser.exit(1, f"{parser.prog}: {error}\n")
+    solved = time.perf_counter()
+
+    index = args.money - 1
+    print(f"STRATEGY         {args.strategy}")
+    print(f"STATES           {chain.stay.size:,} (BANDWIDTH "
+          f"{chain.bandwidth:,}, {chain.patterns} BET PATTERNS)")
+    print(f"METHOD           {result.method}"
+          + (f" ({result.iterations} ITERATIONS)"
+             if result.iterations else ""))
+    print(f"TIME             {built - start:.2f}S BUILD, "
+          f"{solved - built:.2f}S SOLVE")
+    print(f"FROM {args.money:,} DOLLARS TO {args.target:,}")
+    print(f"RUIN             {result.ruin[index]:.6f}")
+    print(f"REACH TARGET     {result.target[index]:.6f}")
+    if chain.stalled.any():
+        never_ends = 1 - result.ruin[index] - result.target[index]
+        print(f"NEVER ENDS       {max(never_ends, 0):.6g}")
+    print(f"EXPECTED HANDS   {result.expected_hands[index]:,.3f}")
+    if args.check:
+        for line in cross_check(
+                strategy, args.money, args.target, result, args.check,
+                args.seed
+                ):
+            print(line)
+
+if __name__ == "__main__":
+    main()
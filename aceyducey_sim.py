@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from aceyducey import HIGHEST_CARD, LOWEST_CARD, STARTING_MONEY
+
+# Monte Carlo simulator for Acey Ducey. Plays many players at once as NumPy
+# batches - every hand deals one pair of cards and one third card to each
+# player still in the game, using the rules of aceyducey.py. Players bet
+# according to a strategy and leave the game when their money runs out, as
+# the game does when it prints SORRY, FRIEND, BUT YOU BLEW YOUR WAD.
+
+# usage: python aceyducey_sim.py [--strategy flat:10] [--players 100000]
+#                                [--hands 1000] [--seed SEED]
+#                                [--target TARGET]
+# Strategies: never, flat:AMOUNT, fraction:FRACTION, gap:MIN_GAP:AMOUNT,
+# all-in:MIN_GAP, kelly:MULTIPLIER
+
+# The game deals two cards and deals again until the first is lower than
+# the second. As both cards are uniform, every pair with first < second is
+# equally likely to be dealt, so pairs are drawn directly from this table
+# instead of rerolling
+CARDS = np.arange(LOWEST_CARD, HIGHEST_CARD + 1)
+PAIR_FIRST, PAIR_SECOND = (
+    pair.ravel() for pair in np.meshgrid(CARDS, CARDS, indexing="ij")
+    )
+PAIR_FIRST, PAIR_SECOND = (
+    PAIR_FIRST[PAIR_FIRST < PAIR_SECOND],
+    PAIR_SECOND[PAIR_FIRST < PAIR_SECOND],
+    )
+
+# A strategy takes arrays of the first card, second card and money of each
+# player and returns an array of bets. Bets are rounded down to whole
+# dollars and limited to the player's money, and a bet of 0 is CHICKEN!!
+Strategy = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+# Registered strategy factories, by name
+STRATEGIES: Dict[str, Callable[..., Strategy]] = {}
+
+
+def register_strategy(
+        name: str
+        ) -> Callable[[Callable[..., Strategy]], Callable[..., Strategy]]:
+    '''
+    Decorator adding a strategy factory to STRATEGIES.
+    Args:
+        name: str - name the strategy is chosen by on the command line
+    Returns:
+        Callable - decorator returning the factory unchanged
+    '''
+    def decorator(factory: Callable[..., Strategy]) -> Callable[..., Strategy]:
+        STRATEGIES[name] = factory
+        return factory
+    return decorator
+
+
+@register_strategy("never")
+def never_bet() -> Strategy:
+    '''Never bets.'''
+    def strategy(first, second, money):
+        return np.zeros_like(money)
+    return strategy
+
+
+@register_strategy("flat")
+def flat_bet(amount: float=10) -> Strategy:
+    '''Bets the same amount on every hand.'''
+    def strategy(first, second, money):
+        return np.full_like(money, amount)
+    return strategy
+
+
+@register_strategy("fraction")
+def fraction_bet(fraction: float=0.1) -> Strategy:
+    '''Bets a fraction of the player's money on every hand, and at least
+    one dollar.
+    '''
+    def strategy(first, second, money):
+        return np.maximum(money * fraction, 1)
+    return strategy
+
+
+@register_strategy("gap")
+def gap_bet(min_gap: float=7, amount: float=10) -> Strategy:
+    '''Bets a fixed amount when at least min_gap cards lie strictly between
+    the two cards dealt.
+    '''
+    def strategy(first, second, money):
+        return np.where(second - first - 1 >= min_gap, amount, 0)
+    return strategy
+
+
+@register_strategy("all-in")
+def all_in_bet(min_gap: float=10) -> Strategy:
+    '''Bets all of the player's money when at least min_gap cards lie
+    strictly between the two cards dealt.
+    '''
+    def strategy(first, second, money):
+        return np.where(second - first - 1 >= min_gap, money, 0)
+    return strategy
+
+
+@register_strategy("kelly")
+def kelly_strategy(multiplier: float=1.0) -> Strategy:
+    '''Bets the Kelly fraction of the player's money given the exact odds
+    of the two cards dealt, scaled by multiplier - e.g. 0.5 for half Kelly.
+    '''
+    # Imported here so that the odds tables are only built when needed
+    from aceyducey_odds import WIN_PROBABILITY_FLOAT
+
+    win_probability = np.array(WIN_PROBABILITY_FLOAT)
+
+    def strategy(first, second, money):
+        edge = 2 * win_probability[first, second] - 1
+        return np.where(edge > 0, money * edge * multiplier, 0)
+    return strategy
+
+
+def parse_strategy(spec: str) -> Strategy:
+    '''
+    Builds a strategy from a name and its arguments separated by colons,
+    e.g. "flat:10" or "gap:7:10".
+    Args:
+        spec: str - the strategy name and arguments
+    Returns:
+        Strategy - the strategy
+    Raises:
+        ValueError: If the strategy is not known or its arguments are not
+        numbers.
+    '''
+    name, *args = spec.split(":")
+    if name not in STRATEGIES:
+        raise ValueError(
+            f"unknown strategy {name!r} - choose from "
+            + ", ".join(sorted(STRATEGIES))
+            )
+    return STRATEGIES[name](*(float(arg) for arg in args))
+
+
+def deal(
+        rng: np.random.Generator, count: int
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Deals a hand to each of count players.
+    Args:
+        rng: np.random.Generator - source of the cards
+        count: int - number of hands
+    Returns:
+        tuple of arrays - the first, second and third card of each hand
+    '''
+    pairs = rng.integers(0, len(PAIR_FIRST), count)
+    third = rng.integers(LOWEST_CARD, HIGHEST_CARD + 1, count)
+    return PAIR_FIRST[pairs], PAIR_SECOND[pairs], third
+
+
+SimulationResult = namedtuple(
+    "SimulationResult",
+    "players, hands, dealt, bets, wins, ruin_hand, target_hand, "
+    "final_money, mean_money, trajectories, elapsed"
+    )
+SimulationResult.__doc__ = '''Results of a simulation.
+    players: int - number of players
+    hands: int - most hands played by each player
+    dealt: int - hands dealt, not counting players who had already left
+    bets: int - hands on which a bet was placed
+    wins: int - bets won
+    ruin_hand: np.ndarray - hand on which each player ran out of money,
+    or -1 for players who did not
+    target_hand: np.ndarray - hand on which each player reached the target
+    and left the game, or -1 for players who did not
+    final_money: np.ndarray - money of each player at the end
+    mean_money: np.ndarray - mean money of all players after each hand,
+    starting with the starting money
+    trajectories: np.ndarray - money of the first few players after each
+    hand, one row per player
+    elapsed: float - seconds taken
+    '''
+
+
+def simulate(
+        strategy: Strategy, players: int=100_000, hands: int=1000,
+        seed: Optional[int]=None, starting_money: int=STARTING_MONEY,
+        sample_players: int=5, target: Optional[int]=None
+        ) -> SimulationResult:
+    '''
+    Plays a number of hands for a number of players, all betting with the
+    same strategy. Players who run out of money leave the game, as do
+    players reaching the target if one is given.
+    Args:
+        strategy: Strategy - decides each player's bet
+        players: int - number of players
+        hands: int - most hands played by each player
+        seed: int | None - seed for the cards, for repeatable results
+        starting_money: int - money each player starts with
+        sample_players: int - number of players whose money is recorded
+        after every hand
+        target: int | None - money at which a player stops playing
+    Returns:
+        SimulationResult - the results
+    '''
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    money = np.full(players, starting_money, dtype=np.int64)
+    ruin_hand = np.full(players, -1, dtype=np.int64)
+    target_hand = np.full(players, -1, dtype=np.int64)
+    mean_money = np.empty(hands + 1)
+    mean_money[0] = starting_money
+    sample_players = min(sample_players, players)
+    trajectories = np.empty((sample_players, hands + 1), dtype=np.int64)
+    trajectories[:, 0] = starting_money
+
+    # Indices of the players still in the game
+    playing = np.arange(players)
+    dealt = bets_placed = wins = 0
+    for hand in range(1, hands + 1):
+        if playing.size:
+            first, second, third = deal(rng, playing.size)
+            player_money = money[playing]
+            bets = strategy(first, second, player_money)
+            bets = np.clip(
+                np.floor(bets).astype(np.int64), 0, player_money
+                )
+            won = (first < third) & (third < second)
+            player_money += np.where(won, bets, -bets)
+            money[playing] = player_money
+
+            dealt += playing.size
+            placed = bets > 0
+            bets_placed += int(np.count_nonzero(placed))
+            wins += int(np.count_nonzero(won & placed))
+
+            ruined = player_money <= 0
+            leaving = ruined
+            if ruined.any():
+                ruin_hand[playing[ruined]] = hand
+            if target is not None:
+                reached = player_money >= target
+                if reached.any():
+                    target_hand[playing[reached]] = hand
+                    leaving = ruined | reached
+            if leaving.any():
+                playing = playing[~leaving]
+        mean_money[hand] = money.mean()
+        trajectories[:, hand] = money[:sample_players]
+
+    return SimulationResult(
+        players, hands, dealt, bets_placed, wins, ruin_hand, target_hand,
+        money, mean_money, trajectories, time.perf_counter() - start
+        )
+
+
+def ruin_histogram(
+        result: SimulationResult, bins: int=20
+        ) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Counts the players running out of money in each range of hands.
+    Args:
+        result: SimulationResult - results of a simulation
+        bins: int - number of ranges of hands
+    Returns:
+        tuple of arrays - count of players in each range and the edges of
+        the ranges
+    '''
+    ruined = result.ruin_hand[result.ruin_hand > 0]
+    return np.histogram(ruined, bins=bins, range=(1, result.hands + 1))
+
+
+def format_report(result: SimulationResult, bins: int=20) -> List[str]:
+    '''
+    Formats the results of a simulation as lines of text.
+    Args:
+        result: SimulationResult - results of a simulation
+        bins: int - number of ranges of hands in the time to ruin
+        histogram
+    Returns:
+        List[str] - the report
+    '''
+    ruined = int(np.count_nonzero(result.ruin_hand > 0))
+    win_rate = result.wins / result.bets if result.bets else 0.0
+    lines = [
+        f"PLAYERS          {result.players:,}",
+        f"HANDS DEALT      {result.dealt:,}",
+        f"HANDS/S          {result.dealt / result.elapsed:,.0f}",
+        f"BETS PLACED      {result.bets:,}",
+        f"WIN RATE         {win_rate:.4f}",
+        f"RUINED           {ruined:,} ({ruined / result.players:.2%})",
+        ]
+    reached = int(np.count_nonzero(result.target_hand > 0))
+    if reached:
+        lines.append(
+            f"REACHED TARGET   {reached:,} ({reached / result.players:.2%})"
+            )
+    p10, p50, p90 = np.percentile(result.final_money, [10, 50, 90])
+    lines.append(
+        f"FINAL MONEY      MEAN {result.final_money.mean():,.1f}  "
+        f"P10 {p10:,.0f}  P50 {p50:,.0f}  P90 {p90:,.0f}"
+        )
+
+    lines.append("")
+    lines.append("MEAN MONEY BY HAND")
+    for hand in np.linspace(0, result.hands, 11).astype(int):
+        lines.append(f"{hand : >10,}  {result.mean_money[hand]:,.1f}")
+
+    if result.trajectories.size:
+        lines.append("")
+        lines.append("SAMPLE PLAYERS AT HAND " + ", ".join(
+            f"{hand:,}" for hand in np.linspace(0, result.hands, 6)
+            .astype(int)
+            ))
+        for row in result.trajectories:
+            lines.append("  ".join(
+                f"{money : >8,}" for money in
+                row[np.linspace(0, result.hands, 6).astype(int)]
+                ))
+
+    if ruined:
+        counts, edges = ruin_histogram(result, bins)
+        lines.append("")
+        lines.append("HANDS TO RUIN")
+        scale = 50 / counts.max()
+        for count, low, high in zip(counts, edges[:-1], edges[1:]):
+            lines.append(
+                f"{int(low) : >7,}-{int(high) - 1 : <7,}{count : >10,} "
+                + "*" * round(count * scale)
+                )
+    return lines
+
+
+def main() -> None:
+    """Runs a simulation and prints the report
+    """
+    parser = argparse.ArgumentParser(
+        prog="Acey Ducey Simulator",
+        description="Simulates many players of Acey Ducey with NumPy",
+        )
+    parser.add_argument(
+        "--strategy", default="flat:10",
+        help="NAME[:ARG...] - one of " + ", ".join(sorted(STRATEGIES)),
+        )
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--hands", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--money", type=int, default=STARTING_MONEY,
+        help="money each player starts with",
+        )
+    parser.add_argument(
+        "--target", type=int, default=None,
+        help="money at which a player stops playing",
+        )
+    parser.add_argument("--bins", type=int, default=20)
+    args = parser.parse_args()
+    try:
+        strategy = parse_strategy(args.strategy)
+    except (ValueError, TypeError) as error:
+        parser.error(str(error))
+
+    result = simulate(
+        strategy, args.players, args.hands, args.seed, args.money,
+        target=args.target
+        )
+    print(f"STRATEGY         {args.strategy}")
+    for line in format_report(result, args.bins):
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib
+import math
+import random
+import time
+from collections import namedtuple
+from typing import Callable, Iterator, List
+
+import numpy as np
+
+from aceyducey import STARTING_MONEY
+from aceyducey_sim import STRATEGIES, deal, parse_strategy
+
+# Tournament of Acey Ducey betting strategies. Every strategy plays the same
+# games - game n is dealt from a seed derived from the master seed and n,
+# so each strategy sees exactly the same cards. Games are shared out to a
+# pool of worker processes in blocks, and the results are put back together
+# in order, so the leaderboard is the same for any number of workers.
+
+# A strategy is any callable taking the first card, the second card and the
+# player's money, and returning a bet - a bet is rounded down to whole
+# dollars and limited to the player's money, and 0 is CHICKEN!! Strategies
+# are given as the name of a simulator strategy with its arguments, e.g.
+# flat:10 or kelly:0.5, or as MODULE:FUNCTION to load a plugin, e.g.
+# my_strategies:cautious for
+#     def cautious(first: int, second: int, money: int) -> int:
+#         return 10 if second - first > 8 else 0
+
+# usage: python aceyducey_tournament.py [--strategy SPEC ...]
+#                                       [--games 2000] [--hands 200]
+#                                       [--workers 1] [--seed SEED]
+
+ScalarStrategy = Callable[[int, int, int], float]
+
+DEFAULT_STRATEGIES = [
+    "never", "flat:10", "fraction:0.1", "gap:8:10", "all-in:10",
+    "kelly:1", "kelly:0.5",
+    ]
+
+# Games played by each job sent to a worker
+BLOCK_SIZE = 250
+
+StrategyResult = namedtuple(
+    "StrategyResult", "spec, final_money, hands, bets, wins, ruined"
+    )
+StrategyResult.__doc__ = '''Results of one strategy over all its games.
+    spec: str - the strategy
+    final_money: List[int] - money at the end of each game
+    hands: int - hands played
+    bets: int - hands bet on
+    wins: int - bets won
+    ruined: int - games that ended with the money run out
+    '''
+
+LeaderboardRow = namedtuple(
+    "LeaderboardRow",
+    "spec, mean_money, money_interval, ruin_rate, ruin_interval, win_rate, "
+    "hands"
+    )
+
+
+def load_strategy(spec: str) -> ScalarStrategy:
+    '''
+    Loads a strategy from the simulator's strategies or from a plugin.
+    Args:
+        spec: str - NAME[:ARG...] for a simulator strategy, or
+        MODULE:FUNCTION for a plugin
+    Returns:
+        ScalarStrategy - the strategy
+    Raises:
+        ValueError: If the strategy cannot be found.
+    '''
+    name, _, attribute = spec.partition(":")
+    if name in STRATEGIES:
+        return parse_strategy(spec)
+    if not attribute:
+        raise ValueError(
+            f"unknown strategy {spec!r} - give one of "
+            + ", ".join(sorted(STRATEGIES)) + " or MODULE:FUNCTION"
+            )
+    try:
+        strategy = getattr(importlib.import_module(name), attribute)
+    except (ImportError, AttributeError) as error:
+        raise ValueError(f"cannot load strategy {spec!r}: {error}") from None
+    if not callable(strategy):
+        raise ValueError(f"strategy {spec!r} is not callable")
+    return strategy
+
+
+def deal_game(
+        master_seed: int, game: int, hands: int
+        ) -> tuple[List[int], List[int], List[int]]:
+    '''
+    Deals the cards for one game of the tournament. The same game always
+    gets the same cards, whichever strategy plays it and whichever worker
+    it runs in.
+    Args:
+        master_seed: int - seed for the tournament
+        game: int - number of the game
+        hands: int - number of hands to deal
+    Returns:
+        tuple of lists - the first, second and third card of each hand
+    '''
+    rng = np.random.default_rng(np.random.SeedSequence([master_seed, game]))
+    first, second, third = deal(rng, hands)
+    return first.tolist(), second.tolist(), third.tolist()
+
+
+def _play_block(
+        job: tuple[int, str, int, int, int, int, int]
+        ) -> tuple[int, int, List[int], int, int, int, int]:
+    '''
+    Plays a block of games with one strategy - run in the worker
+    processes.
+    Args:
+        job: tuple - index of the strategy, strategy, master seed, first
+        game, number of games, hands per game and starting money
+    Returns:
+        tuple - index of the strategy, first game, money at the end of each
+        game, hands played, bets, wins and games ruined
+    '''
+    index, spec, master_seed, first_game, games, hands, starting_money = job
+    strategy = load_strategy(spec)
+    final_money = []
+    played = bets_placed = wins = ruined = 0
+    for game in range(first_game, first_game + games):
+        money = starting_money
+        for first, second, third in zip(*deal_game(master_seed, game, hands)):
+            played += 1
+            bet = math.floor(float(strategy(first, second, money)))
+            bet = min(max(bet, 0), money)
+            if bet == 0:
+                continue
+            bets_placed += 1
+            if first < third < second:
+                wins += 1
+                money += bet
+            else:
+                money -= bet
+                if money <= 0:
+                    ruined += 1
+                    break
+        final_money.append(money)
+    return (
+        index, first_game, final_money, played, bets_placed, wins, ruined
+        )
+
+
+def run_tournament(
+        specs: List[str], games: int, hands: int, master_seed: int,
+        workers: int=1, starting_money: int=STARTING_MONEY
+        ) -> List[StrategyResult]:
+    '''
+    Plays every strategy through the same games, optionally across a pool
+    of worker processes. The results are the same for any number of
+    workers.
+    Args:
+        specs: List[str] - the strategies
+        games: int - games played by each strategy
+        hands: int - most hands in each game
+        master_seed: int - seed for the cards
+        workers: int - number of worker processes, 1 to run in this process
+        starting_money: int - money at the start of each game
+    Returns:
+        List[StrategyResult] - results of each strategy, in the order given
+    '''
+    # Check every strategy loads before starting the workers
+    for spec in specs:
+        load_strategy(spec)
+    jobs = [
+        (
+            index, spec, master_seed, first_game,
+            min(BLOCK_SIZE, games - first_game), hands, starting_money
+            )
+        for index, spec in enumerate(specs)
+        for first_game in range(0, games, BLOCK_SIZE)
+        ]
+    if workers <= 1:
+        blocks: Iterator = map(_play_block, jobs)
+        return _collect(specs, blocks)
+    from multiprocessing import Pool
+    with Pool(workers) as pool:
+        return _collect(specs, pool.imap_unordered(_play_block, jobs))
+
+
+def _collect(specs: List[str], blocks: Iterator) -> List[StrategyResult]:
+    """Puts the blocks of results back together in game order."""
+    by_strategy: List[dict] = [{} for _ in specs]
+    totals = [[0, 0, 0, 0] for _ in specs]
+    for index, first_game, final_money, *counts in blocks:
+        by_strategy[index][first_game] = final_money
+        totals[index] = [
+            total + count for total, count in zip(totals[index], counts)
+            ]
+    return [
+        StrategyResult(
+            spec,
+            [money for first_game in sorted(blocks_done)
+             for money in blocks_done[first_game]],
+            *total,
+            )
+        for spec, blocks_done, total in zip(specs, by_strategy, totals)
+        ]
+
+
+def wilson_interval(
+        successes: int, trials: int, z: float=1.96
+        ) -> tuple[float, float]:
+    '''
+    Returns the Wilson score confidence interval for a proportion.
+    Args:
+        successes: int - number of successes
+        trials: int - number of trials
+        z: float - standard normal quantile, 1.96 for 95%
+    Returns:
+        tuple[float, float] - lower and upper bound
+    '''
+    if trials == 0:
+        return 0.0, 1.0
+    proportion = successes / trials
+    centre = proportion + z * z / (2 * trials)
+    spread = z * math.sqrt(
+        proportion * (1 - proportion) / trials + z * z / (4 * trials ** 2)
+        )
+    scale = 1 + z * z / trials
+    return (centre - spread) / scale, (centre + spread) / scale
+
+
+def leaderboard(
+        results: List[StrategyResult], z: float=1.96
+        ) -> List[LeaderboardRow]:
+    '''
+    Ranks strategies by their mean money at the end of a game, with normal
+    confidence intervals for the mean and Wilson intervals for the rate of
+    ruin.
+    Args:
+        results: List[StrategyResult] - results of each strategy
+        z: float - standard normal quantile, 1.96 for 95% intervals
+    Returns:
+        List[LeaderboardRow] - the strategies, best first
+    '''
+    rows = []
+    for result in results:
+        money = np.array(result.final_money, dtype=np.float64)
+        mean = float(money.mean())
+        error = float(money.std(ddof=1) / math.sqrt(money.size)) \
+            if money.size > 1 else 0.0
+        games = len(result.final_money)
+        rows.append(LeaderboardRow(
+            result.spec, mean, (mean - z * error, mean + z * error),
+            result.ruined / games, wilson_interval(result.ruined, games, z),
+            result.wins / result.bets if result.bets else 0.0,
+            result.hands,
+            ))
+    # Ties are broken by the order the strategies were given in
+    return sorted(rows, key=lambda row: -row.mean_money)
+
+
+def format_leaderboard(rows: List[LeaderboardRow]) -> List[str]:
+    """Formats the leaderboard as lines of text."""
+    lines = [
+        f"{'RANK' : <5}{'STRATEGY' : <24}{'MEAN MONEY' : >11}"
+        f"{'95% CI' : >20}{'RUIN' : >8}{'95% CI' : >16}{'BET WIN' : >9}"
+        ]
+    for rank, row in enumerate(rows, 1):
+        low, high = row.money_interval
+        ruin_low, ruin_high = row.ruin_interval
+        lines.append(
+            f"{rank : <5}{row.spec[:23] : <24}{row.mean_money : >11,.1f}"
+            f"{f'{low:,.1f} - {high:,.1f}' : >20}{row.ruin_rate : >8.1%}"
+            f"{f'{ruin_low:.1%} - {ruin_high:.1%}' : >16}"
+            f"{row.win_rate : >9.1%}"
+            )
+    return lines
+
+
+def main() -> None:
+    """Runs a tournament and prints the leaderboard
+    """
+    parser = argparse.ArgumentParser(
+        prog="Acey Ducey Tournament",
+        description="Ranks Acey Ducey betting strategies on identical deals",
+        )
+    parser.add_argument(
+        "--strategy", action="append", dest="strategies", metavar="SPEC",
+        help="NAME[:ARG...] or MODULE:FUNCTION - may be repeated",
+        )
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--hands", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--money", type=int, default=STARTING_MONEY,
+        help="money at the start of each game",
+        )
+    args = parser.parse_args()
+    specs = args.strategies or DEFAULT_STRATEGIES
+    master_seed = args.seed
+    if master_seed is None:
+        master_seed = random.randrange(2**63)
+
+    start = time.perf_counter()
+    try:
+        results = run_tournament(
+            specs, args.games, args.hands, master_seed, args.workers,
+            args.money
+            )
+    except (ValueError, TypeError) as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+
+    hands = sum(result.hands for result in results)
+    print(f"SEED             {master_seed}")
+    print(f"GAMES            {args.games:,} PER STRATEGY")
+    print(f"HANDS PLAYED     {hands:,}")
+    print(f"WORKERS          {args.workers}")
+    print(f"GAMES/S          {args.games * len(specs) / elapsed:,.0f}")
+    print(f"HANDS/S          {hands / elapsed:,.0f}")
+    print()
+    for line in format_leaderboard(leaderboard(results)):
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 
-import random
 import argparse
-from typing import List, Any
+import os
+import random
+import sys
 
-from helpers import Terminal, create_2d_array
+from helpers import Terminal, get_output, print_text
+from maze import (
+    ALGORITHMS, DOWN, LEFT, RIGHT, UP, Maze, MazeStep, generate_batch,
+    render_maze, render_maze_numpy, report_progress, stream_maze,
+    )
+
+# maze_cache, maze_format and maze_solver are imported only by the options
+# that need them, to keep startup fast when launched from games.py
 
 # AMAZING PROGRAM
 # CREATIVE COMPUTING  MORRISTOWN, NEW JERSEY
@@ -12,46 +20,94 @@ from helpers import Terminal, create_2d_array
 # Refactoring of the "Amazing" BASIC game from the 1978 book BASIC Computer 
 # Games by Creative Computing into Python 3 - this version is refactored to 
 # accept CLI arguments so that the output can be passed to stdout and printed
-#  if required
-
-# usage: Amazing Maze Generator [-help] width height
+#  if required. The maze engine itself lives in maze.py so that it can be
+# imported without the CLI.
+
+# usage: Amazing Maze Generator [-help] [--numpy] [--algorithm ALGORITHM]
+#                               [--stream] [--solve] [--seed SEED]
+#                               [--cache CACHE] [--cache-size CACHE_SIZE]
+#                               [--save SAVE] [--load LOAD]
+#                               [--viewport ROW,COL,H,W] [--animate]
+#                               [--fps FPS] [--steps-per-frame N]
+#                               [--progress PROGRESS]
+#                               [--count COUNT] [--workers WORKERS]
+#                               [--out OUT] width height
 # Example (Windows) - py .\amazing.py 10 20 prints a maze with 10 columns and 
 # 20 rows
 # Example (Linux) - python .\amazing.py 10 20 prints a maze with 10 columns 
 # and 20 rows
+# Example (batch) - python amazing.py 10 20 --count 10000 --workers 8 
+# --seed 1 --out mazes writes 10000 reproducible mazes to the mazes directory
 
 # Original author is Jack Hauber of Windsor, Connecticut
 
-def main():
-    """Main game loop
+def check_positive(value: str|int, minimum: int=2) -> int:   
     """
-
-    def check_positive(value: str|int) -> int:   
-        """
-        Validates if the provided value is a positive integer greater than 1.
-        If the value is less than or equal to 1, or if the input cannot be 
-        converted to an integer, an exception is raised.
-        Args:
-            value: str | int- The input value to be validated
-        Returns:
-            value: int- The valid positive integer greater than 1
-        Raises:
-            argparse.ArgumentTypeError: If the integer is less than or equal 
-            to 1
-            Exception: If the input cannot be converted to an integer
-        Credit - https://stackoverflow.com/a/64980375 
-        """
-        try:
-            value = int(value)
-            if value <= 1:
-                raise argparse.ArgumentTypeError(
-                    "{} is not a positive integer greater than 1"
-                    .format(value)
+    Validates if the provided value is a positive integer of at least
+    `minimum`, greater than 1 by default. If the value is less than
+    `minimum`, or if the input cannot be converted to an integer, an
+    argparse.ArgumentTypeError is raised so that argparse reports a usage
+    error.
+    Args:
+        value: str | int- The input value to be validated
+        minimum: int- The smallest value accepted
+    Returns:
+        value: int- The valid positive integer
+    Raises:
+        argparse.ArgumentTypeError: If the integer is less than `minimum`
+        or the input cannot be converted to an integer
+    Credit - https://stackoverflow.com/a/64980375 
+    """
+    try:
+        value = int(value)
+        if value < minimum:
+            raise argparse.ArgumentTypeError(
+                "{} is not a positive integer{}".format(
+                    value,
+                    f" greater than {minimum - 1}" if minimum > 1 else ""
                     )
-        except ValueError:
-            raise Exception("{} is not an integer".format(value))
-        return value
+                )
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "{} is not an integer".format(value)
+            )
+    return value
+
+
+def check_at_least_one(value: str|int) -> int:
+    """
+    Validates if the provided value is a positive integer, as
+    check_positive does with a minimum of 1.
+    """
+    return check_positive(value, 1)
+
+
+def parse_viewport(value: str) -> tuple[int, int, int, int]:
+    """
+    Parses a viewport given as ROW,COL,H,W.
+    Args:
+        value: str- The input value to be parsed
+    Returns:
+        tuple[int, int, int, int]: first row, first column, height and 
+        width of the viewport
+    Raises:
+        argparse.ArgumentTypeError: If the value is not four positive 
+        integers separated by commas
+    """
+    try:
+        viewport = tuple(int(part) for part in value.split(","))
+    except ValueError:
+        viewport = ()
+    if len(viewport) != 4 or min(viewport) < 1:
+        raise argparse.ArgumentTypeError(
+            "{} is not four positive integers ROW,COL,H,W".format(value)
+            )
+    return viewport
+
 
+def main():
+    """Main game loop
+    """
     parser = argparse.ArgumentParser(
         prog="Amazing Maze Generator",
         description="""
@@ -79,361 +135,337 @@ def main():
                         """, 
                         type = check_positive,
                         )
-    
-    args = parser.parse_args()
-    maze_width = args.width[0]
-    maze_height = args.height[0]
-
-    Maze = List[List[Any]]
-
-    # Initialise new terminal - terminal width can be greater than the default 
-    # of 80 given stdout can be used - 3 characters are used for each column 
-    # in the maze, followed by a single character after the last column
-    terminal = Terminal((maze_width + 1) * (3)) 
-
-    maze_cell_state: Maze = create_2d_array(maze_width, maze_height)
-    maze_walls: Maze = create_2d_array(maze_width, maze_height)
-    backtracking: bool = False 
-
-    # Choose a random starting column for the maze entrance
-    entrance_col: int = random.randint(1, maze_width)
-    # Choose a random column for the maze exit
-    exit_col: int = random.randint(1, maze_height)
-
-    col: int = entrance_col
-    row: int = 1
-    maze_path: List[str] = []
-    counter: int = 0
-
-    def print_first_row(
-            terminal, entrance_col: int, maze_width: int
-            ) -> Terminal:
-        '''
-        Prints the first row of the maze with a random entrance.
-        Args:
-            terminal: terminal class representing data to be output in console
-            entrance_col: int - randomly selected maze entrance column
-            maze_width: int - maze width
-        Returns:
-            terminal: updated terminal class representing data to be output in
-            console
-        '''
-        for i in range(0, (maze_width * 3), 3):
-            if i == (entrance_col-1)*3:
-                # Print the maze entrance
-                terminal.add_character(0, i, ".")
-                terminal.add_character(0, i + 1, " ")
-                terminal.add_character(0, i + 2, " ")
-            else:
-                # Print the maze walls in first row
-                terminal.add_character(0, i, ".")
-                terminal.add_character(0, i + 1, "-")
-                terminal.add_character(0, i + 2, "-")
-        terminal.add_character(0, maze_width * 3, ".")
-        return terminal
-
-    def print_exit(terminal, maze_height: int, exit_col: int) -> Terminal:
-        '''
-        Prints a random exit in the last row of the maze.
-        Args:
-            terminal: terminal class representing data to be output in console
-            maze_height: int - maze height
-            exit_col: int - randomly selected maze exit column 
-        Returns:
-            terminal: updated terminal class representing data to be output in
-            console
-        '''
-        terminal.add_character((maze_height * 2), ((exit_col - 1) * 3), ":")
-        terminal.add_character(
-            (maze_height * 2), ((exit_col - 1) * 3) + 1, " "
-            )
-        terminal.add_character(
-            (maze_height * 2), ((exit_col - 1) * 3) + 2, " "
-            )
-        return terminal
-
-    def check_direction(
-            row: int, col: int, maze_cell_state: Maze
-            ) -> List[str]:
-        '''
-        Determines the possible directions the maze can move from the 
-        specified cell. Function checks all four possible movement directions
-        from the specified position in the maze and returns a list of valid
-        directions where the next move can be made. A direction is considered
-        valid if it leads to a cell that has not yet been visited.
-        Args:
-            row: int - The current row position in the maze (1-indexed)
-            col: int - The current column position in the maze (1-indexed)
-            maze_cell_state: List - Variable representing current maze cell 
-            state
-        Returns:
-            possible_directions: list[str]- A list of valid directions 
-            ('UP', 'DOWN', 'LEFT', 'RIGHT') where movement is possible
-        '''
-        possible_directions=[]
-
-        # Check if we can move up
-        if row > 1 and maze_cell_state[row - 2][col - 1] != 1:
-            possible_directions.append("UP")
-
-        # Check if we can move down
-        if row < maze_height and maze_cell_state[row][col - 1] != 1:
-            possible_directions.append("DOWN")
-
-        # Check if we can move left
-        if col > 1 and maze_cell_state[row - 1][col - 2] != 1:
-            possible_directions.append("LEFT")
-
-        # Check if we can move right
-        if col < maze_width and maze_cell_state[row - 1][col] != 1:
-            possible_directions.append("RIGHT")
-
-        return(possible_directions)
-
-    def move_in_direction(
-            direction: str, counter: int, row: int, col: int, 
-            backtracking: bool, maze_walls: Maze, maze_cell_state: Maze,
-            maze_path: List[str]
-            ):
-        '''
-        Knocks down walls in the maze in a specified direction by updating the 
-        maze wall state. Function updates the current position (`row`, `col`) 
-        in the maze and cell visited state based on the provided direction 
-        and updates the maze's wall configuration state. If we are 
-        backtracking, position is updated without altering the maze wall or
-        cell visited state. 
-        Args:
-            direction: str- direction to move in the maze
-            counter : int- tracks the number of cells visited during maze 
-            generation
-            row: int- current row position in the maze (1-indexed)
-            col: int- current column position in the maze (1-indexed)
-            backtracking: bool- flag indicating whether we are currently 
-            backtracking
-            maze_walls: list- 2D list representing the maze wall state
-            maze_cell_state: list- 2D list representing the state of each cell 
-            in the maze
-            maze_path: list- list representing the maze path taken so far
-        Returns:
-            counter: int- tracks the number of cells visited during maze 
-            generation
-            row: int- current row position in the maze (1-indexed)
-            col: int- current column position in the maze (1-indexed)
-            maze_walls: list- 2D list representing the maze wall state
-            maze_cell_state: list - 2D list representing the state of each 
-            cell in the maze
-            maze_path: list- list representing the maze path taken so far
-        '''
-
-        # Movement when backtracking is false:
-        if direction == "UP" and not backtracking:
-            if (maze_walls[row - 1][col - 1] == ""):
-                maze_walls[row - 1][col - 1] = "UP"
-            # If the cell has already been visited, we change the maze wall 
-            # state in the adjacent cell
-            elif (maze_walls[row - 1][col - 1] != ""):
-                maze_walls[row - 2][col - 1] = "DOWN"
-            row -= 1
-            maze_cell_state[row - 1][col - 1] = 1
-            counter += 1
-            maze_path.append("UP")
-        elif direction == "DOWN" and not backtracking:
-            if (maze_walls[row - 1][col - 1] == ""):
-                maze_walls[row - 1][col - 1] = "DOWN"
-            elif (maze_walls[row - 1][col - 1] != ""):
-                maze_walls[row - 0][col - 1] = "UP"
-            row += 1
-            maze_cell_state[row - 1][col - 1] = 1
-            counter += 1
-            maze_path.append("DOWN")
-        elif direction == "LEFT" and not backtracking:
-            if (maze_walls[row - 1][col - 1] == ""):
-                maze_walls[row - 1][col - 1] = "LEFT"
-            elif (maze_walls[row - 1][col - 1] != ""):
-                maze_walls[row - 1][col - 2] = "RIGHT"
-            col -= 1
-            maze_cell_state[row - 1][col - 1] = 1
-            counter += 1
-            maze_path.append("LEFT")
-        elif direction == "RIGHT" and not backtracking:
-            if (maze_walls[row - 1][col - 1] == ""):
-                maze_walls[row - 1][col - 1] = "RIGHT"
-            elif (maze_walls[row - 1][col - 1] != ""):
-                maze_walls[row - 1][col - 0] = "LEFT"
-            col += 1
-            maze_cell_state[row - 1][col - 1] = 1
-            counter += 1
-            maze_path.append("RIGHT")
-
-        # Movement when backtracking is true:
-        # Direction is UP - however we need to move DOWN
-        elif direction == "UP" and backtracking:
-            row += 1
-        # Direction is DOWN - however we need to move UP
-        elif direction == "DOWN" and backtracking:
-            row -= 1
-        # Direction is LEFT - however we need to move RIGHT
-        elif direction == "LEFT" and backtracking:
-            col += 1
-        # Direction is RIGHT - however we need to move LEFT
-        elif direction == "RIGHT" and backtracking:
-            col -= 1
-        return(row, col, counter, maze_cell_state, maze_path, maze_walls)
-
-    def generate_maze(
-            counter: int, row: int, col: int, backtracking: bool, 
-            maze_walls: Maze, maze_cell_state: Maze, maze_path: List[str], 
-            maze_width: int, maze_height: int
-            ) -> Maze:
-        '''
-        Generates a maze using a depth-first search (DFS) algorithm with 
-        backtracking. If no options remain for backtracking, the function 
-        selects a new random starting position within the maze until all cells
-        have been visited.
-        Args:
-            counter : int- tracks the number of cells visited during maze 
-            generation
-            row: int- current row position in the maze (1-indexed)
-            col: int- current column position in the maze (1-indexed)
-            backtracking: bool- flag indicating whether we are currently 
-            backtracking
-            maze_walls: list- 2D list representing the maze wall state
-            maze_cell_state: list- 2D list representing the state of each 
-            cell in 
-            maze_path: list- list representing the maze path taken so far
-            the maze
-            maze_width: int - maze width
-            maze_height: int - maze height
-        Returns:
-            maze_walls: list- 2D list representing the maze wall state
-        '''
-
-        # Mark entrance cell as visited
-        maze_cell_state[row - 1][col - 1] = 1
-        counter += 1
-
-        while counter < (maze_width * maze_height):
-            if not backtracking:
-                directions: List[str] = []
-                if check_direction(row, col, maze_cell_state):
-                    directions = check_direction(row, col, maze_cell_state)
-                    direction = random.choice(directions)
-                    (row, col, counter, maze_cell_state, maze_path, 
-                     maze_walls) = \
-                        move_in_direction(
-                        direction, counter, row, col, backtracking, 
-                        maze_walls, maze_cell_state, maze_path
+    parser.add_argument(
+                        "--numpy",
+                        action = "store_true",
+                        help = """
+                        Render the maze with NumPy and write it in a single
+                        buffered write (requires NumPy)
+                        """,
                         )
-                else:
-                    backtracking = True 
-
-            if backtracking:
-                backtrack_directions = []
-                # backtracking is true - no available directions to move but 
-                # the maze isn't finished yet
-                if not maze_path:
-                    # Select another random starting position if the maze 
-                    # isn't finished and no options remain for backtracking
-                    random_col = (int(random.random() * maze_width))
-                    random_row = (int(random.random() * maze_height))
-                    col = random_col
-                    row = random_row
-                    backtracking = False
-                    continue
-                backtrack_direction = maze_path.pop()
-                (row, col, counter, maze_cell_state, maze_path, maze_walls) =\
-                move_in_direction(
-                        backtrack_direction, counter, row, col, backtracking, 
-                        maze_walls, maze_cell_state, maze_path
+    parser.add_argument(
+                        "--algorithm",
+                        choices = sorted(ALGORITHMS),
+                        help = """
+                        Maze generation algorithm - dfs (the original
+                        depth-first search, the default), eller, kruskal, 
+                        prim or wilson
+                        """,
                         )
-                if check_direction(row,col,maze_cell_state):
-                    backtrack_directions=check_direction(
-                        row,col,maze_cell_state
+    parser.add_argument(
+                        "--stream",
+                        action = "store_true",
+                        help = """
+                        Generate and print the maze row by row with Eller's
+                        algorithm in constant memory, for mazes of
+                        effectively unbounded height
+                        """,
+                        )
+    parser.add_argument(
+                        "--solve",
+                        action = "store_true",
+                        help = """
+                        Draw the route from the entrance to the exit into the
+                        maze and report its length on stderr
+                        """,
                         )
-                    direction = random.choice(backtrack_directions)
-                    backtracking = False
-                    (row, col, counter, maze_cell_state, maze_path, 
-                    maze_walls) = \
-                    move_in_direction(
-                        direction, counter, row, col, backtracking, 
-                        maze_walls, maze_cell_state, maze_path
+    parser.add_argument(
+                        "--animate",
+                        action = "store_true",
+                        help = """
+                        Animate the maze being carved in the console (dfs 
+                        algorithm only) - with --save, the maze is saved once
+                        the animation has finished
+                        """,
                         )
-        return maze_walls
-
-    def draw_maze(
-            terminal: Terminal, maze_height: int, maze_width: int, row: int,
-            col: int, maze_walls: Maze
-            ) -> Terminal:
-        '''
-        Args:
-            terminal: terminal class representing data to be output in console
-            maze_height: int - maze height        
-            maze_width: int - maze width
-            row: int- current row position in the maze (1-indexed)
-            col: int- current column position in the maze (1-indexed)
-            maze_walls: list- 2D list representing the maze wall state
-        Returns:
-            terminal: updated terminal class representing data to be output in
-            console
-        '''
-        for row in range(1, (maze_height * 2), 2):
-            for col in range(0, (maze_width * 3), 3):
-                # Draw all walls in maze
-                terminal.add_character(row,col, "|")
-                terminal.add_character(row,col + 1, " ")
-                terminal.add_character(row,col + 2, " ")
-                if col == (maze_width - 1) * 3:
-                    terminal.add_character(row, col + 3, "|")
-                # Draw all floors in maze
-                terminal.add_character(row + 1, col, ":")
-                terminal.add_character(row + 1, col + 1, "-")
-                terminal.add_character(row + 1 ,col + 2, "-")
-                if col == (maze_width - 1) * 3:
-                    terminal.add_character(row+1,col+3,":")
-                if col == (maze_width - 1) * 3 \
-                    and row == ((maze_height * 2) - 1):
-                    terminal.add_character(row + 1,col + 3, ".")
-        
-        # Loop through maze and knock down walls depending on state of entry 
-        # in maze_walls array
-        for row in range(len(maze_walls)):
-            for col in range(len(maze_walls[row])):
-                if maze_walls[row][col] == "UP":
-                    # Knock down floor of cell above
-                    terminal.add_character(((row * 2)), (col * 3) + 1, " ")
-                    terminal.add_character(((row * 2)), (col * 3) + 2, " ")
-                if maze_walls[row][col] == "DOWN":
-                    # Knock down floor of cell below
-                    terminal.add_character(
-                        ((row * 2) + 2), (col * 3) + 1, " "
+    parser.add_argument(
+                        "--fps",
+                        type = float,
+                        default = 30,
+                        help = "Highest frame rate of --animate",
                         )
-                    terminal.add_character(
-                        ((row * 2) + 2), (col * 3) + 2, " "
+    parser.add_argument(
+                        "--steps-per-frame",
+                        type = check_at_least_one,
+                        default = 1,
+                        help = "Generation steps drawn in each --animate frame",
                         )
-                if maze_walls[row][col] == "RIGHT":
-                    # Knock down wall of cell to the right
-                    terminal.add_character(
-                        ((row * 2) + 1), (col * 3) + 3, " "
+    parser.add_argument(
+                        "--progress",
+                        type = check_at_least_one,
+                        help = """
+                        Report progress on stderr every PROGRESS cells carved
+                        (dfs algorithm only)
+                        """,
                         )
-                if maze_walls[row][col]=="LEFT":
-                    # Knock down wall of cell to the left
-                    terminal.add_character(
-                        ((row * 2) + 1), (col * 3), " "
+    parser.add_argument(
+                        "--seed",
+                        type = int,
+                        help = """
+                        Seed for the random number generator - the same size
+                        and seed always produce the same maze. In batch mode
+                        this is the master seed of the whole batch
+                        """,
+                        )
+    parser.add_argument(
+                        "--cache",
+                        help = """
+                        Directory of cached mazes - a maze with the same
+                        size, seed and algorithm is read from the cache
+                        instead of being generated again (requires --seed)
+                        """,
+                        )
+    parser.add_argument(
+                        "--cache-size",
+                        type = int,
+                        default = 256,
+                        help = "Largest size of the maze cache in MB",
+                        )
+    parser.add_argument(
+                        "--save",
+                        help = "Also save the maze to this binary maze file",
+                        )
+    parser.add_argument(
+                        "--load",
+                        help = """
+                        Print the maze in this binary maze file instead of
+                        generating one - width and height are ignored
+                        """,
+                        )
+    parser.add_argument(
+                        "--viewport",
+                        type = parse_viewport,
+                        help = """
+                        With --load, print only the window of ROW,COL,H,W
+                        cells starting at row ROW and column COL (1-indexed),
+                        reading only that part of the file
+                        """,
+                        )
+    parser.add_argument(
+                        "--count",
+                        type = check_at_least_one,
+                        help = """
+                        Batch mode - generate this many mazes, written as 
+                        JSON lines to stdout or as files to --out
+                        """,
+                        )
+    parser.add_argument(
+                        "--workers",
+                        type = check_at_least_one,
+                        default = 1,
+                        help = "Number of worker processes in batch mode",
+                        )
+    parser.add_argument(
+                        "--out",
+                        help = """
+                        Directory to write batch mode mazes to - the master
+                        seed is printed so that the batch can be reproduced
+                        """,
                         )
-        return terminal
     
-    maze_walls = generate_maze(
-        counter, row, col, backtracking, maze_walls, maze_cell_state, 
-        maze_path, maze_width, maze_height
+    args = parser.parse_args()
+    if args.stream:
+        if args.algorithm not in (None, "eller"):
+            parser.error("--stream only supports the eller algorithm")
+        if args.count is not None or args.numpy or args.solve:
+            parser.error(
+                "--stream cannot be used with --count, --numpy or --solve"
+                )
+        if args.save or args.cache or args.load:
+            parser.error(
+                "--stream cannot be used with --save, --cache or --load"
+                )
+        for line in stream_maze(args.width[0], args.height[0], args.seed):
+            print_text(line)
+        return
+    if args.algorithm is None:
+        args.algorithm = "dfs"
+
+    if args.viewport:
+        if not args.load:
+            parser.error("--viewport requires --load")
+        from maze_format import render_viewport
+
+        try:
+            for line in render_viewport(args.load, *args.viewport):
+                print_text(line)
+        except ValueError as error:
+            parser.error(str(error))
+        return
+
+    if args.count is not None:
+        if args.solve:
+            parser.error("--solve cannot be used with --count")
+        write_batch(args)
+        return
+
+    if (args.animate or args.progress) and (args.load or args.cache):
+        parser.error(
+            "--animate and --progress cannot be used with --load or --cache"
+            )
+    if args.animate and (args.solve or args.numpy):
+        parser.error("--animate cannot be used with --solve or --numpy")
+    if args.load:
+        from maze_format import load_maze
+
+        maze = load_maze(args.load)
+    elif args.cache:
+        if args.seed is None:
+            parser.error("--cache requires --seed")
+        from maze_cache import MazeCache
+
+        cache = MazeCache(args.cache, args.cache_size * 2**20)
+        maze = cache.get_or_generate(
+            args.width[0], args.height[0], args.seed, args.algorithm
+            )
+    else:
+        maze = Maze(
+            args.width[0], args.height[0], args.seed, args.algorithm
+            )
+        if (args.animate or args.progress) and args.algorithm != "dfs":
+            parser.error(
+                "--animate and --progress only support the dfs algorithm"
+                )
+        if args.animate:
+            animate_maze(maze, args.fps, args.steps_per_frame)
+        else:
+            observer = None
+            if args.progress:
+                observer = report_progress(
+                    args.progress, print_progress, maze.width * maze.height
+                    )
+            maze.generate(observer)
+    if args.save:
+        from maze_format import save_maze
+
+        save_maze(maze, args.save)
+    if args.animate:
+        # The animation has already drawn the maze
+        return
+
+    if args.solve:
+        if args.numpy:
+            parser.error("--solve cannot be used with --numpy")
+        from maze_solver import solution_mask, solve_maze
+
+        path = solve_maze(maze)
+        print(f"ROUTE LENGTH: {len(path)} CELLS", file=sys.stderr)
+        for line in render_maze(maze, solution_mask(maze, path)):
+            print_text(line)
+        return
+
+    if args.numpy:
+        get_output().write_bytes(render_maze_numpy(maze))
+        return
+
+    # Lines are streamed as they are rendered rather than building the whole
+    # maze in a terminal first
+    for line in render_maze(maze):
+        print_text(line)
+
+
+def print_progress(visited: int, total_cells: int) -> None:
+    """
+    Prints the progress of maze generation to stderr.
+    Args:
+        visited: int- number of cells carved so far
+        total_cells: int- number of cells in the maze
+    Returns:
+        None
+    """
+    print(
+        f"{visited} OF {total_cells} CELLS ({visited / total_cells:.0%})",
+        file=sys.stderr
         )
-        
-    terminal = print_first_row(terminal, entrance_col, maze_width)
-    terminal = draw_maze(
-        terminal, maze_height, maze_width, row, col, maze_walls
+
+
+def knock_down_wall(terminal: Terminal, maze: Maze, step: MazeStep) -> None:
+    """
+    Knocks down the wall opened by a generation step in a terminal holding
+    the rendered maze.
+    Args:
+        terminal: Terminal- terminal holding the rendered maze
+        maze: Maze- the maze being generated
+        step: MazeStep- the generation step
+    Returns:
+        None
+    """
+    row, col = divmod(step.cell, maze.width)
+    if step.wall == UP:
+        terminal.write_string(row * 2, col * 3 + 1, "  ")
+    elif step.wall == DOWN:
+        terminal.write_string(row * 2 + 2, col * 3 + 1, "  ")
+    elif step.wall == LEFT:
+        terminal.add_character(row * 2 + 1, col * 3, " ")
+    elif step.wall == RIGHT:
+        terminal.add_character(row * 2 + 1, col * 3 + 3, " ")
+
+
+def animate_maze(maze: Maze, fps: float, steps_per_frame: int) -> None:
+    """
+    Animates a maze being carved, starting from a maze with every wall 
+    standing and redrawing only the walls knocked down in each frame.
+    Args:
+        maze: Maze- the maze to be generated
+        fps: float- highest frame rate of the animation
+        steps_per_frame: int- number of generation steps in each frame
+    Returns:
+        None
+    """
+    lines = list(render_maze(maze))
+    terminal = Terminal(len(lines[0]), len(lines), max_fps=fps)
+    terminal.blit(0, 0, lines)
+    terminal.present()
+    for count, step in enumerate(maze.steps(), 1):
+        knock_down_wall(terminal, maze, step)
+        if count % steps_per_frame == 0:
+            terminal.present()
+    terminal.present()
+
+
+def write_batch(args: argparse.Namespace) -> None:
+    """
+    Generates a batch of mazes across a pool of worker processes, writing
+    each maze to its own file in the output directory or as a line of JSON
+    to stdout. The output is the same for a given master seed whatever the
+    number of workers. When writing files, the master seed is printed so
+    that a batch drawn without --seed can be reproduced.
+    Args:
+        args: argparse.Namespace - the parsed command line arguments
+    Returns:
+        None
+    """
+    import json
+
+    master_seed = args.seed
+    if master_seed is None:
+        master_seed = random.randrange(2**63)
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    mazes = generate_batch(
+        args.width[0], args.height[0], args.count, master_seed,
+        args.workers, args.algorithm, args.numpy
         )
-    terminal = print_exit(terminal, maze_height,exit_col)    
+    for index, seed, text in mazes:
+        if args.out:
+            path = os.path.join(args.out, f"maze-{index:06d}.txt")
+            with open(path, "w") as maze_file:
+                maze_file.write(text)
+        else:
+            print_text(json.dumps({
+                "index": index,
+                "master_seed": master_seed,
+                "seed": seed,
+                "width": args.width[0],
+                "height": args.height[0],
+                "algorithm": args.algorithm,
+                "maze": text,
+                }))
+    if args.out:
+        # The master seed reproduces the whole batch with --seed
+        print_text(f"SEED {master_seed}")
 
-    terminal.display()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
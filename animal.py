@@ -1,226 +1,267 @@
 #!/usr/bin/env python3
 
-import sys
-from typing import List, NamedTuple
-from collections import namedtuple
+import argparse
+import math
+from typing import List, Optional
 
-from helpers import centred_text, clear_console, print_tabbed_text
+from animal_store import AnimalStore
+from animal_tree import AnimalTree
+from helpers import (
+    centred_text, clear_console, format_tabbed_text, input_text, print_text,
+    )
 
 # Animal
 # Originally developed by Arthur Luehrmann at Dartmouth College.
 # Subsequently shortened & modified by Nathan Teichholtz at DEC
 # and Steve North at Creative Computing
 
-Node = namedtuple("Node", "question, true, false")
+# Answers accepted to the yes or no questions - an empty answer ends the
+# game
+ANSWERS = ["YES", "NO", "LIST", "", " "]
 
-def display_intro() -> None:
-    """Displays the introduction text.
-    """
-    clear_console()
-    print(centred_text("ANIMAL"))
-    print(centred_text("CREATIVE COMPUTING  MORRISTOWN, NEW JERSEY"))
-    print("\n" * 3, end = "")
-    print("PLAY 'GUESS THE ANIMAL'")
-    print()
-    print("THINK OF AN ANIMAL AND THE COMPUTER WILL TRY TO GUESS IT.")
-    print()
-
-
-def get_user_input(input_question: str, input_list: List[str]) -> str:
-    """Function gets input from the user using the input_question argument 
-    as a prompt and returns the matching string from the input list 
-    provided. The function will attempt to match at least one letter in
-    the input with the item in the input list - i.e. "Y" will return "YES",
-    "YE" will return "YES" etc. If no matching string is found, the user input 
-    string is returned.
+THINKING_PROMPT = "ARE YOU THINKING OF AN ANIMAL?\n"
+NEW_ANIMAL_PROMPT = "THE ANIMAL YOU WERE THINKING OF WAS A?\n"
+
+# Animals shown by each LIST - 20 rows of 5 columns
+LIST_PAGE_SIZE = 100
+
+
+def match_option(input_text: str, input_list: List[str]) -> Optional[str]:
+    """Returns the string from the input list matching a line of input. The
+    function will attempt to match at least one letter in the input with
+    the item in the input list - i.e. "Y" will return "YES", "YE" will
+    return "YES" etc.
     Args:
-        input_question: str- string to be used as a prompt for the input 
-        question
+        input_text: str- the line of input
         input_list: List[str]- list of possible options
     Returns:
-        selected_option: str- string representing the option selected or
-        string entered if no match found
+        selected_option: str- the option matched, or None if no match found
     """
+    input_text = input_text.upper()
     input_list = [ item.upper() for item in input_list ]
-    while True:
-        input_text = input(f"{input_question}?\n").upper()
-        if input_text in input_list:
-            return input_text
-        for option in input_list:
-            for i in range(len(option)):
-                if input_text.startswith(option[0:i+1]):
-                    return option
-        # no match found in the input list - return the user input
-        if input_text:
-            return input_text
-        
-def print_animal_list(node: Node) -> None:
-    """Traverses the animal tree and prints the curent list of animals 
-    the computer knows.
+    if input_text in input_list:
+        return input_text
+    for option in input_list:
+        for i in range(len(option)):
+            if input_text.startswith(option[0:i+1]):
+                return option
+    return None
+
+
+def format_animal_list(
+        tree: AnimalTree, page: int=0, page_size: int=LIST_PAGE_SIZE
+        ) -> str:
+    """Returns the text listing a page of the animals the computer knows,
+    in alphabetical order. Only the animals on the page are formatted.
     Args:
-        node: Node - Node representing current tree of known animals
+        tree: AnimalTree - the tree of known animals
+        page: int - the page to list, from 0
+        page_size: int - the number of animals on a page
     Returns:
-        None
+        str: the list of animals
     """
-    animal_set = set()
+    text = (
+        "ANIMALS I ALREADY KNOW ARE:\n"
+        + format_tabbed_text(tree.animal_page(page * page_size, page_size))
+        )
+    pages = math.ceil(tree.animals / page_size)
+    if page + 1 < pages:
+        text += f"PAGE {page + 1} OF {pages} - LIST AGAIN FOR MORE\n"
+    elif pages > 1:
+        text += f"PAGE {pages} OF {pages}\n"
+    return text
 
-    def traverse(node):
-        if isinstance(node, Node):
-            traverse(node.true)
-            traverse(node.false)
-        else:
-            # Leaf node reached
-            animal_set.add(node)
 
-    traverse(node)
-    print("ANIMALS I ALREADY KNOW ARE:")
-    animal_list = list(animal_set)
-    print_tabbed_text(animal_list)
+class AnimalGame:
+    """Animal as a state machine that takes lines of input and returns the
+    text to show, so that a game can be driven by a console, a network
+    session or a test without blocking on input().
+    Attributes:
+    -----------
+    tree: AnimalTree
+        The tree of known animals.
+    store: AnimalStore | None
+        Where animals learned are saved, if anywhere.
+    node: int
+        The node of the tree reached by the answers so far.
+    list_page: int
+        The page shown if the next answer is LIST, which moves on to the
+        next page after each LIST in a row.
+    state: str
+        The question waiting for an answer - "thinking", "question" while
+        walking the tree, "guess" at a leaf, "new_animal", "new_question"
+        and "new_answer" while learning a new animal, or "over" once the
+        game has finished.
+    Methods:
+    --------
+    start() -> str:
+        Returns the introduction, ending with the first question.
+    send(line: str) -> str:
+        Answers the current question and returns the text up to the next
+        question.
+    """
+    def __init__(
+            self, tree: Optional[AnimalTree]=None,
+            store: Optional[AnimalStore]=None
+            ) -> None:
+        self.tree = tree if tree is not None else AnimalTree()
+        self.store = store
+        self.state = "thinking"
+        self.node = AnimalTree.ROOT
+        self.list_page = 0
+        self.path: List[str] = []
+        self.new_animal = ""
+        self.new_question = ""
 
+    @property
+    def finished(self) -> bool:
+        return self.state == "over"
 
-def thinking_of_animal_question(node: Node) -> bool:
-    """ Asks if the user is thinking of an animal and handles the 
-    response.
-    Args:
-        node: Node- current tree of known animals so that 
-        print_animal_list can be called 
-    Returns: 
-        True-  if the user has answered affirmatively
-        False- if the user has answered negatively
-    """
-    while True:
-        thinking_of_animal = get_user_input(
-            "ARE YOU THINKING OF AN ANIMAL", 
-            ["YES", "NO", "LIST", "", " "],
+    def start(self) -> str:
+        """Returns the introduction and the first question."""
+        return (
+            centred_text("ANIMAL") + "\n"
+            + centred_text("CREATIVE COMPUTING  MORRISTOWN, NEW JERSEY")
+            + "\n" + "\n" * 3
+            + "PLAY 'GUESS THE ANIMAL'\n"
+            + "\n"
+            + "THINK OF AN ANIMAL AND THE COMPUTER WILL TRY TO GUESS IT.\n"
+            + "\n"
+            + THINKING_PROMPT
             )
-        match thinking_of_animal:
-            case "LIST":
-                print_animal_list(node)
-            case "YES":
-                return True
-            case "NO" | "" | " ":
-                return False
-
-def guess_animal(node: Node) -> tuple[bool, List[str]] | None:
-    """
-    Traverses the animal tree starting at the parent node & guesses animals 
-    until a leaf is reached. Returns whether the last guess was correct and 
-    the path to insert a new node if needed.
-    Args:
-        node: Node - the root node of the animal tree
-    Returns:
-        tuple[bool, list[str]]: A tuple containing:
-            - A boolean indicating if the last guess was correct
-            - A list representing the path to insert a new node if the guess 
-            was incorrect
-    """
-    current_node = node
-    path = []
 
-    while isinstance(current_node, Node):
-        animal_guess = get_user_input(
-            current_node.question,
-            ["YES", "NO", "LIST", "", " "],
-            )
-        match animal_guess:
-            case "LIST":
-                print_animal_list(node)
-            case "YES":
-                path.append("true")
-                current_node = current_node.true
-            case "NO":
-                path.append("false")
-                current_node = current_node.false
-            case "" | " ":
-                print("GAME OVER")
-                sys.exit()    
-    
-    # Current_node is now a leaf
-    animal_guess = get_user_input(
-        f"IS IT A {current_node}",
-        ["YES", "NO", "LIST", "", " "],
-        )
-    match animal_guess:
-        case "LIST":
-            print_animal_list(node)
-        case "YES":
-            return True, path
-        case "NO":
-            return False, path
-        case "" | " ":
-            print("GAME OVER")
-            sys.exit()
-    return None
+    def prompt(self) -> str:
+        """Returns the current question."""
+        match self.state:
+            case "thinking":
+                return THINKING_PROMPT
+            case "question":
+                return f"{self.tree.text[self.node]}?\n"
+            case "guess":
+                return f"IS IT A {self.tree.text[self.node]}?\n"
+            case "new_animal":
+                return NEW_ANIMAL_PROMPT
+            case "new_question":
+                return (
+                    "PLEASE TYPE IN A QUESTION TO DISTINGUISH A "
+                    f"{self.new_animal} FROM A {self.tree.text[self.node]}?\n"
+                    )
+            case "new_answer":
+                return f"FOR A {self.new_animal} THE ANSWER WOULD BE?\n"
+        return ""
 
+    def send(self, line: str) -> str:
+        """Answers the current question and returns the text up to and
+        including the next question. Answers that are not recognised ask
+        the question again.
+        """
+        line = line.upper()
+        output = []
+        page, self.list_page = self.list_page, 0
+        match self.state:
+            case "thinking":
+                match match_option(line, ANSWERS):
+                    case "LIST":
+                        output.append(self._list_animals(page))
+                    case "YES":
+                        self._walk_to(AnimalTree.ROOT)
+                    case "NO" | "" | " ":
+                        output.append("GAME OVER\n")
+                        self.state = "over"
+            case "question" | "guess":
+                match match_option(line, ANSWERS):
+                    case "LIST":
+                        output.append(self._list_animals(page))
+                    case "YES" if self.state == "guess":
+                        output.append("WHY NOT TRY ANOTHER ANIMAL?\n")
+                        self.state = "thinking"
+                    case "NO" if self.state == "guess":
+                        self.state = "new_animal"
+                    case "YES":
+                        self.path.append("true")
+                        self._walk_to(self.tree.child(self.node, True))
+                    case "NO":
+                        self.path.append("false")
+                        self._walk_to(self.tree.child(self.node, False))
+                    case "" | " ":
+                        output.append("GAME OVER\n")
+                        self.state = "over"
+            case "new_animal":
+                if line in self.tree:
+                    output.append(
+                        f"I ALREADY KNOW A {line}. "
+                        "WHY NOT TRY ANOTHER ANIMAL?\n"
+                        )
+                    self.state = "thinking"
+                elif line:
+                    self.new_animal = line
+                    self.state = "new_question"
+            case "new_question":
+                if line:
+                    self.new_question = line
+                    self.state = "new_answer"
+            case "new_answer":
+                if line:
+                    answer = match_option(line, ["YES", "NO"]) or line
+                    self.tree.insert(
+                        self.node, self.new_animal, self.new_question, answer
+                        )
+                    if self.store is not None:
+                        self.store.add(
+                            self.tree, self.path, self.new_animal,
+                            self.new_question, answer
+                            )
+                    self.state = "thinking"
+        output.append(self.prompt())
+        return "".join(output)
+
+    def _list_animals(self, page: int) -> str:
+        """Returns a page of the animals known, and moves on to the next
+        page, going back to the first after the last."""
+        pages = math.ceil(self.tree.animals / LIST_PAGE_SIZE)
+        self.list_page = (page + 1) % pages
+        return format_animal_list(self.tree, page)
+
+    def _walk_to(self, node: int) -> None:
+        """Moves to a node of the tree, asking its question or guessing
+        the animal at a leaf."""
+        if node == AnimalTree.ROOT:
+            self.path = []
+        self.node = node
+        self.state = "guess" if self.tree.is_animal(node) else "question"
 
-def add_new_animal(node: Node, path: list[str]) -> Node:
-    """
-    Add a new animal and its differentiating question to the tree.
-    Args:
-        node (Node): The root node of the tree
-        path (list[str]): Path to the node that was guessed incorrectly
-    Returns:
-        Node: The updated tree with the new animal node inserted
-    """
-    def recursive_update(current_node: Node, path: list[str]) -> Node:
-        if not path:  # Base case: replace the current node
-            new_animal = get_user_input(
-                "THE ANIMAL YOU WERE THINKING OF WAS A",
-                [],
-                )
-            new_question = get_user_input(
-                f"PLEASE TYPE IN A QUESTION TO DISTINGUISH A {new_animal} "
-                f"FROM A {current_node}",
-                [],
-            )
-            new_answer = get_user_input(
-                f"FOR A {new_animal} THE ANSWER WOULD BE", 
-                ["YES", "NO"],
-            )
-            # Create the new node
-            if new_answer == "YES":
-                return Node(new_question, new_animal, current_node)
-            else:
-                return Node(new_question, current_node, new_animal)
-
-        # Recursive case: traverse the tree
-        step = path[0]
-        if step == "true":
-            return Node(
-                current_node.question,
-                recursive_update(current_node.true, path[1:]),
-                current_node.false
-            )
-        else:
-            return Node(
-                current_node.question,
-                current_node.true,
-                recursive_update(current_node.false, path[1:])
-            )
-    # Start the recursive update and return the updated tree
-    return recursive_update(node, path)
 
-def main():
+def main() -> None:
     """Main game loop
     """
-    animal_tree = Node("DOES IT SWIM", "FISH", "BIRD")
-
-    display_intro()
-
-    while True:
-        match thinking_of_animal_question(animal_tree):
-            case True:
-                guess_correct, path = guess_animal(animal_tree)
-                if guess_correct:
-                    print("WHY NOT TRY ANOTHER ANIMAL?")
-                    continue
-                if not guess_correct:
-                    animal_tree = add_new_animal(animal_tree, path)
-                    continue
-            case False:
-                print("GAME OVER")
-                break
+    parser = argparse.ArgumentParser(
+        prog="Animal",
+        description="The computer guesses the animal you are thinking of",
+        )
+    parser.add_argument(
+        "--store", metavar="DIRECTORY",
+        help="keep the animals learned in this directory between games",
+        )
+    args = parser.parse_args()
+
+    store = None
+    tree = None
+    if args.store:
+        store = AnimalStore(args.store)
+        try:
+            tree = store.load()
+        except (OSError, ValueError) as error:
+            parser.error(f"cannot load {args.store}: {error}")
+    game = AnimalGame(tree, store)
+    clear_console()
+    print_text(game.start(), end = "")
+    try:
+        while not game.finished:
+            print_text(game.send(input_text()), end = "")
+    finally:
+        if store is not None:
+            store.close()
 
         
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
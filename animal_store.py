@@ -0,0 +1,307 @@
+import os
+import tempfile
+import zlib
+from typing import List, Optional, Tuple
+
+from animal_tree import AnimalTree
+
+# Keeps the animals learned by animal.py on disk. The tree is saved as a
+# snapshot, listing the nodes in preorder - a question is followed by its
+# YES subtree and then its NO subtree - and each animal learned since the
+# snapshot is appended to a journal as one line, flushed to disk with
+# fsync before the game carries on. Loading reads the snapshot and replays
+# the journal. Once the journal holds compact_every animals, the tree is
+# written to a new snapshot and the journal is started again.
+#
+# The snapshot and the journal both carry a generation number, which
+# compaction increases. A journal from an earlier generation than the
+# snapshot has already been compacted into it, so a crash part way through
+# compaction never replays an animal twice. Each journal line has a CRC,
+# and a line left incomplete by a crash is dropped when the journal is
+# next loaded. Only one process should use a directory at a time.
+#
+#   from animal_store import AnimalStore
+#   store = AnimalStore("animals")
+#   tree = store.load()
+#   store.add(tree, path, new_animal, new_question, new_answer)
+
+SNAPSHOT_NAME = "animals.snapshot"
+JOURNAL_NAME = "animals.journal"
+SNAPSHOT_MAGIC = "ANIMALS 1"
+JOURNAL_MAGIC = "JOURNAL 1"
+
+JournalEntry = Tuple[List[str], str, str, str]
+
+
+def _escape(text: str) -> str:
+    """Escapes text so that it holds no tabs or line breaks."""
+    return text.encode("unicode_escape").decode("ascii")
+
+
+def _unescape(text: str) -> str:
+    """Reverses _escape."""
+    return text.encode("ascii").decode("unicode_escape")
+
+
+def encode_tree(tree: AnimalTree) -> List[str]:
+    """Returns the preorder lines of a tree, with the text escaped."""
+    return [line[:1] + _escape(line[1:]) for line in tree.preorder()]
+
+
+def decode_tree(lines: List[str]) -> AnimalTree:
+    """Rebuilds a tree from the lines of encode_tree."""
+    return AnimalTree.from_preorder(
+        [line[:1] + _unescape(line[1:]) for line in lines]
+        )
+
+
+def encode_entry(
+        path: List[str], new_animal: str, new_question: str, new_answer: str
+        ) -> str:
+    '''
+    Encodes an animal learned as a journal line, starting with the CRC of
+    the rest of the line.
+    Args:
+        path: List[str] - "true" and "false" steps to the animal guessed
+        new_animal: str - the animal learned
+        new_question: str - question distinguishing it from the guess
+        new_answer: str - the answer to the question for the new animal
+    Returns:
+        str - the line, with its line ending
+    '''
+    body = "\t".join((
+        "".join("Y" if step == "true" else "N" for step in path),
+        "Y" if new_answer == "YES" else "N",
+        _escape(new_question),
+        _escape(new_animal),
+        ))
+    return f"{zlib.crc32(body.encode()):08x}\t{body}\n"
+
+
+def decode_entry(line: str) -> Optional[JournalEntry]:
+    '''
+    Decodes a journal line.
+    Args:
+        line: str - the line, with its line ending
+    Returns:
+        JournalEntry | None - the path, animal, question and answer, or
+        None if the line is incomplete or corrupt
+    '''
+    if not line.endswith("\n"):
+        return None
+    crc, _, body = line[:-1].partition("\t")
+    try:
+        if int(crc, 16) != zlib.crc32(body.encode()):
+            return None
+    except ValueError:
+        return None
+    fields = body.split("\t")
+    if len(fields) != 4:
+        return None
+    steps, answer, question, animal = fields
+    path = ["true" if step == "Y" else "false" for step in steps]
+    return (
+        path, _unescape(animal), _unescape(question),
+        "YES" if answer == "Y" else "NO",
+        )
+
+
+def _fsync_directory(directory: str) -> None:
+    """Flushes a directory to disk, so that files renamed into it
+    persist. Directories cannot be opened for this on Windows."""
+    if os.name == "nt":
+        return
+    handle = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(handle)
+    finally:
+        os.close(handle)
+
+
+class AnimalStore:
+    """A tree of animals kept on disk as a snapshot and a journal.
+    Attributes:
+    -----------
+    directory: str
+        The directory holding the snapshot and the journal.
+    compact_every: int
+        The number of animals journalled before the tree is compacted into
+        a new snapshot.
+    generation: int
+        The generation of the snapshot, increased by each compaction.
+    entries: int
+        The number of animals in the journal.
+    Methods:
+    --------
+    load() -> AnimalTree:
+        Reads the snapshot, replays the journal and returns the tree.
+    append(path, new_animal, new_question, new_answer):
+        Adds an animal learned to the journal.
+    compact(tree: AnimalTree):
+        Writes the tree to a new snapshot and starts a new journal.
+    add(tree, path, new_animal, new_question, new_answer):
+        Appends an animal learned, compacting when the journal is full.
+    close():
+        Closes the journal.
+    """
+    def __init__(self, directory: str, compact_every: int=1000) -> None:
+        """
+        Initializes a store in the given directory, creating it if needed.
+        """
+        self.directory = directory
+        self.compact_every = compact_every
+        self.generation = 0
+        self.entries = 0
+        self._journal: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, SNAPSHOT_NAME)
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.directory, JOURNAL_NAME)
+
+    def load(self) -> AnimalTree:
+        '''
+        Reads the snapshot and replays the journal on top of it. Without a
+        snapshot the tree starts as a new AnimalTree.
+        Returns:
+            AnimalTree - the tree
+        Raises:
+            ValueError: If the snapshot is not a snapshot of animals.
+        '''
+        self.close()
+        tree = AnimalTree()
+        self.generation = 0
+        try:
+            with open(self.snapshot_path, encoding="ascii") as snapshot:
+                lines = snapshot.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+        if lines:
+            magic, _, generation = lines[0].rpartition(" ")
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{self.snapshot_path} is not a snapshot")
+            self.generation = int(generation)
+            tree = decode_tree(lines[1:])
+
+        self.entries = 0
+        valid_bytes = 0
+        try:
+            with open(self.journal_path, "rb") as journal:
+                data = journal.read()
+        except FileNotFoundError:
+            data = b""
+        header = f"{JOURNAL_MAGIC} {self.generation}\n".encode()
+        if data.startswith(header):
+            # An older journal has been compacted into the snapshot, so it
+            # is only replayed when its generation matches
+            valid_bytes = len(header)
+            for raw_line in data[valid_bytes:].splitlines(keepends=True):
+                entry = decode_entry(raw_line.decode("ascii", "replace"))
+                if entry is None:
+                    break
+                path, new_animal, new_question, new_answer = entry
+                tree.insert(
+                    tree.walk(path), new_animal, new_question, new_answer
+                    )
+                valid_bytes += len(raw_line)
+                self.entries += 1
+
+        if valid_bytes == 0:
+            self._replace(self.journal_path, [header.decode()])
+        elif valid_bytes < len(data):
+            # Drop a line left incomplete or corrupt by a crash, so that
+            # new lines follow the last complete one
+            with open(self.journal_path, "r+b") as journal:
+                journal.truncate(valid_bytes)
+                os.fsync(journal.fileno())
+        self._journal = os.open(
+            self.journal_path, os.O_WRONLY | os.O_APPEND
+            )
+        return tree
+
+    def append(
+            self, path: List[str], new_animal: str, new_question: str,
+            new_answer: str
+            ) -> None:
+        '''
+        Adds an animal learned to the journal with a single write, and
+        waits for it to reach the disk.
+        Args:
+            path: List[str] - "true" and "false" steps to the animal guessed
+            new_animal: str - the animal learned
+            new_question: str - question distinguishing it from the guess
+            new_answer: str - the answer to the question for the new animal
+        Raises:
+            ValueError: If the store has not been loaded.
+        '''
+        if self._journal is None:
+            raise ValueError("the store must be loaded before appending")
+        line = encode_entry(path, new_animal, new_question, new_answer)
+        os.write(self._journal, line.encode("ascii"))
+        os.fsync(self._journal)
+        self.entries += 1
+
+    def compact(self, tree: AnimalTree) -> None:
+        '''
+        Writes the tree to a snapshot of the next generation and starts an
+        empty journal for it.
+        Args:
+            tree: AnimalTree - the tree, including every animal in the
+            journal
+        '''
+        generation = self.generation + 1
+        self._replace(
+            self.snapshot_path,
+            [f"{SNAPSHOT_MAGIC} {generation}\n"]
+            + [line + "\n" for line in encode_tree(tree)],
+            )
+        # A crash here leaves the old journal, which is now skipped as its
+        # generation is older than the snapshot's
+        self.close()
+        self._replace(self.journal_path, [f"{JOURNAL_MAGIC} {generation}\n"])
+        self.generation = generation
+        self.entries = 0
+        self._journal = os.open(
+            self.journal_path, os.O_WRONLY | os.O_APPEND
+            )
+
+    def add(
+            self, tree: AnimalTree, path: List[str], new_animal: str,
+            new_question: str, new_answer: str
+            ) -> None:
+        '''
+        Appends an animal already inserted into the tree, then compacts
+        the tree into a new snapshot if the journal is full.
+        Args:
+            tree: AnimalTree - the tree, with the animal inserted
+            path: List[str] - "true" and "false" steps to the animal guessed
+            new_animal: str - the animal learned
+            new_question: str - question distinguishing it from the guess
+            new_answer: str - the answer to the question for the new animal
+        '''
+        self.append(path, new_animal, new_question, new_answer)
+        if self.entries >= self.compact_every:
+            self.compact(tree)
+
+    def close(self) -> None:
+        """Closes the journal."""
+        if self._journal is not None:
+            os.close(self._journal)
+            self._journal = None
+
+    def _replace(self, path: str, lines: List[str]) -> None:
+        """Writes a file in full by writing a temporary file, flushing it
+        to disk and renaming it over the old file."""
+        handle, temporary_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+            )
+        with os.fdopen(handle, "w", encoding="ascii") as new_file:
+            new_file.writelines(lines)
+            new_file.flush()
+            os.fsync(new_file.fileno())
+        os.replace(temporary_path, path)
+        _fsync_directory(self.directory)
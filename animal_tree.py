@@ -0,0 +1,253 @@
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+# The tree of animals known to animal.py. Nodes are numbered from 0, the
+# root, and held in parallel arrays - the text of each node, which is the
+# question for a question node and the name for an animal, and the nodes
+# reached by answering YES and NO, which are NO_CHILD for an animal. A new
+# animal turns the animal guessed into a question in place, so learning an
+# animal adds two nodes without copying or walking the tree, and every
+# walk over the tree is a loop, however deep the tree grows. An index from
+# each animal's name to its node answers whether an animal is known without
+# a walk, and keeps the names sorted for listing - new names are appended
+# unsorted and merged in when the names are next listed, which a sort
+# does in time linear in the number of animals as the names before them
+# are already in order.
+
+# Child of an animal, which has no question to answer
+NO_CHILD = -1
+
+# The tree a new game starts from
+DEFAULT_QUESTION = "DOES IT SWIM"
+DEFAULT_YES_ANIMAL = "FISH"
+DEFAULT_NO_ANIMAL = "BIRD"
+
+# Tags starting the preorder line of each node
+QUESTION_TAG = "?"
+ANIMAL_TAG = "="
+
+
+class AnimalTree:
+    """A binary tree of questions with animals at its leaves, backed by
+    arrays, supporting O(1) insertion of a new animal at a leaf.
+    Attributes:
+    -----------
+    text: List[str]
+        The question of each question node, or the name of each animal.
+    yes: array of int
+        The node reached by answering YES to each question, or NO_CHILD
+        for an animal.
+    no: array of int
+        The node reached by answering NO to each question, or NO_CHILD for
+        an animal.
+    leaves: Dict[str, int]
+        The node of each animal, by name.
+    Methods:
+    --------
+    animals -> int:
+        The number of distinct animals in the tree.
+    is_animal(node: int) -> bool:
+        Returns whether a node is an animal rather than a question.
+    child(node: int, answer: bool) -> int:
+        Returns the node reached by answering a question.
+    walk(path: List[str]) -> int:
+        Returns the node reached by following a path from the root.
+    insert(node, new_animal, new_question, new_answer) -> int:
+        Turns an animal into a question telling it apart from a new animal.
+    animal_names() -> List[str]:
+        Returns the name of every animal in the tree, sorted.
+    animal_page(start: int, count: int) -> List[str]:
+        Returns some of the sorted names of the animals.
+    preorder() -> Iterator[str]:
+        Yields a line for each node, in preorder.
+    from_preorder(lines) -> AnimalTree:
+        Builds a tree from the lines of preorder().
+    """
+    __slots__ = ("text", "yes", "no", "leaves", "_sorted", "_unsorted")
+
+    ROOT = 0
+
+    def __init__(
+            self, question: str=DEFAULT_QUESTION,
+            yes_animal: str=DEFAULT_YES_ANIMAL,
+            no_animal: str=DEFAULT_NO_ANIMAL
+            ) -> None:
+        """
+        Initializes a tree of one question telling apart two animals.
+        """
+        self.text = [question, yes_animal, no_animal]
+        self.yes = array("i", [1, NO_CHILD, NO_CHILD])
+        self.no = array("i", [2, NO_CHILD, NO_CHILD])
+        self.leaves = {no_animal: 2, yes_animal: 1}
+        self._sorted = sorted(self.leaves)
+        self._unsorted: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __contains__(self, animal: str) -> bool:
+        return animal in self.leaves
+
+    @property
+    def animals(self) -> int:
+        return len(self.leaves)
+
+    def __eq__(self, other: object) -> bool:
+        # Trees built in a different order number their nodes differently,
+        # so they are compared by shape and text
+        if not isinstance(other, AnimalTree):
+            return NotImplemented
+        return (
+            len(self) == len(other)
+            and list(self.preorder()) == list(other.preorder())
+            )
+
+    def is_animal(self, node: int) -> bool:
+        return self.yes[node] == NO_CHILD
+
+    def child(self, node: int, answer: bool) -> int:
+        return self.yes[node] if answer else self.no[node]
+
+    def walk(self, path: List[str]) -> int:
+        '''
+        Follows a path of answers from the root.
+        Args:
+            path: List[str] - "true" and "false" steps
+        Returns:
+            int - the node reached
+        Raises:
+            ValueError: If the path goes past an animal.
+        '''
+        node = self.ROOT
+        for step in path:
+            if self.is_animal(node):
+                raise ValueError(f"path {path!r} goes past an animal")
+            node = self.child(node, step == "true")
+        return node
+
+    def insert(
+            self, node: int, new_animal: str, new_question: str,
+            new_answer: str
+            ) -> int:
+        '''
+        Replaces an animal guessed wrongly with a question, leading to the
+        new animal for the given answer and to the animal guessed for the
+        other. The animal guessed moves to a new node, so the node of the
+        question is the node of the animal it replaces. The game checks
+        that the new animal is not already known, as a name in the tree
+        twice stays indexed at its first node.
+        Args:
+            node: int - the animal guessed
+            new_animal: str - the animal the player was thinking of
+            new_question: str - question telling the new animal apart from
+            the one guessed
+            new_answer: str - the answer to the question for the new animal
+        Returns:
+            int - the node of the new animal
+        Raises:
+            ValueError: If the node is not an animal.
+        '''
+        if not self.is_animal(node):
+            raise ValueError(f"node {node} is a question, not an animal")
+        guessed = len(self.text)
+        added = guessed + 1
+        self.text.append(self.text[node])
+        self.text.append(new_animal)
+        self.yes.extend((NO_CHILD, NO_CHILD))
+        self.no.extend((NO_CHILD, NO_CHILD))
+        self.text[node] = new_question
+        guessed_name = self.text[guessed]
+        if self.leaves.get(guessed_name) == node:
+            self.leaves[guessed_name] = guessed
+        if new_animal not in self.leaves:
+            self.leaves[new_animal] = added
+            self._unsorted.append(new_animal)
+        if new_answer == "YES":
+            self.yes[node], self.no[node] = added, guessed
+        else:
+            self.yes[node], self.no[node] = guessed, added
+        return added
+
+    def animal_names(self) -> List[str]:
+        """Returns the distinct names of the animals in the tree, sorted."""
+        return self.animal_page(0, self.animals)
+
+    def animal_page(self, start: int, count: int) -> List[str]:
+        '''
+        Returns a page of the sorted names of the animals in the tree.
+        Args:
+            start: int - position of the first name in the sorted names
+            count: int - the most names to return
+        Returns:
+            List[str] - the names
+        '''
+        if self._unsorted:
+            self._sorted.extend(self._unsorted)
+            self._sorted.sort()
+            self._unsorted.clear()
+        return self._sorted[start:start + count]
+
+    def preorder(self) -> Iterator[str]:
+        '''
+        Yields a line for each node, with each question followed by the
+        nodes reached by answering YES and then by answering NO.
+        Returns:
+            Iterator[str] - the text of each node, tagged as a question or
+            an animal
+        '''
+        stack = [self.ROOT]
+        while stack:
+            node = stack.pop()
+            if self.is_animal(node):
+                yield ANIMAL_TAG + self.text[node]
+            else:
+                yield QUESTION_TAG + self.text[node]
+                stack.append(self.no[node])
+                stack.append(self.yes[node])
+
+    @classmethod
+    def from_preorder(cls, lines: List[str]) -> "AnimalTree":
+        '''
+        Builds a tree from the lines yielded by preorder, without
+        recursion. Nodes are numbered in the order of the lines, and each
+        line is linked to the last question still waiting for a child.
+        Args:
+            lines: List[str] - the lines, without line endings
+        Returns:
+            AnimalTree - the tree
+        Raises:
+            ValueError: If the lines do not describe a single tree.
+        '''
+        tree = cls.__new__(cls)
+        tree.text = []
+        tree.yes = array("i", [NO_CHILD]) * len(lines)
+        tree.no = array("i", [NO_CHILD]) * len(lines)
+        tree.leaves = {}
+        tree._unsorted = []
+        # Questions still waiting for a child, with the answer awaited
+        pending: List[Tuple[int, bool]] = []
+        for node, line in enumerate(lines):
+            tag = line[:1]
+            if tag not in (QUESTION_TAG, ANIMAL_TAG):
+                raise ValueError(f"invalid tree line {line!r}")
+            if node > 0:
+                if not pending:
+                    raise ValueError("lines describe more than one tree")
+                parent, answer = pending.pop()
+                if answer:
+                    tree.yes[parent] = node
+                    pending.append((parent, False))
+                else:
+                    tree.no[parent] = node
+            tree.text.append(line[1:])
+            if tag == QUESTION_TAG:
+                pending.append((node, True))
+            else:
+                tree.leaves.setdefault(line[1:], node)
+        if pending or not lines:
+            raise ValueError("lines end part way through the tree")
+        if len(lines) == 1:
+            raise ValueError("tree must start with a question")
+        tree._sorted = sorted(tree.leaves)
+        return tree
+
@@ -0,0 +1,2 @@
+# Benchmarks for the games - run from the repository root with e.g.
+# python -m benchmarks.maze_memory
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from typing import List, Tuple
+
+from animal_store import AnimalStore
+from animal_tree import AnimalTree
+
+# Measures the cost of saving the animals learned by animal.py. Learns a
+# number of random animals, appending each one to the journal, and compares
+# the time of an append with the time of rewriting the whole tree as a
+# snapshot, which a store without a journal would do for every animal.
+# Then times loading the tree from the journal alone and from a compacted
+# snapshot.
+
+# usage: python -m benchmarks.animal_store [--animals 2000] [--seed 1]
+
+Learned = Tuple[List[str], str, str, str]
+
+
+def learn(
+        tree: AnimalTree, number: int, rng: random.Random
+        ) -> List[Learned]:
+    '''
+    Learns animals by walking the tree with random answers and inserting
+    a new animal at the leaf reached.
+    Args:
+        tree: AnimalTree - the tree, changed in place
+        number: int - number of animals to learn
+        rng: random.Random - source of the answers
+    Returns:
+        List[tuple] - the path, animal, question and answer of each animal
+    '''
+    learned = []
+    for i in range(number):
+        node, path = AnimalTree.ROOT, []
+        while not tree.is_animal(node):
+            answer = rng.random() < 0.5
+            path.append("true" if answer else "false")
+            node = tree.child(node, answer)
+        answer = rng.choice(("YES", "NO"))
+        animal, question = f"ANIMAL {i}", f"QUESTION {i}"
+        tree.insert(node, animal, question, answer)
+        learned.append((path, animal, question, answer))
+    return learned
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Times journal appends, snapshots and loading"
+        )
+    parser.add_argument("--animals", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    tree = AnimalTree()
+    learned = learn(tree, args.animals, random.Random(args.seed))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = AnimalStore(directory, compact_every=args.animals + 1)
+        store.load()
+        appends = []
+        for entry in learned:
+            start = time.perf_counter()
+            store.add(tree, *entry)
+            appends.append(time.perf_counter() - start)
+        store.close()
+
+        start = time.perf_counter()
+        replayed = AnimalStore(directory).load()
+        replay_time = time.perf_counter() - start
+        assert replayed == tree
+
+        rewrites = []
+        for _ in range(min(args.animals, 20)):
+            start = time.perf_counter()
+            store.compact(tree)
+            rewrites.append(time.perf_counter() - start)
+        store.close()
+
+        start = time.perf_counter()
+        loaded = AnimalStore(directory).load()
+        load_time = time.perf_counter() - start
+        assert loaded == tree
+
+    results = [
+        ("JOURNAL APPEND", statistics.median(appends)),
+        ("JOURNAL APPEND (MAX)", max(appends)),
+        ("SNAPSHOT REWRITE", statistics.median(rewrites)),
+        ("LOAD BY REPLAY", replay_time),
+        ("LOAD FROM SNAPSHOT", load_time),
+        ]
+    print(f"ANIMALS LEARNED: {args.animals:,}")
+    print(f"{'OPERATION' : <24}{'MILLISECONDS' : >14}")
+    for operation, seconds in results:
+        print(f"{operation : <24}{1000 * seconds : >14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import sys
+import time
+from collections import namedtuple
+from typing import List, Tuple
+
+from animal import format_animal_list
+from animal_tree import AnimalTree
+from helpers import format_tabbed_text
+
+# Compares learning animals in the array-backed AnimalTree with the tree
+# of namedtuples animal.py used before, which copied every node on the
+# path to the animal guessed with a recursive function. Learns random
+# animals in a bushy tree, then grows a chain of questions, each
+# distinguishing a new animal from the last one learned, deeper than
+# Python's recursion limit. LIST is timed as a page of the sorted names
+# from the tree's index, against formatting every name found by a walk.
+
+# usage: python -m benchmarks.animal_tree [--animals 1000000]
+#   [--legacy-animals 10000] [--depth 100000] [--seed 1]
+
+Node = namedtuple("Node", "question, true, false")
+
+
+def legacy_insert(
+        node: Node | str, path: List[str], new_animal: str,
+        new_question: str, new_answer: str
+        ) -> Node:
+    """Inserts an animal as animal.py did before AnimalTree, copying the
+    nodes on the path."""
+    if not path:
+        if new_answer == "YES":
+            return Node(new_question, new_animal, node)
+        return Node(new_question, node, new_animal)
+    if path[0] == "true":
+        return Node(
+            node.question,
+            legacy_insert(
+                node.true, path[1:], new_animal, new_question, new_answer
+                ),
+            node.false,
+            )
+    return Node(
+        node.question, node.true,
+        legacy_insert(
+            node.false, path[1:], new_animal, new_question, new_answer
+            ),
+        )
+
+
+def legacy_names(node: Node | str) -> List[str]:
+    """Lists the animals as animal.py did before AnimalTree."""
+    animal_set = set()
+
+    def traverse(node):
+        if isinstance(node, Node):
+            traverse(node.true)
+            traverse(node.false)
+        else:
+            animal_set.add(node)
+
+    traverse(node)
+    return list(animal_set)
+
+
+def learn_tree(
+        number: int, rng: random.Random
+        ) -> Tuple[AnimalTree, float]:
+    '''
+    Learns animals in an AnimalTree, each at the leaf reached by random
+    answers.
+    Returns:
+        tuple - the tree, and the seconds taken by the insertions alone
+    '''
+    tree = AnimalTree()
+    elapsed = 0.0
+    for i in range(number):
+        node = AnimalTree.ROOT
+        while not tree.is_animal(node):
+            node = tree.child(node, rng.random() < 0.5)
+        start = time.perf_counter()
+        tree.insert(node, f"ANIMAL {i}", f"QUESTION {i}", "YES")
+        elapsed += time.perf_counter() - start
+    return tree, elapsed
+
+
+def learn_legacy(number: int, rng: random.Random) -> Tuple[Node, float]:
+    '''
+    Learns animals in a tree of namedtuples, each at the leaf reached by
+    random answers.
+    Returns:
+        tuple - the tree, and the seconds taken by the insertions alone
+    '''
+    tree = Node("DOES IT SWIM", "FISH", "BIRD")
+    elapsed = 0.0
+    for i in range(number):
+        node, path = tree, []
+        while isinstance(node, Node):
+            answer = rng.random() < 0.5
+            path.append("true" if answer else "false")
+            node = node.true if answer else node.false
+        start = time.perf_counter()
+        tree = legacy_insert(
+            tree, path, f"ANIMAL {i}", f"QUESTION {i}", "YES"
+            )
+        elapsed += time.perf_counter() - start
+    return tree, elapsed
+
+
+def tree_size(tree: AnimalTree) -> int:
+    """Returns the bytes held by a tree's arrays and text."""
+    return (
+        sys.getsizeof(tree.yes) + sys.getsizeof(tree.no)
+        + sys.getsizeof(tree.text)
+        + sum(sys.getsizeof(text) for text in tree.text)
+        )
+
+
+def timed(function, *args) -> str:
+    """Returns the seconds taken by a call, or the error it raised."""
+    start = time.perf_counter()
+    try:
+        function(*args)
+    except RecursionError:
+        return "RECURSION ERROR"
+    return f"{time.perf_counter() - start:.3f}"
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Compares AnimalTree with a tree of namedtuples"
+        )
+    parser.add_argument("--animals", type=int, default=1_000_000)
+    parser.add_argument("--legacy-animals", type=int, default=10_000)
+    parser.add_argument("--depth", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    tree, elapsed = learn_tree(args.animals, random.Random(args.seed))
+    results = [
+        ("INSERT MICROSECONDS", f"{1e6 * elapsed / args.animals:.2f}"),
+        ("TREE MEGABYTES", f"{tree_size(tree) / 2**20:.1f}"),
+        ("PREORDER SECONDS", timed(list, tree.preorder())),
+        ("FIRST LIST SECONDS", timed(format_animal_list, tree)),
+        ]
+    tree.insert(tree.leaves["ANIMAL 0"], "LAST", "LAST?", "YES")
+    results.append(("NEXT LIST SECONDS", timed(format_animal_list, tree)))
+    results.append(("SAME LIST SECONDS", timed(format_animal_list, tree)))
+    names = [f"ANIMAL {i}" for i in range(args.animals)]
+    start = time.perf_counter()
+    for name in names:
+        name in tree
+    microseconds = 1e6 * (time.perf_counter() - start) / args.animals
+    results.append(("KNOWN MICROSECONDS", f"{microseconds:.2f}"))
+    print(f"ANIMALS LEARNED: {args.animals:,}")
+    for operation, value in results:
+        print(f"{operation : <24}{value : >12}")
+    del tree
+
+    number = args.legacy_animals
+    tree, elapsed = learn_tree(number, random.Random(args.seed))
+    legacy, legacy_elapsed = learn_legacy(number, random.Random(args.seed))
+    tree.insert(tree.leaves["ANIMAL 0"], "LAST", "LAST?", "YES")
+    results = [
+        ("AnimalTree", elapsed, timed(format_animal_list, tree)),
+        ("namedtuple", legacy_elapsed, timed(
+            lambda: format_tabbed_text(legacy_names(legacy))
+            )),
+        ]
+    print()
+    print(f"ANIMALS LEARNED: {number:,}")
+    print(
+        f"{'TREE' : <24}{'INSERT MICROSECONDS' : >20}{'LIST SECONDS' : >20}"
+        )
+    for name, seconds, list_seconds in results:
+        print(
+            f"{name : <24}{1e6 * seconds / number : >20.2f}"
+            f"{list_seconds : >20}"
+            )
+
+    chain = AnimalTree()
+    node = chain.child(AnimalTree.ROOT, True)
+    start = time.perf_counter()
+    for i in range(args.depth):
+        node = chain.insert(node, f"ANIMAL {i}", f"QUESTION {i}", "YES")
+    chain_elapsed = time.perf_counter() - start
+    # The namedtuple chain is built from the bottom up, as inserting each
+    # animal would recurse once for each question above it
+    leaf = f"ANIMAL {args.depth - 1}"
+    for i in reversed(range(args.depth)):
+        leaf = Node(f"QUESTION {i}", leaf, f"ANIMAL {i - 1}" if i else "FISH")
+    legacy = Node("DOES IT SWIM", leaf, "BIRD")
+    bottom = ["true"] * (args.depth + 1)
+    results = [
+        ("INSERT ALL SECONDS", f"{chain_elapsed:.3f}", "-"),
+        ("LIST SECONDS", timed(chain.animal_names),
+         timed(legacy_names, legacy)),
+        ("INSERT AT BOTTOM", timed(chain.insert, node, "A", "Q", "YES"),
+         timed(legacy_insert, legacy, bottom, "A", "Q", "YES")),
+        ]
+    print()
+    print(
+        f"CHAIN OF {args.depth:,} QUESTIONS, RECURSION LIMIT "
+        f"{sys.getrecursionlimit():,}"
+        )
+    print(f"{'OPERATION' : <24}{'AnimalTree' : >20}{'namedtuple' : >20}")
+    for operation, seconds, legacy_seconds in results:
+        print(f"{operation : <24}{seconds : >20}{legacy_seconds : >20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+import tracemalloc
+from typing import List
+
+from maze import ALGORITHMS, Maze
+
+# Compares the generation time and peak memory of every maze algorithm in
+# maze.ALGORITHMS across a range of maze sizes. Peak memory is measured with
+# tracemalloc in a separate run, as tracing slows generation down.
+
+# usage: python -m benchmarks.maze_algorithms [--sizes 100 300 1000]
+#                                             [--algorithms dfs prim]
+
+DEFAULT_SIZES = [100, 300, 1000]
+
+
+def measure(algorithm: str, size: int) -> tuple[float, int]:
+    """Generates a seeded square maze with the given algorithm.
+    Args:
+        algorithm: str- name of the algorithm in maze.ALGORITHMS
+        size: int- width and height of the maze
+    Returns:
+        tuple[float, int]: seconds taken to generate the maze and the peak
+        memory allocated during generation in bytes
+    """
+    start = time.perf_counter()
+    Maze(size, size, 0, algorithm).generate()
+    elapsed = time.perf_counter() - start
+
+    maze = Maze(size, size, 0, algorithm)
+    tracemalloc.start()
+    maze.generate()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Compares maze generation algorithms"
+        )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+        help="square maze sizes to generate",
+        )
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=sorted(ALGORITHMS),
+        default=sorted(ALGORITHMS), help="algorithms to compare",
+        )
+    args = parser.parse_args(argv)
+
+    print(f"{'ALGORITHM' : <10}{'SIZE' : >11}{'SECONDS' : >10}"
+          f"{'CELLS/S' : >12}{'PEAK MB' : >9}{'BYTES/CELL' : >12}")
+    for size in args.sizes:
+        for algorithm in args.algorithms:
+            elapsed, peak = measure(algorithm, size)
+            cells = size * size
+            print(f"{algorithm : <10}{f'{size}x{size}' : >11}"
+                  f"{elapsed : >10.2f}{cells / elapsed : >12,.0f}"
+                  f"{peak / 2**20 : >9.1f}{peak / cells : >12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import argparse
+import subprocess
+import sys
+from typing import List
+
+# Reports the generation time and peak resident set size (RSS) of
+# maze.generate_maze for a range of maze sizes. Each size is generated in a
+# fresh interpreter so that the peak RSS of one run does not hide the next.
+
+# usage: python -m benchmarks.maze_memory [--sizes 100 1000 5000]
+
+DEFAULT_SIZES = [100, 500, 1000, 2000, 5000]
+
+# Run in a child interpreter - prints seconds taken and peak RSS in bytes
+CHILD_SCRIPT = """
+import resource, sys, time
+from maze import Maze
+size = int(sys.argv[1])
+start = time.perf_counter()
+Maze(size, size, seed=0).generate()
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+if sys.platform != "darwin":
+    peak *= 1024
+print(elapsed, peak)
+"""
+
+
+def measure(size: int) -> tuple[float, int]:
+    """Generates a square maze in a child interpreter.
+    Args:
+        size: int- width and height of the maze
+    Returns:
+        tuple[float, int]: seconds taken to generate the maze and the peak
+        RSS of the child interpreter in bytes
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, str(size)],
+        capture_output=True, text=True, check=True,
+        )
+    elapsed, peak = result.stdout.split()
+    return float(elapsed), int(peak)
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Reports maze generation time and peak RSS"
+        )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+        help="square maze sizes to generate",
+        )
+    args = parser.parse_args(argv)
+
+    print(f"{'SIZE' : >11}{'SECONDS' : >10}{'PEAK RSS MB' : >13}"
+          f"{'BYTES/CELL' : >12}")
+    for size in args.sizes:
+        elapsed, peak = measure(size)
+        print(f"{f'{size}x{size}' : >11}{elapsed : >10.2f}"
+              f"{peak / 2**20 : >13.1f}{peak / (size * size) : >12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import time
+from collections import deque
+from typing import Callable, List
+
+from maze import Maze, MazeStep, dfs_moves, generate_maze
+
+# Checks that watching maze generation costs nothing when no observer is
+# attached. The reference is generate_maze, the depth-first search carving
+# in a plain loop that never yields, and Maze.generate() without an
+# observer should take the same time. The same search run through the
+# dfs_moves generator that observers use, an attached observer and
+# iterating over Maze.steps() directly are shown for comparison, each
+# relative to the reference.
+
+# usage: python -m benchmarks.maze_observer [--size 500] [--repeat 5]
+
+
+def best_times(runs: List[Callable[[], object]], repeat: int) -> List[float]:
+    """Times functions, keeping the fastest of several runs of each. The
+    functions take turns, so that a slow spell on the machine does not
+    count against just one of them.
+    Args:
+        runs: List[Callable]- functions to be timed
+        repeat: int- number of runs of each function
+    Returns:
+        List[float]- seconds taken by the fastest run of each function
+    """
+    best = [float("inf")] * len(runs)
+    for _ in range(repeat):
+        for index, run in enumerate(runs):
+            start = time.perf_counter()
+            run()
+            best[index] = min(best[index], time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Measures the cost of maze generation observers"
+        )
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    size = args.size
+
+    def seeded_start() -> tuple[int, random.Random]:
+        # Same random number generator state as Maze(size, size, 0)
+        rng = random.Random(0)
+        entrance_col = rng.randint(1, size)
+        rng.randint(1, size)
+        return entrance_col - 1, rng
+
+    def inline_loop() -> None:
+        cell, rng = seeded_start()
+        generate_maze(cell, bytearray(size * size), size, size, rng)
+
+    def move_generator() -> None:
+        cell, rng = seeded_start()
+        deque(
+            dfs_moves(cell, bytearray(size * size), size, size, rng),
+            maxlen=0,
+            )
+
+    def no_observer() -> None:
+        Maze(size, size, 0).generate()
+
+    def noop_observer() -> None:
+        def observer(step: MazeStep) -> None:
+            pass
+        Maze(size, size, 0).generate(observer)
+
+    def step_iterator() -> None:
+        for _ in Maze(size, size, 0).steps():
+            pass
+
+    runs = [
+        ("generate_maze() inline", inline_loop),
+        ("dfs_moves() generator", move_generator),
+        ("Maze.generate()", no_observer),
+        ("Maze.generate(observer)", noop_observer),
+        ("Maze.steps()", step_iterator),
+        ]
+    times = best_times([run for _, run in runs], args.repeat)
+    print(f"{'RUN' : <26}{'SECONDS' : >10}{'RELATIVE' : >10}")
+    for (name, _), elapsed in zip(runs, times):
+        print(f"{name : <26}{elapsed : >10.3f}{elapsed / times[0] : >9.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import time
+from array import array
+from typing import Callable, List
+
+from maze import (
+    DOWN, LEFT, OPPOSITE, RIGHT, UP, direction_offsets, generate_maze,
+    is_visited, mark_visited,
+    )
+
+# Compares the steps per second of maze.generate_maze against the previous
+# generation core, which scanned all four neighbours into a fresh list of
+# directions on every step. A step is one cell carved into the maze.
+
+# usage: python -m benchmarks.maze_steps [--sizes 100 300 1000 3000]
+
+DEFAULT_SIZES = [100, 300, 1000, 3000]
+
+
+def scan_generate_maze(
+        cell: int, maze_walls: bytearray, maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> bytearray:
+    """Generates a maze with the previous scanning DFS core, kept here as
+    the baseline for the benchmark.
+    Args:
+        cell: int- flat row-major index of the starting cell
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+    """
+    def check_direction(cell: int) -> List[int]:
+        possible_directions = []
+        row, col = divmod(cell, maze_width)
+        if row > 0 and not is_visited(visited, cell - maze_width):
+            possible_directions.append(UP)
+        if row < maze_height - 1 and \
+                not is_visited(visited, cell + maze_width):
+            possible_directions.append(DOWN)
+        if col > 0 and not is_visited(visited, cell - 1):
+            possible_directions.append(LEFT)
+        if col < maze_width - 1 and not is_visited(visited, cell + 1):
+            possible_directions.append(RIGHT)
+        return possible_directions
+
+    total_cells = maze_width * maze_height
+    visited = bytearray((total_cells + 7) >> 3)
+    offsets = direction_offsets(maze_width)
+    maze_path = array("B")
+    mark_visited(visited, cell)
+    counter = 1
+    while counter < total_cells and (maze_path or check_direction(cell)):
+        directions = check_direction(cell)
+        if not directions:
+            cell -= offsets[maze_path.pop()]
+            continue
+        direction = rng.choice(directions)
+        maze_walls[cell] |= direction
+        cell += offsets[direction]
+        maze_walls[cell] |= OPPOSITE[direction]
+        mark_visited(visited, cell)
+        maze_path.append(direction)
+        counter += 1
+    return maze_walls
+
+
+def steps_per_second(generator: Callable, size: int) -> float:
+    """Times one seeded square maze generation.
+    Args:
+        generator: Callable- maze generation function to be timed
+        size: int- width and height of the maze
+    Returns:
+        float- cells carved per second
+    """
+    walls = bytearray(size * size)
+    start = time.perf_counter()
+    generator(0, walls, size, size, random.Random(0))
+    elapsed = time.perf_counter() - start
+    return (size * size - 1) / elapsed
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Compares maze generation steps per second"
+        )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+        help="square maze sizes to generate",
+        )
+    args = parser.parse_args(argv)
+
+    print(f"{'SIZE' : >11}{'SCAN STEPS/S' : >15}{'TABLE STEPS/S' : >15}"
+          f"{'SPEEDUP' : >9}")
+    for size in args.sizes:
+        before = steps_per_second(scan_generate_maze, size)
+        after = steps_per_second(generate_maze, size)
+        print(f"{f'{size}x{size}' : >11}{before : >15,.0f}{after : >15,.0f}"
+              f"{after / before : >8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from helpers import FileSink, Terminal, redirect_output
+from maze import ALGORITHMS, Maze, render_maze
+from maze_solver import solve_maze
+
+# Benchmark and regression suite for the maze engine. Runs seeded maze
+# generation, rendering, solving and Terminal display over a ladder of maze
+# sizes, recording the wall time, cells per second and tracemalloc peak
+# memory of each phase. Results are written as JSON and compared with a
+# stored baseline - the suite exits with status 1 if any phase is slower or
+# uses more memory than the baseline by more than the threshold. There is
+# no default baseline, as timings depend on the machine - running without
+# one is an error until a baseline has been recorded with --update-baseline.
+
+# usage: python -m benchmarks.maze_suite [--sizes 10 64 256 1024 4096]
+#            [--algorithms dfs] [--output results.json]
+#            [--baseline benchmarks/maze_baseline.json] [--update-baseline]
+#            [--threshold 0.25] [--repeat 3] [--no-memory]
+# Example - record a baseline, then check later changes against it:
+#   python -m benchmarks.maze_suite --update-baseline
+#   python -m benchmarks.maze_suite
+
+DEFAULT_SIZES = [10, 64, 256, 1024, 4096]
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "maze_baseline.json"
+    )
+# Displaying through a Terminal holds the whole screen in memory as text, so
+# that phase is only run for mazes up to this size
+DISPLAY_MAX_SIZE = 1024
+
+
+def run_phase(
+        phase: Callable[[], Any], measure_memory: bool, repeat: int
+        ) -> tuple[float, int | None]:
+    """Times one phase and optionally measures its peak memory in a
+    further, traced, run.
+    Args:
+        phase: Callable- function running the phase
+        measure_memory: bool- whether to measure peak memory
+        repeat: int- number of untraced runs to take the fastest of
+    Returns:
+        tuple[float, int | None]: seconds taken by the fastest untraced run
+        and the tracemalloc peak in bytes, or None if memory was not
+        measured
+    """
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        phase()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    if not measure_memory:
+        return elapsed, None
+    tracemalloc.start()
+    phase()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def display(maze: Maze) -> None:
+    """Draws a rendered maze into a Terminal and displays it, discarding the
+    output.
+    Args:
+        maze: Maze- the generated maze
+    Returns:
+        None
+    """
+    terminal = Terminal((maze.width + 1) * 3)
+    terminal.blit(0, 0, list(render_maze(maze)))
+    with open(os.devnull, "w") as devnull, \
+            redirect_output(FileSink(devnull)):
+        terminal.display()
+
+
+def run_suite(
+        sizes: List[int], algorithms: List[str], measure_memory: bool,
+        repeat: int
+        ) -> List[Dict[str, Any]]:
+    """Runs every phase for every size and algorithm.
+    Args:
+        sizes: List[int]- square maze sizes
+        algorithms: List[str]- names of algorithms in maze.ALGORITHMS
+        measure_memory: bool- whether to measure peak memory
+        repeat: int- number of timed runs of each phase
+    Returns:
+        List[Dict[str, Any]]: one result per phase, size and algorithm
+    """
+    results = []
+    for size in sizes:
+        for algorithm in algorithms:
+            cells = size * size
+            maze = Maze(size, size, 0, algorithm).generate()
+            phases = {
+                "generate": lambda: Maze(size, size, 0, algorithm).generate(),
+                "render": lambda: sum(map(len, render_maze(maze))),
+                "solve": lambda: solve_maze(maze),
+                }
+            if size <= DISPLAY_MAX_SIZE:
+                phases["display"] = lambda: display(maze)
+            for name, phase in phases.items():
+                elapsed, peak = run_phase(phase, measure_memory, repeat)
+                result = {
+                    "phase": name,
+                    "algorithm": algorithm,
+                    "size": size,
+                    "seconds": elapsed,
+                    "cells_per_second": cells / elapsed,
+                    "peak_bytes": peak,
+                    }
+                results.append(result)
+                print(f"{name : <9}{algorithm : <9}"
+                      f"{f'{size}x{size}' : >11}{elapsed : >10.3f}s"
+                      f"{cells / elapsed : >14,.0f} cells/s"
+                      + ("" if peak is None
+                         else f"{peak / 2**20 : >10.1f} MB"),
+                      file=sys.stderr)
+    return results
+
+
+def find_regressions(
+        results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+        threshold: float
+        ) -> List[str]:
+    """Compares results with a baseline.
+    Args:
+        results: List[Dict[str, Any]]- results of this run
+        baseline: List[Dict[str, Any]]- results of the baseline run
+        threshold: float- allowed fractional increase, e.g. 0.25 for 25%
+    Returns:
+        List[str]: a description of every phase that regressed
+    """
+    def key(result: Dict[str, Any]) -> tuple[str, str, int]:
+        return result["phase"], result["algorithm"], result["size"]
+
+    baseline_by_key = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_key.get(key(result))
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if result[metric] is None or previous[metric] is None:
+                continue
+            if result[metric] > previous[metric] * (1 + threshold):
+                phase, algorithm, size = key(result)
+                regressions.append(
+                    f"{phase} {algorithm} {size}x{size}: {metric} "
+                    f"{previous[metric]:.4g} -> {result[metric]:.4g}"
+                    )
+    return regressions
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Maze benchmark and regression suite"
+        )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=DEFAULT_SIZES,
+        help="square maze sizes to run",
+        )
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=sorted(ALGORITHMS),
+        default=["dfs"], help="generation algorithms to run",
+        )
+    parser.add_argument(
+        "--output", help="file to write the JSON results to",
+        )
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE,
+        help="JSON results to compare against",
+        )
+    parser.add_argument(
+        "--update-baseline", action="store_true",
+        help="write the results to the baseline file instead of comparing",
+        )
+    parser.add_argument(
+        "--threshold", type=float, default=0.25,
+        help="allowed fractional slowdown or memory growth (default 0.25)",
+        )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="timed runs of each phase, keeping the fastest (default 3)",
+        )
+    parser.add_argument(
+        "--no-memory", action="store_true",
+        help="skip the tracemalloc runs",
+        )
+    args = parser.parse_args(argv)
+    # Timings only compare with a baseline recorded on the same machine, so
+    # none is kept in the repository - without one the suite cannot check
+    # for regressions at all, which is an error rather than a pass
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        parser.error(
+            f"no baseline at {args.baseline} - record one with "
+            "--update-baseline first"
+            )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run_suite(
+            args.sizes, args.algorithms, not args.no_memory, args.repeat
+            ),
+        }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            baseline_file.write(output + "\n")
+        return
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    regressions = find_regressions(
+        report["results"], baseline, args.threshold
+        )
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import os
+import time
+from typing import List
+
+from helpers import (
+    FileSink, Output, print_tabbed_text, print_text, redirect_output,
+    )
+
+# Compares writing game output with a bare print() per line, as the games
+# did before the output layer, with writing through a buffered Output. Both
+# write to /dev/null through a line buffered text stream, as stdout is on a
+# terminal, and count the write system calls that reach the file.
+
+# usage: python -m benchmarks.output_sinks [--lines 100000]
+
+# A few lines of a game of Acey Ducey, repeated
+TRANSCRIPT = [
+    "YOU NOW HAVE 100 DOLLARS",
+    "",
+    "HERE ARE YOUR NEXT TWO CARDS: ",
+    "4",
+    "QUEEN",
+    "",
+    "WHAT IS YOUR BET",
+    "KING",
+    "SORRY, YOU LOSE",
+    ]
+
+
+class CountingFile(io.FileIO):
+    """File that counts the writes made to it."""
+    writes = 0
+
+    def write(self, data) -> int:
+        self.writes += 1
+        return super().write(data)
+
+
+def open_null() -> tuple[CountingFile, io.TextIOWrapper]:
+    """Opens /dev/null as a line buffered text stream."""
+    raw = CountingFile(os.devnull, "w")
+    return raw, io.TextIOWrapper(
+        io.BufferedWriter(raw), line_buffering=True
+        )
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Compares bare print() calls with buffered output"
+        )
+    parser.add_argument("--lines", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    lines = [
+        TRANSCRIPT[i % len(TRANSCRIPT)] for i in range(args.lines)
+        ]
+    animals = [f"ANIMAL{i}" for i in range(args.lines)]
+
+    results = []
+    raw, stream = open_null()
+    start = time.perf_counter()
+    for line in lines:
+        print(line, file=stream)
+    for animal in animals:
+        print(f"{animal : <15}", end="", file=stream)
+    print(file=stream)
+    stream.flush()
+    results.append(("print()", time.perf_counter() - start, raw.writes))
+    stream.close()
+
+    for policy in Output.FLUSH_POLICIES:
+        raw, stream = open_null()
+        start = time.perf_counter()
+        with redirect_output(FileSink(stream), policy):
+            for line in lines:
+                print_text(line)
+            print_tabbed_text(animals)
+        results.append(
+            (f"Output {policy}", time.perf_counter() - start, raw.writes)
+            )
+        stream.close()
+
+    print(f"{'METHOD' : <16}{'SECONDS' : >10}{'WRITES' : >10}")
+    for method, seconds, writes in results:
+        print(f"{method : <16}{seconds : >10.3f}{writes : >10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import math
+import time
+from typing import Callable, Dict, List, Optional
+
+from aceyducey import BET_PROMPT, TRY_AGAIN_PROMPT
+from game_server import END_OF_TURN, start_server
+
+# Load test for game_server.py. Runs many concurrent sessions, alternating
+# between Acey Ducey and Animal, each playing a short game to its end, and
+# reports the sessions completed per second and the latency of each turn -
+# the time from sending a line to receiving the end of the reply. A session
+# only counts as completed once the server has closed it, which it does
+# when the game has finished. Starts a server in the same process unless
+# --port is given.
+
+# usage: python -m benchmarks.session_load [--sessions 5000]
+#                                          [--concurrency 1000]
+#                                          [--host HOST --port PORT]
+
+# Lines sent in a game of Animal - guesses a fish and then ends the game
+ANIMAL_SCRIPT = ["YES", "YES", "YES", "NO"]
+
+# Seconds to wait for the server to close a session once its game is over
+END_TIMEOUT = 10.0
+
+
+def play_aceyducey(reply: str, turn: int) -> Optional[str]:
+    """Bets all the money on every deal until it has gone, then declines
+    to try again. Returns None once the reply asks for nothing more.
+    """
+    if reply.endswith(TRY_AGAIN_PROMPT):
+        return "NO"
+    if reply.endswith(BET_PROMPT):
+        return reply.rsplit("YOU NOW HAVE ", 1)[1].split()[0]
+    return None
+
+
+def play_animal(reply: str, turn: int) -> Optional[str]:
+    """Sends the next line of ANIMAL_SCRIPT, or None once it has all been
+    sent."""
+    return ANIMAL_SCRIPT[turn] if turn < len(ANIMAL_SCRIPT) else None
+
+
+# Game name: function choosing the line to send after each reply
+PLAYERS: Dict[str, Callable[[str, int], Optional[str]]] = {
+    "ACEYDUCEY": play_aceyducey,
+    "ANIMAL": play_animal,
+    }
+
+
+async def read_turn(reader: asyncio.StreamReader) -> str:
+    """Reads a reply up to the end of turn marker. Every reply ends with a
+    line ending, so the marker is always preceded by one.
+    Returns:
+        str: the reply without the end of turn marker
+    """
+    reply = await reader.readuntil(b"\n" + END_OF_TURN)
+    return reply[:-len(END_OF_TURN)].decode("utf-8")
+
+
+async def run_session(
+        host: str, port: int, game: str, latencies: List[float]
+        ) -> None:
+    """Plays one session to the end of its game, adding the latency of
+    each turn.
+    Raises:
+        RuntimeError: If the server does not close the session once the
+        game is over.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await read_turn(reader)
+        line, turn = game, 0
+        while line is not None:
+            start = time.perf_counter()
+            writer.write(line.encode() + b"\n")
+            reply = await read_turn(reader)
+            latencies.append(time.perf_counter() - start)
+            line = PLAYERS[game](reply, turn)
+            turn += 1
+        if await asyncio.wait_for(reader.read(1), END_TIMEOUT):
+            raise RuntimeError(f"{game} session did not end")
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the nearest rank percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+async def run_load(
+        sessions: int, concurrency: int, host: str, port: Optional[int]
+        ) -> None:
+    server = None
+    if port is None:
+        server = await start_server(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies: List[float] = []
+    limit = asyncio.Semaphore(concurrency)
+    games = list(PLAYERS)
+
+    async def limited_session(index: int) -> None:
+        async with limit:
+            await run_session(
+                host, port, games[index % len(games)], latencies
+                )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(limited_session(index) for index in range(sessions)),
+        return_exceptions=True,
+        )
+    elapsed = time.perf_counter() - start
+    failed = sum(isinstance(result, BaseException) for result in results)
+    if server is not None:
+        # Let the server finish closing its side of each session
+        while len(asyncio.all_tasks()) > 1:
+            await asyncio.sleep(0.01)
+        server.close()
+        await server.wait_closed()
+
+    completed = sessions - failed
+    print(f"SESSIONS      {completed:,} COMPLETED, {failed:,} FAILED")
+    print(f"SESSIONS/S    {completed / elapsed:,.0f}")
+    print(f"TURNS/S       {len(latencies) / elapsed:,.0f}")
+    if latencies:
+        print(f"P50 TURN      {percentile(latencies, 0.50) * 1000:.2f} MS")
+        print(f"P99 TURN      {percentile(latencies, 0.99) * 1000:.2f} MS")
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Load tests the game server with concurrent sessions"
+        )
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument(
+        "--concurrency", type=int, default=1000,
+        help="most sessions open at once",
+        )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, default=None,
+        help="port of a running server - by default one is started",
+        )
+    args = parser.parse_args(argv)
+    asyncio.run(
+        run_load(args.sessions, args.concurrency, args.host, args.port)
+        )
+
+if __name__ == "__main__":
+    main()
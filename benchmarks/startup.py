@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Measures the import time of the launcher and each game with
+# python -X importtime, and checks it against a startup budget. Each module
+# is imported in a fresh interpreter and the cumulative time of its top
+# level import is taken from the -X importtime report. The best of several
+# runs is used, as the first run pays for cold file caches and for writing
+# the bytecode caches. Exits with status 1 if any module is over budget.
+
+# usage: python -m benchmarks.startup [--budget 30] [--repeat 5] [modules]
+
+MODULES = ["games", "aceyducey", "amazing", "animal", "bunny"]
+
+# Startup budget for each module in milliseconds
+DEFAULT_BUDGET_MS = 30.0
+
+
+def import_time(module: str) -> float:
+    """Returns the cumulative import time of a module in milliseconds,
+    measured in a new interpreter.
+    """
+    # Allow bytecode caches to be written, as they would be when installed
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, env=env,
+        )
+    # Lines are "import time: self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Checks the import time of the games against a budget"
+        )
+    parser.add_argument(
+        "--budget", type=float, default=DEFAULT_BUDGET_MS,
+        help="startup budget per module in milliseconds",
+        )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'module':<12}{'import ms':>10}  budget {args.budget:.0f} ms")
+    for module in args.modules:
+        best = min(import_time(module) for _ in range(args.repeat))
+        status = "ok" if best <= args.budget else "OVER"
+        print(f"{module:<12}{best:>10.1f}  {status}")
+        if best > args.budget:
+            over_budget.append(module)
+    if over_budget:
+        print(f"over budget: {', '.join(over_budget)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
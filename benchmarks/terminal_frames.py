@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+from typing import List
+
+from helpers import MemorySink, Terminal, redirect_output
+from maze import Maze, render_maze
+
+# Measures the bytes written per frame when animating a maze being drawn
+# one line at a time, comparing a full redraw of the screen every frame
+# (clear the console, then Terminal.display) with Terminal.present, which
+# sends only the characters changed since the last frame.
+
+# usage: python -m benchmarks.terminal_frames [--width 25] [--height 10]
+
+
+def main(argv: List[str] | None=None) -> None:
+    """Main benchmark loop
+    """
+    parser = argparse.ArgumentParser(
+        description="Compares bytes per frame of full and diff redraws"
+        )
+    parser.add_argument("--width", type=int, default=25)
+    parser.add_argument("--height", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    lines = list(render_maze(Maze(args.width, args.height, 0).generate()))
+    terminal = Terminal((args.width + 1) * 3, len(lines))
+    full_bytes = 0
+    with open(os.devnull, "w") as devnull:
+        for row, line in enumerate(lines):
+            terminal.write_string(row, 0, line)
+            # Full redraw - clear the console and display the whole screen
+            with redirect_output(MemorySink()) as full_frame:
+                full_frame.write("\x1b[H\x1b[2J")
+                terminal.display()
+            full_bytes += len(full_frame.getvalue())
+            terminal.present(devnull)
+
+    frames = len(lines)
+    print(f"{'FRAMES' : <8}{'FULL BYTES/FRAME' : >18}"
+          f"{'DIFF BYTES/FRAME' : >18}{'SAVING' : >9}")
+    print(f"{frames : <8}{full_bytes / frames : >18,.0f}"
+          f"{terminal.bytes_written / frames : >18,.0f}"
+          f"{1 - terminal.bytes_written / full_bytes : >9.0%}")
+
+if __name__ == "__main__":
+    main()
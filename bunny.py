@@ -2,7 +2,7 @@
 
 from typing import List
 
-from helpers import Terminal, clear_console, centred_text
+from helpers import Terminal, clear_console, centred_text, print_text
 
 # Refactoring of the "Bunny" BASIC game from the 1978 book BASIC Computer 
 # Games by Creative Computing into Python 3
@@ -56,7 +56,7 @@ def main():
         row = 0
         while True: 
             if pattern[start] < 0: 
-                print()
+                print_text()
                 start += 1
                 row += 1
                 continue
@@ -64,21 +64,21 @@ def main():
                 break
             else:
                 stop = start + 1
-                for col in range(pattern[start], pattern[stop] + 1):
-                    bunny_letter = chr(
-                        ASCII_OFFSET + BUNNY_STRING[int(col % 5)]
-                        )
-                    terminal.add_character(row, col, bunny_letter)
+                bunny_letters = "".join(
+                    chr(ASCII_OFFSET + BUNNY_STRING[int(col % 5)])
+                    for col in range(pattern[start], pattern[stop] + 1)
+                    )
+                terminal.write_string(row, pattern[start], bunny_letters)
                 start += 2
                 continue
 
     draw_pattern(PATTERN_DATA)
     clear_console()
-    print(centred_text("BUNNY"))
-    print(centred_text("CREATIVE COMPUTING  MORRISTOWN, NEW JERSEY"))
-    print("\n" * 3, end="") 
+    print_text(centred_text("BUNNY"))
+    print_text(centred_text("CREATIVE COMPUTING  MORRISTOWN, NEW JERSEY"))
+    print_text("\n" * 3, end="") 
     terminal.display()
-    print("\n" * 6, end="")
+    print_text("\n" * 6, end="")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
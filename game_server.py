@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+from typing import Callable, Dict, Optional
+
+from aceyducey import AceyDuceyGame
+from animal import AnimalGame
+
+# Line protocol server hosting many concurrent games of Acey Ducey and
+# Animal in a single process. Each connection is one session - the server
+# asks which game to play, then passes each line received to the game's
+# state machine and sends back its reply. Every reply ends with a line
+# holding a single full stop, as in SMTP and NNTP, so that clients know
+# when the turn is over. The connection is closed when the game finishes,
+# the client disconnects or the session is idle for too long.
+
+# usage: python game_server.py [--host 127.0.0.1] [--port 8023]
+#                              [--idle-timeout 300]
+# Example - nc localhost 8023, then type ANIMAL
+
+# Game name: factory for a new game state machine
+SESSION_GAMES: Dict[str, Callable[[], AceyDuceyGame | AnimalGame]] = {
+    "ACEYDUCEY": AceyDuceyGame,
+    "ANIMAL": AnimalGame,
+    }
+
+GAME_PROMPT = "WHICH GAME (ACEYDUCEY OR ANIMAL)?\n"
+END_OF_TURN = b".\n"
+
+# Longest line accepted from a client, in bytes
+MAX_LINE = 1024
+DEFAULT_PORT = 8023
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+async def read_line(
+        reader: asyncio.StreamReader, idle_timeout: float
+        ) -> Optional[str]:
+    """Reads a line from a client.
+    Args:
+        reader: asyncio.StreamReader- the client connection
+        idle_timeout: float- seconds to wait for the line
+    Returns:
+        str: the line without its line ending, or None if the client has
+        disconnected, sent a line longer than MAX_LINE or timed out
+    """
+    try:
+        line = await asyncio.wait_for(reader.readline(), idle_timeout)
+    except (asyncio.TimeoutError, ValueError, ConnectionError):
+        return None
+    if not line:
+        return None
+    return line.decode("utf-8", "replace").rstrip("\r\n")
+
+
+async def send_turn(writer: asyncio.StreamWriter, text: str) -> None:
+    """Sends a reply to a client followed by the end of turn marker."""
+    writer.write(text.encode("utf-8") + END_OF_TURN)
+    await writer.drain()
+
+
+async def handle_session(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+        idle_timeout: float=DEFAULT_IDLE_TIMEOUT
+        ) -> None:
+    """Plays a session with a client, from choosing the game to the game
+    finishing.
+    Args:
+        reader: asyncio.StreamReader- the client connection
+        writer: asyncio.StreamWriter- the client connection
+        idle_timeout: float- seconds to wait for each line
+    Returns:
+        None
+    """
+    try:
+        await send_turn(writer, GAME_PROMPT)
+        while True:
+            line = await read_line(reader, idle_timeout)
+            if line is None:
+                return
+            factory = SESSION_GAMES.get(line.strip().upper())
+            if factory is not None:
+                break
+            await send_turn(writer, GAME_PROMPT)
+
+        game = factory()
+        await send_turn(writer, game.start())
+        while not game.finished:
+            line = await read_line(reader, idle_timeout)
+            if line is None:
+                return
+            await send_turn(writer, game.send(line))
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def start_server(
+        host: str="127.0.0.1", port: int=DEFAULT_PORT,
+        idle_timeout: float=DEFAULT_IDLE_TIMEOUT
+        ) -> asyncio.Server:
+    """Starts listening for sessions. Port 0 chooses a free port.
+    Args:
+        host: str- address to listen on
+        port: int- port to listen on
+        idle_timeout: float- seconds a session may wait for a line
+    Returns:
+        asyncio.Server: the listening server
+    """
+    return await asyncio.start_server(
+        lambda reader, writer: handle_session(reader, writer, idle_timeout),
+        host, port, limit=MAX_LINE, backlog=4096,
+        )
+
+
+async def serve(host: str, port: int, idle_timeout: float) -> None:
+    server = await start_server(host, port, idle_timeout)
+    for sock in server.sockets:
+        print("LISTENING ON {}:{}".format(*sock.getsockname()[:2]))
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    """Runs the server until interrupted
+    """
+    parser = argparse.ArgumentParser(
+        prog="Game Server",
+        description="Hosts Acey Ducey and Animal sessions over TCP",
+        )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+        help="seconds before an idle session is closed",
+        )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.idle_timeout))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import sys
+
+from helpers import (
+    centred_text, clear_console, get_output, input_text, print_text,
+    )
+
+# Launcher for the games - lists the games and starts the chosen one in the
+# same process, so switching games does not pay for a new interpreter. Each
+# game module is only imported when it is started.
+
+# usage: python -m games                 shows the menu
+#        python -m games amazing 10 10   starts a game with its arguments
+
+# Game name: (module, description)
+GAMES = {
+    "aceyducey": ("aceyducey", "ACEY DUCEY CARD GAME"),
+    "amazing": ("amazing", "AMAZING MAZE GENERATOR"),
+    "animal": ("animal", "GUESS THE ANIMAL"),
+    "bunny": ("bunny", "BUNNY PATTERN"),
+    }
+
+
+def run_game(name: str, args: list[str]) -> int:
+    """
+    Imports a game module and runs its main function, with sys.argv set to
+    the arguments for the game. A game exiting with sys.exit(), being
+    interrupted with Ctrl+C or stopping with an error returns to the caller
+    rather than ending the launcher, and an error is reported with a
+    non-zero status.
+    Args:
+        name: str- name of the game in GAMES
+        args: list[str]- command line arguments passed to the game
+    Returns:
+        int: the exit status of the game
+    """
+    # Imported here as importlib is only needed once a game is chosen
+    import importlib
+
+    module_name = GAMES[name][0]
+    module = importlib.import_module(module_name)
+    saved_argv = sys.argv
+    sys.argv = [f"{module_name}.py", *args]
+    try:
+        module.main()
+    except SystemExit as exit_request:
+        if exit_request.code is None:
+            return 0
+        if isinstance(exit_request.code, int):
+            return exit_request.code
+        get_output().flush()
+        print(exit_request.code, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print_text()
+        return 130
+    except Exception as error:
+        # Any other error ends the game, not the launcher
+        print_text(
+            f"\n{name.upper()} STOPPED WITH AN ERROR: "
+            f"{type(error).__name__}: {error}"
+            )
+        return 1
+    finally:
+        sys.argv = saved_argv
+        get_output().flush()
+    return 0
+
+
+def display_menu() -> None:
+    """Displays the list of games.
+    """
+    clear_console()
+    print_text(centred_text("BASIC COMPUTER GAMES"))
+    print_text(centred_text("CREATIVE COMPUTING  MORRISTOWN, NEW JERSEY"))
+    print_text("\n" * 3, end = "")
+    for number, (name, (_, description)) in enumerate(GAMES.items(), 1):
+        print_text(f"{number}. {name.upper() : <12}{description}")
+    print_text()
+
+
+def choose_game() -> tuple[str, list[str]] | None:
+    """
+    Asks the user to choose a game by number or name, followed by any
+    arguments for the game.
+    Returns:
+        tuple[str, list[str]]: name of the game and its arguments, or None if
+        the user has chosen to quit
+    """
+    names = list(GAMES)
+    while True:
+        try:
+            choice = input_text("WHICH GAME (OR QUIT)?\n").split()
+        except EOFError:
+            return None
+        if not choice:
+            continue
+        game = choice[0].lower()
+        if game in ("q", "quit"):
+            return None
+        if game.isdigit() and 1 <= int(game) <= len(names):
+            return names[int(game) - 1], choice[1:]
+        if game in GAMES:
+            return game, choice[1:]
+        print_text(f"THERE IS NO GAME CALLED {choice[0].upper()}")
+
+
+def main() -> None:
+    """Main launcher loop
+    """
+    if len(sys.argv) > 1:
+        name = sys.argv[1].lower()
+        if name not in GAMES:
+            sys.exit(
+                f"unknown game {sys.argv[1]!r} - choose from "
+                + ", ".join(GAMES)
+                )
+        sys.exit(run_game(name, sys.argv[2:]))
+
+    while True:
+        display_menu()
+        selection = choose_game()
+        if selection is None:
+            break
+        run_game(*selection)
+        try:
+            input_text("PRESS RETURN FOR THE MENU\n")
+        except EOFError:
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
-import platform
+import atexit
+import contextlib
 import os
 import math
+import sys
+import time
 
-from typing import List, Sequence
+from typing import Dict, Iterator, List, Optional, Sequence, Set, TextIO
 
 def centred_text(input_text=str, console_width: int=80) -> str:
     """ Outputs centred text to the console based on a default console width 
@@ -17,20 +20,311 @@ def centred_text(input_text=str, console_width: int=80) -> str:
     return output_text
 
 
+# ANSI escape sequence written by the 'clear' command - move the cursor
+# home, clear the screen and clear the scrollback
+CLEAR_SEQUENCE = "\x1b[H\x1b[2J\x1b[3J"
+
+# Byte held in a Terminal row for a cell whose text does not fit in a byte
+TEXT_CELL_BYTE = ord("?")
+
+
+class OutputSink:
+    """Base class for the destinations that game output is written to.
+    A sink receives text in large blocks from an Output buffer.
+    Methods:
+    --------
+    write(text: str):
+        Writes a block of text to the destination.
+    write_bytes(data: bytes):
+        Writes a block of bytes to the destination - by default the bytes
+        are decoded as latin-1 and written as text.
+    flush():
+        Flushes anything held by the destination.
+    close():
+        Flushes and closes the destination.
+    isatty():
+        Returns True if the destination is an interactive terminal.
+    """
+    def write(self, text: str) -> None:
+        raise NotImplementedError
+
+    def write_bytes(self, data: bytes) -> None:
+        self.write(data.decode("latin-1"))
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+class StdoutSink(OutputSink):
+    """Writes to sys.stdout, looked up on every write so that the sink
+    follows any later redirection of sys.stdout.
+    """
+    def write(self, text: str) -> None:
+        sys.stdout.write(text)
+
+    def write_bytes(self, data: bytes) -> None:
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is None:
+            super().write_bytes(data)
+            return
+        sys.stdout.flush()
+        buffer.write(data)
+
+    def flush(self) -> None:
+        sys.stdout.flush()
+
+    def isatty(self) -> bool:
+        return sys.stdout.isatty()
+
+
+class FileSink(OutputSink):
+    """Writes to a file, given either as a path to be opened for writing
+    or as an open text file. Files opened by the sink are closed by close().
+    """
+    def __init__(
+            self, file: str | os.PathLike | TextIO, encoding: str="utf-8"
+            ) -> None:
+        if isinstance(file, (str, os.PathLike)):
+            self.file = open(file, "w", encoding=encoding)
+            self._owns_file = True
+        else:
+            self.file = file
+            self._owns_file = False
+
+    def write(self, text: str) -> None:
+        self.file.write(text)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns_file:
+            self.file.close()
+
+
+class MemorySink(OutputSink):
+    """Keeps everything written in memory, for running games headless and
+    capturing their output.
+    """
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+
+    def write(self, text: str) -> None:
+        self.chunks.append(text)
+
+    def getvalue(self) -> str:
+        """Returns everything written so far as a single string."""
+        if len(self.chunks) > 1:
+            self.chunks[:] = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
+
+
+class SocketSink(OutputSink):
+    """Sends everything written over a connected socket."""
+    def __init__(self, connection, encoding: str="utf-8") -> None:
+        self.connection = connection
+        self.encoding = encoding
+
+    def write(self, text: str) -> None:
+        self.connection.sendall(text.encode(self.encoding))
+
+    def write_bytes(self, data: bytes) -> None:
+        self.connection.sendall(data)
+
+
+class Output:
+    """Buffers text written by the games and passes it on to a sink in large
+    blocks, rather than one small write for every print() call.
+    Attributes:
+    -----------
+    sink: OutputSink
+        Destination of the buffered text.
+    flush_policy: str
+        When the buffer is passed on to the sink - "line" after every write
+        containing a newline, "size" once the buffer holds buffer_size
+        characters, or "manual" only when flush() is called. By default
+        "line" for an interactive terminal and "size" otherwise.
+    buffer_size: int
+        Number of characters held before a "size" flush.
+    Methods:
+    --------
+    write(text: str):
+        Adds text to the buffer, flushing it if the flush policy requires.
+    write_bytes(data: bytes):
+        Flushes the buffer and writes bytes straight to the sink.
+    flush():
+        Passes the buffered text on to the sink in a single write.
+    close():
+        Flushes the buffer and closes the sink.
+    """
+    FLUSH_POLICIES = ("line", "size", "manual")
+
+    def __init__(
+            self, sink: Optional[OutputSink]=None,
+            flush_policy: Optional[str]=None, buffer_size: int=8192
+            ) -> None:
+        self.sink = sink if sink is not None else StdoutSink()
+        if flush_policy is None:
+            flush_policy = "line" if self.sink.isatty() else "size"
+        if flush_policy not in self.FLUSH_POLICIES:
+            raise ValueError(
+                f"flush_policy must be one of {', '.join(self.FLUSH_POLICIES)}"
+                )
+        self.flush_policy = flush_policy
+        self.buffer_size = buffer_size
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def write(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self.flush_policy == "line":
+            if "\n" in text:
+                self.flush()
+        elif self.flush_policy == "size":
+            if self._buffered >= self.buffer_size:
+                self.flush()
+
+    def write_bytes(self, data: bytes) -> None:
+        self.flush()
+        self.sink.write_bytes(data)
+        self.sink.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.sink.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self.sink.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.sink.close()
+
+
+# Output that the games write to - created on first use
+_output: Optional[Output] = None
+
+
+def get_output() -> Output:
+    """Returns the Output that the games write to, by default a buffer
+    over stdout which is flushed when the program exits.
+    """
+    global _output
+    if _output is None:
+        _output = Output()
+        atexit.register(_flush_output)
+    return _output
+
+
+def _flush_output() -> None:
+    """Flushes whichever output is current when the program exits."""
+    if _output is not None:
+        _output.flush()
+
+
+def set_output(output: Output) -> Output:
+    """Sets the Output that the games write to, flushing the current one.
+    Args:
+        output: Output- the new output
+    Returns:
+        Output: the previous output, so that it can be restored
+    """
+    global _output
+    previous = get_output()
+    previous.flush()
+    _output = output
+    return previous
+
+
+@contextlib.contextmanager
+def redirect_output(
+        sink: OutputSink, flush_policy: str="manual"
+        ) -> Iterator[OutputSink]:
+    """Context manager sending all game output to a sink, e.g. to run a
+    game headless with its output captured in a MemorySink:
+        with redirect_output(MemorySink()) as sink:
+            bunny.main()
+        text = sink.getvalue()
+    """
+    output = Output(sink, flush_policy)
+    previous = set_output(output)
+    try:
+        yield sink
+    finally:
+        output.flush()
+        set_output(previous)
+
+
+def print_text(*values: object, sep: str=" ", end: str="\n") -> None:
+    """Writes values to the game output, in the same way as print().
+    """
+    get_output().write(sep.join(map(str, values)) + end)
+
+
+def input_text(prompt: str="") -> str:
+    """Writes a prompt to the game output, flushes it so that the prompt
+    is seen, and reads a line of input, in the same way as input().
+    """
+    output = get_output()
+    output.write(prompt)
+    output.flush()
+    return input()
+
+
 def clear_console() -> None:
     """Clears the console screen.
-    Function detects the operating system and issues the appropriate 
-    command to clear the console. On Windows, it runs the 'cls' command, while 
-    on other platforms (Linux, macOS), it runs the 'clear' command.
+    Function detects the operating system and clears the console. On 
+    Windows, it runs the 'cls' command, while on other platforms (Linux, 
+    macOS), it writes the ANSI escape sequence that the 'clear' command
+    would to the game output, without starting a subprocess.
     Args:
         None
     Returns:
         None
     """
-    if platform.system() == "Windows":
+    output = get_output()
+    if os.name == "nt":
+        output.flush()
         os.system('cls')
     else:
-        os.system('clear')
+        output.write(CLEAR_SEQUENCE)
+        output.flush()
+
+
+def changed_spans(
+        previous: bytes | bytearray, current: bytes | bytearray, gap: int=8
+        ) -> List[tuple[int, int]]:
+    """Finds the spans of characters that differ between two versions of
+    a terminal row. Spans separated by fewer than `gap` unchanged
+    characters are merged, as resending a few characters costs less than
+    another cursor movement.
+    Args:
+        previous: bytes- the row as it was last drawn
+        current: bytes- the row as it is now
+        gap: int- the fewest unchanged characters kept between two spans
+    Returns:
+        spans: List[tuple[int, int]]- start and end (exclusive) column of
+        each changed span
+    """
+    spans: List[tuple[int, int]] = []
+    if previous == current:
+        return spans
+    for col, (old, new) in enumerate(zip(previous, current)):
+        if old == new:
+            continue
+        if spans and col - spans[-1][1] < gap:
+            spans[-1] = (spans[-1][0], col + 1)
+        else:
+            spans.append((col, col + 1))
+    return spans
 
 
 class Terminal:
@@ -39,57 +333,278 @@ class Terminal:
     -----------
     width: int
         The width of the terminal (default is 80 columns).
-    screen: 2D list of str
-        A 2D list representing the terminal display, where each element is a 
-        row containing characters.
+    screen: list of bytearray
+        A list of rows representing the terminal display, where each row is
+        a preallocated bytearray holding one byte per character. Rows
+        changed directly rather than through the methods below are not seen
+        by present().
+    text_cells: Dict[int, Dict[int, str]]
+        The text of the cells added by add_character that do not fit in a
+        byte - anything but a single Latin-1 character - by row and column.
+        Their bytes in `screen` hold TEXT_CELL_BYTE.
+    max_fps: float | None
+        The highest rate at which present() draws frames, or None for no
+        limit.
+    frames: int
+        The number of frames drawn by present().
+    bytes_written: int
+        The total number of bytes written by present().
+    last_frame_bytes: int
+        The number of bytes written by the last call to present().
     Methods:
     --------
     add_character(row: int, col: int, char: str):
         Adds a character at the specified row and column position on the 
         screen. Automatically expands the screen height if the specified row 
         does not exist. Prints a message if the column is out of bounds.
+        Any string can be added, and is displayed as it was added.
+    write_string(row: int, col: int, text: str):
+        Writes a string starting at the specified row and column position in
+        a single slice assignment.
+    fill(row: int, col_start: int, col_end: int, char: str):
+        Fills the columns from col_start up to but not including col_end of
+        a row with a character.
+    blit(row: int, col: int, lines: Sequence[str]):
+        Writes a block of lines with its top left corner at the specified
+        row and column position.
     display():
-        Displays the current state of the terminal by printing all rows to
-        stdout.
+        Displays the current state of the terminal by writing all rows to
+        stdout in a single write.
+    present(stream: TextIO | Output):
+        Double-buffered display for animation - redraws only the characters
+        changed since the last frame using ANSI cursor positioning.
     reset():
         Resets the terminal display to its initial state, clearing all 
         characters and returning to a single empty row.
     """
-    def __init__(self, width: int=80) -> None:
+    def __init__(
+            self, width: int=80, height: int=1,
+            max_fps: Optional[float]=None
+            ) -> None:
         """ 
         Initializes a terminal with one row, containing 80 spaces by default.
+        More rows can be preallocated with `height`.
         """
         self.width = width
-        self.screen = [[' ' for _ in range(self.width)]]
+        self._blank_row = b" " * width
+        self.screen = [
+            bytearray(self._blank_row) for _ in range(max(1, height))
+            ]
+        self.max_fps = max_fps
+        self.frames = 0
+        self.bytes_written = 0
+        self.last_frame_bytes = 0
+        # Rows changed since the last frame and the screen as it was drawn
+        # by the last frame - None until the first frame
+        self._dirty_rows: Set[int] = set()
+        self._front: Optional[List[bytearray]] = None
+        self.text_cells: Dict[int, Dict[int, str]] = {}
+        # text_cells as drawn by the last frame
+        self._front_text_cells: Dict[int, Dict[int, str]] = {}
+        self._next_frame_time = 0.0
+
+    def _add_rows(self, row: int) -> None:
+        """
+        Adds blank rows to the terminal display until the specified row
+        exists.
+        """
+        if row >= len(self.screen):
+            self.screen.extend(
+                bytearray(self._blank_row)
+                for _ in range(row + 1 - len(self.screen))
+                )
 
     def add_character(self, row: int, col: int, char: str) -> None:
         """
         Adds a character to the specified row and column in the terminal 
         display, if within bounds, while adding new rows to the terminal 
-        as required.
+        as required. As before rows were held as bytes, any string can be
+        added to a cell - a string that is not a single Latin-1 character,
+        such as "\u2588", "" or "ab", is kept in text_cells and displayed
+        in place of the cell.
         """
-        while len(self.screen) <= row:
-            self.screen.append([' ' for _ in range(self.width)])
-        
+        self._add_rows(row)
+
         if 0 <= col < self.width:
-            self.screen[row][col] = char
+            if len(char) == 1 and ord(char) < 256:
+                self.screen[row][col] = ord(char)
+                if row in self.text_cells:
+                    self._clear_text_cells(row, col, col + 1)
+            else:
+                self.screen[row][col] = TEXT_CELL_BYTE
+                self.text_cells.setdefault(row, {})[col] = char
+            self._dirty_rows.add(row)
         else:
-            print(f"Column {col} is out of bounds")
+            print_text(f"Column {col} is out of bounds")
+
+    def write_string(self, row: int, col: int, text: str) -> None:
+        """
+        Writes a string to the specified row starting at the specified
+        column, adding new rows to the terminal as required. Any part of the
+        string outside the terminal is left out and a message printed.
+        """
+        self._add_rows(row)
+        data = text.encode("latin-1", "replace")
+        start = max(col, 0)
+        end = min(col + len(data), self.width)
+        if start < end:
+            self.screen[row][start:end] = data[start - col:end - col]
+            self._dirty_rows.add(row)
+            if row in self.text_cells:
+                self._clear_text_cells(row, start, end)
+        if start != col or end != col + len(data):
+            print_text(
+                f"Columns {col} to {col + len(data) - 1} are out of bounds"
+                )
+
+    def _clear_text_cells(self, row: int, start: int, end: int) -> None:
+        """
+        Forgets the text cells of a row from column start up to but not
+        including column end, once their bytes have been overwritten.
+        """
+        cells = self.text_cells[row]
+        for col in [col for col in cells if start <= col < end]:
+            del cells[col]
+        if not cells:
+            del self.text_cells[row]
+
+    def _row_text(self, row: int, start: int=0, end: int | None=None) -> str:
+        """
+        Returns the text of the columns from start up to but not including
+        end of a row, with each text cell in place of its byte.
+        """
+        current = self.screen[row]
+        if end is None:
+            end = len(current)
+        cells = self.text_cells.get(row)
+        if not cells:
+            return current[start:end].decode("latin-1")
+        return "".join(
+            cells[col] if col in cells else chr(current[col])
+            for col in range(start, end)
+            )
+
+    def fill(
+            self, row: int, col_start: int, col_end: int, char: str
+            ) -> None:
+        """
+        Fills the columns from col_start up to but not including col_end of
+        the specified row with a character.
+        """
+        self.write_string(row, col_start, char * (col_end - col_start))
+
+    def blit(self, row: int, col: int, lines: Sequence[str]) -> None:
+        """
+        Writes a block of lines to the terminal display with its top left
+        corner at the specified row and column.
+        """
+        for offset, line in enumerate(lines):
+            self.write_string(row + offset, col, line)
 
     def display(self) -> None:
         """
-        Displays the current state of the terminal by printing all rows to the 
-        standard output.
+        Displays the current state of the terminal by writing all rows to the 
+        game output in a single write.
+        """
+        if not self.text_cells:
+            get_output().write(
+                b"\n".join(self.screen).decode("latin-1") + "\n"
+                )
+            return
+        get_output().write(
+            "\n".join(map(self._row_text, range(len(self.screen)))) + "\n"
+            )
+
+    def present(self, stream: Optional[TextIO | Output]=None) -> int:
+        """
+        Double-buffered display for animation. The first frame clears the
+        console and draws the whole screen. Later frames compare each row
+        changed since the last frame with the row as it was drawn, and send
+        only the changed spans of characters, each after an ANSI escape
+        sequence moving the cursor to the start of the span. If max_fps is
+        set, waits until the next frame is due before drawing.
+        Args:
+            stream: TextIO | Output- stream to draw to, the game output by
+            default
+        Returns:
+            int: the number of bytes written for the frame
         """
-        for row in self.screen:
-            print("".join(row))
+        if stream is None:
+            stream = get_output()
+        if self.max_fps:
+            delay = self._next_frame_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_frame_time = time.monotonic() + 1 / self.max_fps
+
+        output = []
+        if self._front is None:
+            output.append("\x1b[H\x1b[2J")
+            self._front = []
+        front = self._front
+        front_text_cells = self._front_text_cells
+        for row in sorted(self._dirty_rows):
+            if row >= len(self.screen):
+                continue
+            current = self.screen[row]
+            previous = front[row] if row < len(front) else self._blank_row
+            spans = changed_spans(previous, current)
+            cells = self.text_cells.get(row, {})
+            drawn_cells = front_text_cells.get(row, {})
+            if cells or drawn_cells:
+                # A text cell changing keeps the same byte in the row, so
+                # each changed text cell not in a span is sent on its own
+                spans += [
+                    (col, col + 1)
+                    for col in sorted(cells.keys() | drawn_cells.keys())
+                    if cells.get(col) != drawn_cells.get(col)
+                    and not any(start <= col < end for start, end in spans)
+                    ]
+            for start, end in spans:
+                output.append(
+                    f"\x1b[{row + 1};{start + 1}H"
+                    + self._row_text(row, start, end)
+                    )
+        # Clear rows removed since the last frame
+        for row in range(len(self.screen), len(front)):
+            output.append(f"\x1b[{row + 1};1H\x1b[2K")
+        # Keep a copy of every drawn row as the new front buffer
+        del front[len(self.screen):]
+        for row in self._dirty_rows:
+            if row < len(front):
+                front[row][:] = self.screen[row]
+            if row in self.text_cells:
+                front_text_cells[row] = dict(self.text_cells[row])
+            else:
+                front_text_cells.pop(row, None)
+        for row in [
+                row for row in front_text_cells if row >= len(self.screen)
+                ]:
+            del front_text_cells[row]
+        front.extend(
+            bytearray(row) for row in self.screen[len(front):]
+            )
+        self._dirty_rows.clear()
+
+        # Leave the cursor below the screen
+        output.append(f"\x1b[{len(self.screen) + 1};1H")
+        frame = "".join(output)
+        stream.write(frame)
+        stream.flush()
+        frame_bytes = len(frame.encode("latin-1", "replace"))
+        self.frames += 1
+        self.bytes_written += frame_bytes
+        self.last_frame_bytes = frame_bytes
+        return frame_bytes
 
     def reset(self) -> None:
         """
         Resets the terminal display to its initial state, clearing all 
         characters and returning to a single empty row.
         """
-        self.screen = [[' ' for _ in range(self.width)]]
+        self.screen = [bytearray(self._blank_row)]
+        self.text_cells.clear()
+        self._dirty_rows.add(0)
 
 
 def create_2d_array(
@@ -115,22 +630,40 @@ def create_2d_array(
     return [[fill_value for _ in range(rows)] for _ in range(cols)]
 
 
-def print_tabbed_text(
+def format_tabbed_text(
         input_strings: Sequence[str], spacing: int=15, console_width: int=80
-        ) -> None:
-    """Prints left-aligned tabulated text with default spacing of 15 
-    characters.
+        ) -> str:
+    """Formats left-aligned tabulated text with default spacing of 15 
+    characters, as printed by print_tabbed_text.
     Args:
-        input_strings: List[str]- List of strings to be printed
+        input_strings: List[str]- List of strings to be tabulated
     Returns:
-        None
+        str: the tabulated text, ending with a newline
     """
     i = 0
     number_of_tabs = math.trunc(console_width / spacing)
+    cells = []
     for string in input_strings:
         i += 1
-        print(f"{string : <{spacing}}", end = "")
+        cells.append(f"{string : <{spacing}}")
         # Newline after required number of tabs
         if i % number_of_tabs == 0:
-            print()
-    print()
\ No newline at end of file
+            cells.append("\n")
+    cells.append("\n")
+    return "".join(cells)
+
+
+def print_tabbed_text(
+        input_strings: Sequence[str], spacing: int=15, console_width: int=80
+        ) -> None:
+    """Prints left-aligned tabulated text with default spacing of 15 
+    characters.
+    Args:
+        input_strings: List[str]- List of strings to be printed
+    Returns:
+        None
+    """
+    # Written as a single block rather than once per cell
+    print_text(
+        format_tabbed_text(input_strings, spacing, console_width), end = ""
+        )
@@ -0,0 +1,1087 @@
+import random
+from array import array
+from collections import namedtuple
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Maze engine for the "Amazing" BASIC game from the 1978 book BASIC Computer
+# Games by Creative Computing - the generation and rendering logic is kept at
+# module level so that it can be imported and used without the amazing.py
+# command line interface, e.g.
+#
+#   from maze import Maze, render_maze
+#   for line in render_maze(Maze(10, 20).generate()):
+#       print(line)
+
+# Original author is Jack Hauber of Windsor, Connecticut
+
+# Wall openings are stored as 4-bit flags, one byte per cell in a flat
+# row-major bytearray - a set bit means the wall on that side of the cell has
+# been knocked down. Openings are recorded in the cells on both sides of the
+# wall so that each cell can be rendered on its own.
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+
+# Opposite direction for each direction code, indexed by the code
+OPPOSITE = bytes([0, DOWN, UP, 0, RIGHT, 0, 0, 0, LEFT])
+
+
+def is_visited(visited: bytearray, cell: int) -> bool:
+    '''
+    Checks whether a cell has been marked in a visited bitset.
+    Args:
+        visited: bytearray - bitset holding one bit per maze cell
+        cell: int - flat row-major index of the cell
+    Returns:
+        True if the cell has been visited, otherwise False
+    '''
+    return bool(visited[cell >> 3] & (1 << (cell & 7)))
+
+
+def mark_visited(visited: bytearray, cell: int) -> None:
+    '''
+    Marks a cell as visited in a visited bitset.
+    Args:
+        visited: bytearray - bitset holding one bit per maze cell
+        cell: int - flat row-major index of the cell
+    Returns:
+        None
+    '''
+    visited[cell >> 3] |= 1 << (cell & 7)
+
+
+# Directions that can be chosen for every combination of direction flags,
+# indexed by the flags, so that choosing the next move allocates nothing
+DIRECTION_CHOICES = tuple(
+    tuple(
+        direction for direction in (UP, DOWN, LEFT, RIGHT)
+        if flags & direction
+        )
+    for flags in range(16)
+    )
+
+
+def direction_offsets(maze_width: int) -> List[int]:
+    '''
+    Builds a table converting direction codes into the change in flat cell
+    index.
+    Args:
+        maze_width: int - maze width
+    Returns:
+        offsets: list[int] - amount to add to a cell index to move in each
+        direction, indexed by direction code
+    '''
+    offsets = [0] * (RIGHT + 1)
+    offsets[UP] = -maze_width
+    offsets[DOWN] = maze_width
+    offsets[LEFT] = -1
+    offsets[RIGHT] = 1
+    return offsets
+
+
+def unvisited_directions(maze_width: int, maze_height: int) -> bytearray:
+    '''
+    Builds the initial direction flags of every cell leading to an
+    unvisited neighbour, which is every direction that stays inside the
+    maze.
+    Args:
+        maze_width: int - maze width
+        maze_height: int - maze height
+    Returns:
+        open_directions: bytearray - one byte of direction flags per cell
+    '''
+    row = bytearray([UP | DOWN | LEFT | RIGHT]) * maze_width
+    row[0] &= ~LEFT
+    row[-1] &= ~RIGHT
+    first_row = bytes(flags & ~UP for flags in row)
+    last_row = bytes(flags & ~DOWN for flags in row)
+    return bytearray(first_row) + row * (maze_height - 2) + last_row
+
+
+def close_cell(
+        open_directions: bytearray, cell: int, maze_width: int,
+        total_cells: int
+        ) -> None:
+    '''
+    Removes the directions leading into a newly visited cell from the flags
+    of its neighbours.
+    Args:
+        open_directions: bytearray - direction flags of every cell leading
+        to an unvisited neighbour
+        cell: int - flat row-major index of the newly visited cell
+        maze_width: int - maze width
+        total_cells: int - number of cells in the maze
+    Returns:
+        None
+    '''
+    if cell >= maze_width:
+        open_directions[cell - maze_width] &= ~DOWN
+    if cell + maze_width < total_cells:
+        open_directions[cell + maze_width] &= ~UP
+    col = cell % maze_width
+    if col > 0:
+        open_directions[cell - 1] &= ~RIGHT
+    if col < maze_width - 1:
+        open_directions[cell + 1] &= ~LEFT
+
+
+def neighbours(
+        cell: int, maze_width: int, maze_height: int
+        ) -> Iterator[tuple[int, int]]:
+    '''
+    Yields the cells adjacent to a cell along with the direction of each.
+    Args:
+        cell: int - flat row-major index of the cell
+        maze_width: int - maze width
+        maze_height: int - maze height
+    Returns:
+        Iterator[tuple[int, int]] - (direction, neighbouring cell) pairs
+    '''
+    row, col = divmod(cell, maze_width)
+    if row > 0:
+        yield UP, cell - maze_width
+    if row < maze_height - 1:
+        yield DOWN, cell + maze_width
+    if col > 0:
+        yield LEFT, cell - 1
+    if col < maze_width - 1:
+        yield RIGHT, cell + 1
+
+
+class CellSet:
+    """An unordered set of maze cells backed by arrays, supporting O(1)
+    add, remove and random choice.
+    Attributes:
+    -----------
+    cells: array of int
+        The cells in the set, in no particular order.
+    positions: array of int
+        The index of each maze cell in `cells`, or -1 if the cell is not in
+        the set.
+    Methods:
+    --------
+    add(cell: int):
+        Adds a cell to the set if it is not already present.
+    discard(cell: int):
+        Removes a cell from the set by swapping the last cell into its
+        place, if it is present.
+    choice(rng: random.Random):
+        Returns a random cell from the set.
+    """
+    def __init__(self, total_cells: int) -> None:
+        """
+        Initializes an empty set able to hold cells 0 to total_cells - 1.
+        """
+        self.cells = array("i")
+        self.positions = array("i", [-1]) * total_cells
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, cell: int) -> bool:
+        return self.positions[cell] >= 0
+
+    def add(self, cell: int) -> None:
+        """
+        Adds a cell to the set if it is not already present.
+        """
+        if self.positions[cell] < 0:
+            self.positions[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell: int) -> None:
+        """
+        Removes a cell from the set, if it is present, by moving the last
+        cell into the removed cell's position.
+        """
+        position = self.positions[cell]
+        if position < 0:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[position] = last
+            self.positions[last] = position
+        self.positions[cell] = -1
+
+    def choice(self, rng: random.Random) -> int:
+        """
+        Returns a random cell from the set.
+        """
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+def update_frontier(
+        frontier: CellSet, cell: int, visited: bytearray, maze_width: int,
+        maze_height: int
+        ) -> None:
+    '''
+    Updates the frontier after a cell has been visited - the cell is
+    removed and its unvisited neighbours are added.
+    Args:
+        frontier: CellSet - unvisited cells adjacent to visited cells
+        cell: int - flat row-major index of the newly visited cell
+        visited: bytearray - bitset of visited maze cells
+        maze_width: int - maze width
+        maze_height: int - maze height
+    Returns:
+        None
+    '''
+    frontier.discard(cell)
+    for _, neighbour in neighbours(cell, maze_width, maze_height):
+        if not is_visited(visited, neighbour):
+            frontier.add(neighbour)
+
+
+def visited_directions(
+        cell: int, visited: bytearray, maze_width: int, maze_height: int
+        ) -> int:
+    '''
+    Finds the directions from a cell that lead to visited neighbours.
+    Args:
+        cell: int - flat row-major index of the cell
+        visited: bytearray - bitset of visited maze cells
+        maze_width: int - maze width
+        maze_height: int - maze height
+    Returns:
+        flags: int - direction flags of the visited neighbours
+    '''
+    flags = 0
+    for direction, neighbour in neighbours(cell, maze_width, maze_height):
+        if is_visited(visited, neighbour):
+            flags |= direction
+    return flags
+
+
+def join_to_visited(
+        cell: int, maze_walls: bytearray, visited: bytearray,
+        offsets: List[int], maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> int:
+    '''
+    Knocks down the wall between an unvisited cell and a random visited
+    neighbour, and marks the cell as visited.
+    Args:
+        cell: int - flat row-major index of the unvisited cell
+        maze_walls: bytearray - wall openings of each cell as 4-bit flags
+        visited: bytearray - bitset of visited maze cells
+        offsets: list[int] - direction offsets from direction_offsets
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        direction: int - the side of the cell that was opened
+    '''
+    direction = rng.choice(DIRECTION_CHOICES[
+        visited_directions(cell, visited, maze_width, maze_height)
+        ])
+    maze_walls[cell] |= direction
+    maze_walls[cell + offsets[direction]] |= OPPOSITE[direction]
+    mark_visited(visited, cell)
+    return direction
+
+
+# Maze generation algorithms by name - each takes the flat index of the
+# starting cell, the wall flags to be carved, the maze width and height and
+# a random number generator, and returns the carved wall flags. Every
+# algorithm produces a perfect maze, with exactly one route between any two
+# cells, in the same wall state consumed by render_maze.
+MazeGenerator = Callable[
+    [int, bytearray, int, int, random.Random], bytearray
+    ]
+ALGORITHMS: Dict[str, MazeGenerator] = {}
+# Version of each algorithm - must be increased whenever a change to an
+# algorithm changes the maze generated for a given seed, so that mazes
+# cached by maze_cache.py are regenerated
+ALGORITHM_VERSIONS: Dict[str, int] = {}
+
+
+def register_algorithm(
+        name: str, version: int=1
+        ) -> Callable[[MazeGenerator], MazeGenerator]:
+    '''
+    Decorator adding a maze generation algorithm to ALGORITHMS.
+    Args:
+        name: str - name used to select the algorithm, e.g. with the
+        amazing.py --algorithm option
+        version: int - version of the algorithm's output for a given seed
+    Returns:
+        decorator: Callable - registers and returns the decorated function
+    '''
+    def decorator(generator: MazeGenerator) -> MazeGenerator:
+        ALGORITHMS[name] = generator
+        ALGORITHM_VERSIONS[name] = version
+        return generator
+    return decorator
+
+
+def dfs_moves(
+        cell: int, maze_walls: bytearray, maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> Iterator[int]:
+    '''
+    Carves a maze in place using a depth-first search (DFS) with
+    backtracking, yielding each move as it is made - the direction code
+    when a wall is knocked down to move into a new cell, and the negated
+    direction code popped from the path when stepping back. Each cell keeps
+    the flags of the directions leading to unvisited neighbours, updated as
+    cells are visited, so choosing the next move is a table lookup. The
+    path taken so far is held as a typed array of direction codes. As every
+    cell of the grid can be reached from the starting cell, the path only
+    runs out once every cell has been visited. Used by iter_maze_steps for
+    watched generation - generate_maze makes the same moves in a plain loop.
+    Args:
+        cell: int- flat row-major index of the starting cell
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        Iterator[int] - the moves made, in order
+    '''
+    total_cells = maze_width * maze_height
+    open_directions = unvisited_directions(maze_width, maze_height)
+    offsets = direction_offsets(maze_width)
+    last_row_start = total_cells - maze_width
+    last_col = maze_width - 1
+    maze_path = array("B")
+
+    # Close the entrance cell to its neighbours
+    close_cell(open_directions, cell, maze_width, total_cells)
+    counter: int = 1
+
+    while counter < total_cells:
+        flags = open_directions[cell]
+        if not flags:
+            # No available directions to move but the maze isn't finished
+            # yet, so step back along the path
+            direction = maze_path.pop()
+            cell -= offsets[direction]
+            yield -direction
+            continue
+
+        # Knock down the wall on both sides and move into the new cell
+        direction = rng.choice(DIRECTION_CHOICES[flags])
+        maze_walls[cell] |= direction
+        cell += offsets[direction]
+        maze_walls[cell] |= OPPOSITE[direction]
+        # Inlined close_cell, which dominates the loop
+        if cell >= maze_width:
+            open_directions[cell - maze_width] &= ~DOWN
+        if cell < last_row_start:
+            open_directions[cell + maze_width] &= ~UP
+        col = cell % maze_width
+        if col > 0:
+            open_directions[cell - 1] &= ~RIGHT
+        if col < last_col:
+            open_directions[cell + 1] &= ~LEFT
+        maze_path.append(direction)
+        counter += 1
+        yield direction
+
+
+@register_algorithm("dfs")
+def generate_maze(
+        cell: int, maze_walls: bytearray, maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> bytearray:
+    '''
+    Generates a maze using a depth-first search (DFS) algorithm with
+    backtracking. Makes the same moves as dfs_moves in a plain loop, so
+    that generating a maze nobody is watching pays nothing for a
+    generator - the two loops must be kept in step, as the same seed
+    carves the same maze with either.
+    Args:
+        cell: int- flat row-major index of the starting cell
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+    '''
+    total_cells = maze_width * maze_height
+    open_directions = unvisited_directions(maze_width, maze_height)
+    offsets = direction_offsets(maze_width)
+    last_row_start = total_cells - maze_width
+    last_col = maze_width - 1
+    maze_path = array("B")
+
+    # Close the entrance cell to its neighbours
+    close_cell(open_directions, cell, maze_width, total_cells)
+    counter: int = 1
+
+    while counter < total_cells:
+        flags = open_directions[cell]
+        if not flags:
+            # Step back along the path
+            cell -= offsets[maze_path.pop()]
+            continue
+
+        direction = rng.choice(DIRECTION_CHOICES[flags])
+        maze_walls[cell] |= direction
+        cell += offsets[direction]
+        maze_walls[cell] |= OPPOSITE[direction]
+        if cell >= maze_width:
+            open_directions[cell - maze_width] &= ~DOWN
+        if cell < last_row_start:
+            open_directions[cell + maze_width] &= ~UP
+        col = cell % maze_width
+        if col > 0:
+            open_directions[cell - 1] &= ~RIGHT
+        if col < last_col:
+            open_directions[cell + 1] &= ~LEFT
+        maze_path.append(direction)
+        counter += 1
+    return maze_walls
+
+
+# One step of maze generation reported by iter_maze_steps - kind is "carve"
+# when a wall is knocked down to move into a new cell and "backtrack" when
+# stepping back along the path. cell is the cell moved to, wall the side of
+# the cell whose wall was knocked down (0 when backtracking) and visited
+# the number of cells visited so far.
+MazeStep = namedtuple("MazeStep", "kind, cell, wall, visited")
+
+
+def iter_maze_steps(
+        cell: int, maze_walls: bytearray, maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> Iterator[MazeStep]:
+    '''
+    Generates a maze with the same depth-first search as generate_maze,
+    yielding a MazeStep after every move made by dfs_moves, for progress
+    reporting and animation. The same seed carves the same maze as
+    generate_maze. The maze is carved in place as the steps are taken, so
+    generation can be stopped at any point by no longer iterating.
+    Args:
+        cell: int- flat row-major index of the starting cell
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        Iterator[MazeStep] - the steps taken, in order
+    '''
+    offsets = direction_offsets(maze_width)
+    counter = 1
+    for move in dfs_moves(cell, maze_walls, maze_width, maze_height, rng):
+        if move > 0:
+            cell += offsets[move]
+            counter += 1
+            yield MazeStep("carve", cell, OPPOSITE[move], counter)
+        else:
+            cell -= offsets[-move]
+            yield MazeStep("backtrack", cell, 0, counter)
+
+
+def report_progress(
+        every: int, report: Callable[[int, int], None], total_cells: int
+        ) -> Callable[[MazeStep], None]:
+    '''
+    Builds an observer for Maze.generate that reports progress every
+    `every` cells visited.
+    Args:
+        every: int - number of cells visited between reports
+        report: Callable - called with the number of cells visited and the
+        total number of cells
+        total_cells: int - number of cells in the maze
+    Returns:
+        observer: Callable - observer to be passed to Maze.generate
+    '''
+    def observer(step: MazeStep) -> None:
+        if step.kind != "backtrack" and (
+                step.visited % every == 0 or step.visited == total_cells):
+            report(step.visited, total_cells)
+    return observer
+
+
+@register_algorithm("kruskal")
+def generate_maze_kruskal(
+        cell: int, maze_walls: bytearray, maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> bytearray:
+    '''
+    Generates a maze using randomized Kruskal's algorithm. Every internal
+    wall is visited once in random order and knocked down if the cells on
+    either side are not yet connected, tracked with a union-find forest held
+    in an array with path compression and union by size. Produces short
+    corridors with many dead ends and needs no path stack.
+    Args:
+        cell: int- flat row-major index of the starting cell (unused)
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+    '''
+    total_cells = maze_width * maze_height
+    parent = array("i", range(total_cells))
+    size = array("i", [1]) * total_cells
+
+    def find(cell: int) -> int:
+        # Path halving - every other cell on the way to the root is pointed
+        # at its grandparent
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    # Each wall is encoded as cell * 2 for the wall to the right of the cell
+    # and cell * 2 + 1 for the floor below it
+    last_col = maze_width - 1
+    walls = array("i", (
+        edge for edge in range(total_cells * 2)
+        if (edge & 1 and edge >> 1 < total_cells - maze_width)
+        or (not edge & 1 and (edge >> 1) % maze_width != last_col)
+        ))
+    rng.shuffle(walls)
+
+    joined = 1
+    for edge in walls:
+        cell = edge >> 1
+        if edge & 1:
+            direction, neighbour = DOWN, cell + maze_width
+        else:
+            direction, neighbour = RIGHT, cell + 1
+        root, other = find(cell), find(neighbour)
+        if root == other:
+            continue
+        if size[root] < size[other]:
+            root, other = other, root
+        parent[other] = root
+        size[root] += size[other]
+        maze_walls[cell] |= direction
+        maze_walls[neighbour] |= OPPOSITE[direction]
+        joined += 1
+        if joined == total_cells:
+            break
+    return maze_walls
+
+
+@register_algorithm("wilson")
+def generate_maze_wilson(
+        cell: int, maze_walls: bytearray, maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> bytearray:
+    '''
+    Generates a maze using Wilson's algorithm. Starting from a tree holding
+    only the starting cell, a random walk is taken from each cell not yet in
+    the tree until it hits the tree. Only the last direction taken out of
+    each cell is kept, which erases any loops in the walk, and the
+    loop-erased walk is then carved into the tree. Produces a uniformly
+    random maze, but the first walks can be long on large grids.
+    Args:
+        cell: int- flat row-major index of the starting cell
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+    '''
+    total_cells = maze_width * maze_height
+    in_tree = bytearray((total_cells + 7) >> 3)
+    # Directions that stay inside the maze from each cell
+    inside = unvisited_directions(maze_width, maze_height)
+    offsets = direction_offsets(maze_width)
+    walk = bytearray(total_cells)
+    mark_visited(in_tree, cell)
+
+    for start in range(total_cells):
+        if is_visited(in_tree, start):
+            continue
+        # Random walk until the tree is reached, remembering the last
+        # direction taken out of every cell
+        cell = start
+        while not is_visited(in_tree, cell):
+            direction = rng.choice(DIRECTION_CHOICES[inside[cell]])
+            walk[cell] = direction
+            cell += offsets[direction]
+        # Carve the loop-erased walk into the tree
+        cell = start
+        while not is_visited(in_tree, cell):
+            direction = walk[cell]
+            mark_visited(in_tree, cell)
+            maze_walls[cell] |= direction
+            cell += offsets[direction]
+            maze_walls[cell] |= OPPOSITE[direction]
+    return maze_walls
+
+
+@register_algorithm("prim")
+def generate_maze_prim(
+        cell: int, maze_walls: bytearray, maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> bytearray:
+    '''
+    Generates a maze using randomized Prim's algorithm. A random cell is
+    taken from the frontier of unvisited cells next to the maze and joined
+    to a random visited neighbour until every cell is visited. The frontier
+    is a CellSet, so each step is O(1), and no path stack is needed.
+    Args:
+        cell: int- flat row-major index of the starting cell
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+    '''
+    visited = bytearray((maze_width * maze_height + 7) >> 3)
+    offsets = direction_offsets(maze_width)
+    frontier = CellSet(maze_width * maze_height)
+    mark_visited(visited, cell)
+    update_frontier(frontier, cell, visited, maze_width, maze_height)
+
+    while frontier:
+        cell = frontier.choice(rng)
+        join_to_visited(
+            cell, maze_walls, visited, offsets, maze_width, maze_height, rng
+            )
+        update_frontier(frontier, cell, visited, maze_width, maze_height)
+    return maze_walls
+
+
+def eller_rows(
+        maze_width: int, maze_height: int, rng: random.Random
+        ) -> Iterator[bytearray]:
+    '''
+    Generates a maze one row at a time using Eller's algorithm. Each cell in
+    the current row belongs to a set of cells connected through the rows
+    above. Adjacent cells in different sets are joined at random, then at
+    least one cell of every set is opened downwards so that no set is cut
+    off. The last row joins every remaining set. Only O(width) state is
+    kept, with set labels renumbered below the width on every row so that a
+    union-find array the width of the maze can be reused.
+    Args:
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        Iterator[bytearray] - wall flags of each cell, one row at a time
+    '''
+    sets = array("i", range(maze_width))
+    parent = array("i", range(maze_width))
+    opened_down = bytearray(maze_width)
+
+    def find(label: int) -> int:
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    for row in range(maze_height):
+        last_row = row == maze_height - 1
+        cells = bytearray(UP if opened else 0 for opened in opened_down)
+
+        # Join adjacent cells in different sets - always on the last row
+        for col in range(maze_width - 1):
+            root, other = find(sets[col]), find(sets[col + 1])
+            if root != other and (last_row or rng.random() < 0.5):
+                parent[other] = root
+                cells[col] |= RIGHT
+                cells[col + 1] |= LEFT
+
+        if last_row:
+            yield cells
+            return
+
+        # Open cells downwards at random, choosing a random cell of every
+        # set that was not opened by reservoir sampling over its members
+        roots = array("i", (find(label) for label in sets))
+        has_down = bytearray(maze_width)
+        members = array("i", [0]) * maze_width
+        candidate = array("i", [0]) * maze_width
+        for col in range(maze_width):
+            root = roots[col]
+            members[root] += 1
+            if rng.randrange(members[root]) == 0:
+                candidate[root] = col
+            opened_down[col] = rng.random() < 0.5
+            has_down[root] |= opened_down[col]
+        for col in range(maze_width):
+            root = roots[col]
+            if not has_down[root]:
+                opened_down[candidate[root]] = 1
+                has_down[root] = 1
+        for col in range(maze_width):
+            if opened_down[col]:
+                cells[col] |= DOWN
+        yield cells
+
+        # Carry the sets of opened cells into the next row, renumbered from
+        # zero, and give every other cell a set of its own
+        remap = array("i", [-1]) * maze_width
+        next_label = 0
+        for col in range(maze_width):
+            if opened_down[col]:
+                root = roots[col]
+                if remap[root] < 0:
+                    remap[root] = next_label
+                    next_label += 1
+                sets[col] = remap[root]
+        for col in range(maze_width):
+            if not opened_down[col]:
+                sets[col] = next_label
+                next_label += 1
+        parent = array("i", range(maze_width))
+
+
+@register_algorithm("eller")
+def generate_maze_eller(
+        cell: int, maze_walls: bytearray, maze_width: int, maze_height: int,
+        rng: random.Random
+        ) -> bytearray:
+    '''
+    Generates a maze using Eller's algorithm, filling in the wall flags a
+    row at a time from eller_rows. Use stream_maze to render the rows as
+    they are generated without holding the whole maze.
+    Args:
+        cell: int- flat row-major index of the starting cell (unused)
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+        maze_width: int - maze width
+        maze_height: int - maze height
+        rng: random.Random - random number generator used for all choices
+    Returns:
+        maze_walls: bytearray- wall openings of each cell as 4-bit flags
+    '''
+    for row, cells in enumerate(eller_rows(maze_width, maze_height, rng)):
+        maze_walls[row * maze_width:(row + 1) * maze_width] = cells
+    return maze_walls
+
+
+class Maze:
+    """A randomly generated maze with an entrance in the first row and an
+    exit in the last row.
+    Attributes:
+    -----------
+    width: int
+        The number of columns in the maze.
+    height: int
+        The number of rows in the maze.
+    seed: int | None
+        The seed used for the maze's random number generator - the same
+        width, height, seed and algorithm always produce the same maze.
+    algorithm: str
+        The name of the generation algorithm in ALGORITHMS.
+    entrance_col: int
+        The column of the maze entrance in the first row (1-indexed).
+    exit_col: int
+        The column of the maze exit in the last row (1-indexed).
+    walls: bytearray
+        The maze wall state as one byte of UP/DOWN/LEFT/RIGHT opening flags
+        per cell, indexed row * width + col. Mazes loaded from a file are
+        given a read-only memoryview of the file instead.
+    Methods:
+    --------
+    generate(observer: Callable | None):
+        Carves the maze and returns the maze so that calls can be chained,
+        optionally calling an observer with every generation step.
+    steps():
+        Carves the maze, yielding every generation step.
+    """
+    def __init__(
+            self, width: int, height: int, seed: Optional[int]=None,
+            algorithm: str="dfs"
+            ) -> None:
+        """
+        Initializes an uncarved maze of the given size, choosing a random
+        entrance and exit column.
+        Raises:
+            ValueError: If `width` or `height` is less than or equal to 1,
+            or `algorithm` is not in ALGORITHMS.
+        """
+        if width <= 1 or height <= 1:
+            raise ValueError(
+                "Maze width and height must be integers greater than 1."
+                )
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown maze algorithm {algorithm!r}.")
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.algorithm = algorithm
+        self.rng = random.Random(seed)
+        # Choose a random starting column for the maze entrance
+        self.entrance_col: int = self.rng.randint(1, width)
+        # Choose a random column for the maze exit
+        self.exit_col: int = self.rng.randint(1, width)
+        self.walls = bytearray(width * height)
+
+    def generate(
+            self, observer: Optional[Callable[[MazeStep], None]]=None
+            ) -> "Maze":
+        """
+        Carves the maze starting from the entrance cell. If an observer is
+        given, it is called with every MazeStep taken - only the "dfs"
+        algorithm supports observers.
+        """
+        if observer is not None:
+            for step in self.steps():
+                observer(step)
+            return self
+        ALGORITHMS[self.algorithm](
+            self.entrance_col - 1, self.walls, self.width, self.height,
+            self.rng
+            )
+        return self
+
+    def steps(self) -> Iterator[MazeStep]:
+        """
+        Carves the maze step by step, yielding every MazeStep taken - only
+        the "dfs" algorithm supports steps.
+        Raises:
+            ValueError: If the maze's algorithm is not "dfs".
+        """
+        if self.algorithm != "dfs":
+            raise ValueError(
+                "Only the dfs algorithm can report generation steps."
+                )
+        return iter_maze_steps(
+            self.entrance_col - 1, self.walls, self.width, self.height,
+            self.rng
+            )
+
+
+def render_first_line(maze_width: int, entrance_col: int) -> str:
+    '''
+    Renders the first line of a maze, holding the entrance.
+    Args:
+        maze_width: int - maze width
+        entrance_col: int - column of the maze entrance (1-indexed)
+    Returns:
+        str - the first line of the rendered maze
+    '''
+    return "".join(
+        ".  " if col == entrance_col - 1 else ".--"
+        for col in range(maze_width)
+        ) + "."
+
+
+def render_row(
+        cells: bytes | bytearray, exit_col: Optional[int]=None,
+        solution: Optional[bytes | bytearray]=None
+        ) -> tuple[str, str]:
+    '''
+    Renders one row of a maze as a wall line ("|") and a floor line (":--").
+    Args:
+        cells: bytes - wall flags of each cell in the row
+        exit_col: int | None - column of the maze exit (1-indexed) if this
+        is the last row of the maze, otherwise None
+        solution: bytes | None - non-zero for each cell in the row on the
+        solution route, which is marked with a "*"
+    Returns:
+        tuple[str, str] - the wall line and the floor line of the row
+    '''
+    # Draw walls - the wall to the left of a cell is knocked down if the
+    # cell has been opened to the left
+    if solution is None:
+        line = ["   " if cell & LEFT else "|  " for cell in cells]
+    else:
+        line = [
+            ("  " if cell & LEFT else "| ") + ("*" if on_route else " ")
+            for cell, on_route in zip(cells, solution)
+            ]
+    line.append(" " if cells[-1] & RIGHT else "|")
+    wall_line = "".join(line)
+
+    # Draw floors - the floor below a cell is knocked down if the cell has
+    # been opened downwards
+    line = [":  " if cell & DOWN else ":--" for cell in cells]
+    if exit_col is None:
+        line.append(":")
+    else:
+        line[exit_col - 1] = ":  "
+        line.append(".")
+    return wall_line, "".join(line)
+
+
+def render_maze(
+        maze: Maze, solution: Optional[bytes | bytearray]=None
+        ) -> Iterator[str]:
+    '''
+    Renders a maze as text, yielding one line at a time so that large mazes
+    can be streamed to a file or socket without building the whole screen
+    in memory. The first line holds the entrance, followed by a wall line
+    ("|") and a floor line (":--") for every row of the maze, with the exit
+    in the last floor line.
+    Args:
+        maze: Maze - the generated maze to be rendered
+        solution: bytes | None - non-zero for each cell on a route to be
+        drawn into the maze, e.g. from maze_solver.solution_mask
+    Returns:
+        Iterator[str] - the lines of the rendered maze, without newlines
+    '''
+    width = maze.width
+    height = maze.height
+    walls = maze.walls
+
+    yield render_first_line(width, maze.entrance_col)
+    for row in range(height):
+        yield from render_row(
+            walls[row * width:(row + 1) * width],
+            maze.exit_col if row == height - 1 else None,
+            None if solution is None
+            else solution[row * width:(row + 1) * width]
+            )
+
+
+def stream_maze(
+        width: int, height: int, seed: Optional[int]=None
+        ) -> Iterator[str]:
+    '''
+    Generates and renders a maze row by row with Eller's algorithm, yielding
+    each line as soon as it is final. Only O(width) state is kept, so mazes
+    millions of rows tall can be streamed in constant memory. Produces the
+    same lines as render_maze for Maze(width, height, seed, "eller").
+    Args:
+        width: int - maze width
+        height: int - maze height
+        seed: int | None - seed for the random number generator
+    Returns:
+        Iterator[str] - the lines of the rendered maze, without newlines
+    Raises:
+        ValueError: If `width` or `height` is less than or equal to 1.
+    '''
+    if width <= 1 or height <= 1:
+        raise ValueError(
+            "Maze width and height must be integers greater than 1."
+            )
+    # Entrance and exit are chosen in the same order as Maze
+    rng = random.Random(seed)
+    entrance_col = rng.randint(1, width)
+    exit_col = rng.randint(1, width)
+
+    yield render_first_line(width, entrance_col)
+    for row, cells in enumerate(eller_rows(width, height, rng)):
+        yield from render_row(
+            cells, exit_col if row == height - 1 else None
+            )
+
+
+def render_maze_numpy(maze: Maze) -> bytes:
+    '''
+    Renders a whole maze as text in a few vectorized NumPy operations on a
+    uint8 character array, for writing to a file or stdout in a single
+    buffered write. Produces the same bytes as joining the lines from
+    render_maze with a newline after each line. NumPy is an optional
+    dependency and is only imported when this function is called.
+    Args:
+        maze: Maze - the generated maze to be rendered
+    Returns:
+        bytes - the rendered maze, with a newline after every line
+    Raises:
+        ImportError: If NumPy is not installed.
+    '''
+    import numpy as np
+
+    width = maze.width
+    height = maze.height
+    walls = np.frombuffer(maze.walls, dtype=np.uint8).reshape(height, width)
+    screen = np.full((height * 2 + 1, width * 3 + 2), ord(" "), np.uint8)
+    right = width * 3
+
+    # First row with the entrance
+    screen[0, 0:right:3] = ord(".")
+    screen[0, 1:right:3] = ord("-")
+    screen[0, 2:right:3] = ord("-")
+    screen[0, (maze.entrance_col - 1) * 3 + 1:maze.entrance_col * 3] = \
+        ord(" ")
+    screen[0, right] = ord(".")
+
+    # Wall rows - spaces are already in place where walls are knocked down
+    wall_rows = screen[1::2]
+    wall_rows[:, 0:right:3] = np.where(walls & LEFT, ord(" "), ord("|"))
+    wall_rows[:, right] = np.where(walls[:, -1] & RIGHT, ord(" "), ord("|"))
+
+    # Floor rows with the exit in the last row
+    floor_rows = screen[2::2]
+    floors = np.where(walls & DOWN, ord(" "), ord("-"))
+    floor_rows[:, 0:right:3] = ord(":")
+    floor_rows[:, 1:right:3] = floors
+    floor_rows[:, 2:right:3] = floors
+    floor_rows[:, right] = ord(":")
+    floor_rows[-1, (maze.exit_col - 1) * 3 + 1:maze.exit_col * 3] = ord(" ")
+    floor_rows[-1, right] = ord(".")
+
+    screen[:, -1] = ord("\n")
+    return screen.tobytes()
+
+
+def derive_seed(master_seed: int, index: int) -> int:
+    '''
+    Derives an independent 64-bit seed for one maze in a batch from the
+    batch's master seed, so that every maze gets its own random stream and
+    the batch is reproducible however it is split between workers.
+    Args:
+        master_seed: int - seed for the whole batch
+        index: int - position of the maze in the batch
+    Returns:
+        seed: int - seed for the maze at `index`
+    '''
+    # Imported here as it is only needed in batch mode
+    import hashlib
+
+    digest = hashlib.sha256(f"{master_seed}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def _render_batch_maze(
+        job: tuple[int, int, int, int, str, bool]
+        ) -> tuple[int, int, str]:
+    '''
+    Generates and renders one maze of a batch - run in the worker processes.
+    Args:
+        job: tuple - index, seed, width, height, algorithm and whether to
+        render with NumPy
+    Returns:
+        tuple[int, int, str] - index, seed and rendered text of the maze
+    '''
+    index, seed, width, height, algorithm, use_numpy = job
+    maze = Maze(width, height, seed, algorithm).generate()
+    if use_numpy:
+        text = render_maze_numpy(maze).decode("ascii")
+    else:
+        text = "".join(line + "\n" for line in render_maze(maze))
+    return index, seed, text
+
+
+def generate_batch(
+        width: int, height: int, count: int, master_seed: int,
+        workers: int=1, algorithm: str="dfs", use_numpy: bool=False
+        ) -> Iterator[tuple[int, int, str]]:
+    '''
+    Generates and renders a batch of mazes, optionally across a pool of
+    worker processes. Each maze is seeded with derive_seed so that the
+    output for a given master seed is the same for any number of workers,
+    and mazes are yielded in index order.
+    Args:
+        width: int - maze width
+        height: int - maze height
+        count: int - number of mazes to generate
+        master_seed: int - seed for the whole batch
+        workers: int - number of worker processes, 1 to run in this process
+        algorithm: str - name of the generation algorithm in ALGORITHMS
+        use_numpy: bool - render with render_maze_numpy instead of
+        render_maze
+    Returns:
+        Iterator[tuple[int, int, str]] - index, seed and rendered text of
+        each maze
+    '''
+    jobs = (
+        (
+            index, derive_seed(master_seed, index), width, height,
+            algorithm, use_numpy
+            )
+        for index in range(count)
+        )
+    if workers <= 1:
+        yield from map(_render_batch_maze, jobs)
+        return
+    from multiprocessing import Pool
+    # Hand out several mazes at a time to keep inter-process traffic down
+    chunksize = max(1, min(64, count // (workers * 4)))
+    with Pool(workers) as pool:
+        yield from pool.imap(_render_batch_maze, jobs, chunksize)
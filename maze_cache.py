@@ -0,0 +1,182 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from typing import Optional
+
+from maze import ALGORITHM_VERSIONS, Maze
+
+# On-disk cache of generated mazes for maze.py. Each maze is stored in its
+# own file, named by a hash of its width, height, seed, algorithm and
+# algorithm version, holding a small header followed by the wall flags. A
+# cache hit memory-maps the file and uses the wall flags in place, so
+# generate_maze is skipped and only the pages that are rendered are read.
+# The cache is kept under a size limit by removing the least recently used
+# files, with each file's modification time used as its last use.
+#
+#   from maze_cache import MazeCache
+#   cache = MazeCache("maze-cache")
+#   maze = cache.get_or_generate(100, 100, seed=42)
+
+# Magic bytes, width, height, entrance column and exit column
+HEADER = struct.Struct("<4sIIII")
+MAGIC = b"MZC1"
+SUFFIX = ".mzc"
+
+
+class MazeCache:
+    """A size-bounded, least recently used cache of generated mazes in a
+    directory.
+    Attributes:
+    -----------
+    directory: str
+        The directory holding the cached mazes.
+    max_bytes: int
+        The largest total size of the cached mazes before the least
+        recently used are removed.
+    Methods:
+    --------
+    get(width: int, height: int, seed: int, algorithm: str):
+        Returns the cached maze, or None if it is not in the cache or its
+        file is corrupt.
+    put(maze: Maze):
+        Adds a generated maze to the cache.
+    discard(path: str):
+        Removes a cache file.
+    get_or_generate(width: int, height: int, seed: int, algorithm: str):
+        Returns the cached maze, generating and caching it if needed.
+    """
+    def __init__(self, directory: str, max_bytes: int=256 * 2**20) -> None:
+        """
+        Initializes a cache in the given directory, creating it if needed.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(
+            self, width: int, height: int, seed: int, algorithm: str
+            ) -> str:
+        """
+        Returns the path of the cache file for a maze.
+        """
+        key = (
+            f"{width}x{height}:{seed}:{algorithm}:"
+            f"{ALGORITHM_VERSIONS[algorithm]}"
+            )
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, name + SUFFIX)
+
+    def get(
+            self, width: int, height: int, seed: int, algorithm: str="dfs"
+            ) -> Optional[Maze]:
+        """
+        Returns the cached maze with its wall flags memory-mapped from the
+        cache file, or None if the maze is not in the cache. A cache file
+        that is truncated or does not match the maze is removed.
+        """
+        path = self.path(width, height, seed, algorithm)
+        try:
+            with open(path, "rb") as cache_file:
+                mapped = mmap.mmap(
+                    cache_file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # An empty file cannot be mapped
+            self.discard(path)
+            return None
+        maze = Maze(width, height, seed, algorithm)
+        magic, header = None, None
+        if len(mapped) >= HEADER.size:
+            try:
+                magic, *header = HEADER.unpack_from(mapped)
+            except struct.error:
+                pass
+        if magic != MAGIC or \
+                len(mapped) != HEADER.size + width * height or \
+                header != [width, height, maze.entrance_col, maze.exit_col]:
+            # A truncated or corrupt file is removed, so that the maze is
+            # generated and cached again
+            mapped.close()
+            self.discard(path)
+            return None
+        # The memoryview keeps the mapping open for as long as the maze
+        # uses it
+        maze.walls = memoryview(mapped)[HEADER.size:]
+        # Mark the file as recently used
+        os.utime(path)
+        return maze
+
+    def put(self, maze: Maze) -> None:
+        """
+        Adds a generated maze to the cache, then removes the least recently
+        used mazes if the cache is over its size limit.
+        Raises:
+            ValueError: If the maze has no seed, so cannot be regenerated.
+        """
+        if maze.seed is None:
+            raise ValueError("Only seeded mazes can be cached.")
+        path = self.path(maze.width, maze.height, maze.seed, maze.algorithm)
+        # Write to a temporary file first so that readers never see a
+        # partly written maze
+        handle, temporary_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+            )
+        with os.fdopen(handle, "wb") as cache_file:
+            cache_file.write(HEADER.pack(
+                MAGIC, maze.width, maze.height, maze.entrance_col,
+                maze.exit_col
+                ))
+            cache_file.write(maze.walls)
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def discard(self, path: str) -> None:
+        """
+        Removes a cache file, if it still exists.
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def get_or_generate(
+            self, width: int, height: int, seed: int, algorithm: str="dfs"
+            ) -> Maze:
+        """
+        Returns the cached maze, or generates the maze and adds it to the
+        cache if it is not already cached.
+        """
+        maze = self.get(width, height, seed, algorithm)
+        if maze is None:
+            maze = Maze(width, height, seed, algorithm).generate()
+            self.put(maze)
+        return maze
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used mazes until the cache is within its
+        size limit.
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(SUFFIX):
+                    stat = entry.stat()
+                    entries.append(
+                        (stat.st_mtime_ns, stat.st_size, entry.path)
+                        )
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,212 @@
+import mmap
+import struct
+from typing import Iterator
+
+from maze import DOWN, UP, Maze, render_row
+
+# Compact binary file format for mazes generated by maze.py. A file holds a
+# 32-byte little-endian header followed by the wall flags of every cell in
+# row-major order, packed two cells to a byte with the first cell of each
+# pair in the low nibble - a little under half a byte per cell, compared
+# with about six characters per cell as text.
+#
+#   offset  size  field
+#        0     4  magic b"MAZE"
+#        4     1  format version
+#        5     1  flags - bit 0 is set if the seed is stored
+#        6     2  reserved
+#        8     4  width
+#       12     4  height
+#       16     4  entrance column (1-indexed)
+#       20     4  exit column (1-indexed)
+#       24     8  seed
+#
+# render_viewport memory-maps a file and reads only the bytes of the rows
+# and columns it renders, so a small window of a huge maze can be shown
+# without reading the rest of the file.
+
+HEADER = struct.Struct("<4sBBHIIIIQ")
+MAGIC = b"MAZE"
+VERSION = 1
+HAS_SEED = 1
+
+# Translation tables splitting packed bytes into their low and high nibbles
+LOW_NIBBLES = bytes(value & 0x0F for value in range(256))
+HIGH_NIBBLES = bytes(value >> 4 for value in range(256))
+
+
+def pack_walls(walls: bytes | bytearray | memoryview) -> bytes:
+    '''
+    Packs one byte of wall flags per cell into two cells per byte.
+    Args:
+        walls: bytes - wall flags of each cell in row-major order
+    Returns:
+        packed: bytes - the flags packed with the first cell of each pair in
+        the low nibble
+    '''
+    walls = bytes(walls)
+    if len(walls) % 2:
+        walls += b"\x00"
+    # Shift every odd cell into the high nibble of its pair with whole-buffer
+    # integer arithmetic rather than a Python loop
+    low = int.from_bytes(walls[0::2], "little")
+    high = int.from_bytes(walls[1::2], "little") << 4
+    return (low | high).to_bytes(len(walls) // 2, "little")
+
+
+def unpack_walls(packed: bytes, cells: int) -> bytearray:
+    '''
+    Unpacks wall flags packed two cells to a byte.
+    Args:
+        packed: bytes - packed wall flags
+        cells: int - number of cells to unpack
+    Returns:
+        walls: bytearray - wall flags of each cell in row-major order
+    '''
+    walls = bytearray(len(packed) * 2)
+    walls[0::2] = packed.translate(LOW_NIBBLES)
+    walls[1::2] = packed.translate(HIGH_NIBBLES)
+    del walls[cells:]
+    return walls
+
+
+def save_maze(maze: Maze, path: str) -> None:
+    '''
+    Saves a generated maze to a file in the binary maze format. The seed is
+    only stored if it fits in an unsigned 64-bit integer.
+    Args:
+        maze: Maze - the generated maze to be saved
+        path: str - path of the file to write
+    Returns:
+        None
+    '''
+    has_seed = maze.seed is not None and 0 <= maze.seed < 2**64
+    header = HEADER.pack(
+        MAGIC, VERSION, HAS_SEED if has_seed else 0, 0, maze.width,
+        maze.height, maze.entrance_col, maze.exit_col,
+        maze.seed if has_seed else 0
+        )
+    with open(path, "wb") as maze_file:
+        maze_file.write(header)
+        maze_file.write(pack_walls(maze.walls))
+
+
+def read_header(
+        data: bytes | mmap.mmap
+        ) -> tuple[int, int, int, int, int | None]:
+    '''
+    Reads and checks the header of a maze file.
+    Args:
+        data: bytes | mmap - contents of the maze file
+    Returns:
+        tuple - width, height, entrance column, exit column and seed (None
+        if no seed is stored)
+    Raises:
+        ValueError: If the data is not a maze file of a supported version.
+    '''
+    if len(data) < HEADER.size:
+        raise ValueError("Not a maze file - the header is incomplete.")
+    (magic, version, flags, _, width, height, entrance_col, exit_col,
+     seed) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a maze file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported maze file version {version}.")
+    if len(data) < HEADER.size + (width * height + 1) // 2:
+        raise ValueError("The maze file is truncated.")
+    return (
+        width, height, entrance_col, exit_col,
+        seed if flags & HAS_SEED else None
+        )
+
+
+def load_maze(path: str) -> Maze:
+    '''
+    Loads a maze from a file in the binary maze format.
+    Args:
+        path: str - path of the file to read
+    Returns:
+        maze: Maze - the loaded maze
+    Raises:
+        ValueError: If the file is not a maze file of a supported version.
+    '''
+    with open(path, "rb") as maze_file:
+        data = maze_file.read()
+    width, height, entrance_col, exit_col, seed = read_header(data)
+    maze = Maze(width, height, seed)
+    maze.entrance_col = entrance_col
+    maze.exit_col = exit_col
+    maze.walls = unpack_walls(
+        data[HEADER.size:HEADER.size + (width * height + 1) // 2],
+        width * height
+        )
+    return maze
+
+
+def render_viewport(
+        path: str, row: int, col: int, height: int, width: int
+        ) -> Iterator[str]:
+    '''
+    Renders a window of a maze file as text, reading only the packed cells
+    inside the window from a memory map of the file. The lines are the
+    same as the matching part of the render_maze output - the first line is
+    the floor of the row above the window, or the entrance line if the
+    window starts at the first row.
+    Args:
+        path: str - path of the maze file
+        row: int - first row of the window (1-indexed)
+        col: int - first column of the window (1-indexed)
+        height: int - number of rows in the window
+        width: int - number of columns in the window
+    Returns:
+        Iterator[str] - the lines of the rendered window, without newlines
+    Raises:
+        ValueError: If the file is not a maze file or the window is not
+        inside the maze.
+    '''
+    with open(path, "rb") as maze_file, \
+            mmap.mmap(maze_file.fileno(), 0, access=mmap.ACCESS_READ) \
+            as data:
+        maze_width, maze_height, entrance_col, exit_col, _ = \
+            read_header(data)
+        if not (1 <= row and 1 <= col and height >= 1 and width >= 1
+                and row + height - 1 <= maze_height
+                and col + width - 1 <= maze_width):
+            raise ValueError(
+                f"The viewport is not inside the {maze_width}x{maze_height}"
+                " maze."
+                )
+        first_col = col - 1
+        right_edge = col + width - 1 == maze_width
+
+        def read_row(maze_row: int) -> bytearray:
+            # Unpack only the bytes holding the window's cells in this row
+            first = maze_row * maze_width + first_col
+            start = HEADER.size + first // 2
+            end = HEADER.size + (first + width + 1) // 2
+            cells = unpack_walls(data[start:end], (end - start) * 2)
+            return cells[first % 2:first % 2 + width]
+
+        if row == 1:
+            yield "".join(
+                ".  " if window_col == entrance_col - 1 else ".--"
+                for window_col in range(first_col, first_col + width)
+                ) + "."
+        else:
+            yield "".join(
+                ":  " if cell & UP else ":--" for cell in read_row(row - 1)
+                ) + ":"
+
+        for maze_row in range(row - 1, row - 1 + height):
+            wall_line, floor_line = render_row(read_row(maze_row))
+            if maze_row == maze_height - 1:
+                # Draw the exit and the bottom right corner of the maze if
+                # they are inside the window
+                exit_offset = (exit_col - 1 - first_col) * 3
+                if 0 <= exit_offset < width * 3:
+                    floor_line = floor_line[:exit_offset] + ":  " + \
+                        floor_line[exit_offset + 3:]
+                if right_edge:
+                    floor_line = floor_line[:-1] + "."
+            yield wall_line
+            yield floor_line
@@ -0,0 +1,200 @@
+from array import array
+
+from maze import DOWN, LEFT, OPPOSITE, RIGHT, UP, Maze
+
+# Maze solver for mazes generated by maze.py - finds the route from the
+# entrance in the first row to the exit in the last row with a breadth-first
+# search over the wall flags. The search keeps its queue and the direction
+# back to each cell's parent in flat arrays rather than recursing, so mazes
+# of millions of cells can be solved without hitting the recursion limit,
+# and finds each cell's open neighbours with a single table lookup on its
+# wall byte.
+#
+#   from maze import Maze, render_maze
+#   from maze_solver import solve_maze, solution_mask
+#   maze = Maze(10, 20).generate()
+#   path = solve_maze(maze)
+#   for line in render_maze(maze, solution_mask(maze, path)):
+#       print(line)
+
+
+def entrance_cell(maze: Maze) -> int:
+    '''
+    Finds the cell below the maze entrance.
+    Args:
+        maze: Maze - the generated maze
+    Returns:
+        cell: int - flat row-major index of the entrance cell
+    '''
+    return maze.entrance_col - 1
+
+
+def exit_cell(maze: Maze) -> int:
+    '''
+    Finds the cell above the maze exit.
+    Args:
+        maze: Maze - the generated maze
+    Returns:
+        cell: int - flat row-major index of the exit cell
+    '''
+    return (maze.height - 1) * maze.width + maze.exit_col - 1
+
+
+def neighbour_moves(width: int) -> list[tuple[tuple[int, int], ...]]:
+    '''
+    Builds the moves out of a cell for every combination of wall opening
+    flags, so that a search finds a cell's open neighbours with one lookup
+    on its wall byte rather than testing each direction.
+    Args:
+        width: int - maze width
+    Returns:
+        moves: list - indexed by the opening flags, the offset to each open
+        neighbour and the direction back from that neighbour to the cell
+    '''
+    steps = ((UP, -width), (DOWN, width), (LEFT, -1), (RIGHT, 1))
+    return [
+        tuple(
+            (offset, OPPOSITE[direction]) for direction, offset in steps
+            if flags & direction
+            )
+        for flags in range(16)
+        ]
+
+
+def _trace(
+        cell: int, came_from: bytearray, start: int, width: int
+        ) -> array:
+    '''
+    Follows the directions in `came_from` from a cell back to the start of
+    the search.
+    Args:
+        cell: int - flat row-major index of the cell to trace back from
+        came_from: bytearray - direction back to the parent of each cell
+        start: int - flat row-major index of the start of the search
+        width: int - maze width
+    Returns:
+        path: array of int - the cells from `cell` back to `start`
+    '''
+    offsets = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+    path = array("i", [cell])
+    while cell != start:
+        cell += offsets[came_from[cell]]
+        path.append(cell)
+    return path
+
+
+def solve_maze(maze: Maze, bidirectional: bool=False) -> array:
+    '''
+    Finds the shortest route from the maze entrance to the maze exit with a
+    breadth-first search. The bidirectional search grows one level at a
+    time from both ends, always from the smaller frontier, and stops when
+    the two searches meet. A generated maze has a single route between any
+    two cells, which neither search can find without exploring the dead
+    ends on the way, and the bidirectional search measured about twice as
+    slow as the one-way search on such mazes - it is kept to cross-check
+    the one-way search.
+    Args:
+        maze: Maze - the generated maze
+        bidirectional: bool - search from both ends at once
+    Returns:
+        path: array of int - flat row-major indexes of the cells on the
+        route, from the entrance cell to the exit cell
+    Raises:
+        ValueError: If the exit cannot be reached from the entrance.
+    '''
+    start = entrance_cell(maze)
+    goal = exit_cell(maze)
+    if bidirectional:
+        return _solve_bidirectional(maze, start, goal)
+
+    width = maze.width
+    walls = maze.walls
+    moves = neighbour_moves(width)
+    came_from = bytearray(width * maze.height)
+    # Any non-zero value marks the start as reached
+    came_from[start] = UP
+    queue = array("i", [start])
+    append = queue.append
+    # Iterating over the array visits the cells appended during the loop,
+    # so the queue needs no head index
+    for cell in queue:
+        if cell == goal:
+            path = _trace(goal, came_from, start, width)
+            path.reverse()
+            return path
+        for offset, back in moves[walls[cell]]:
+            neighbour = cell + offset
+            if not came_from[neighbour]:
+                came_from[neighbour] = back
+                append(neighbour)
+    raise ValueError("The maze exit cannot be reached from the entrance.")
+
+
+def _solve_bidirectional(maze: Maze, start: int, goal: int) -> array:
+    '''
+    Bidirectional breadth-first search used by solve_maze.
+    Args:
+        maze: Maze - the generated maze
+        start: int - flat row-major index of the entrance cell
+        goal: int - flat row-major index of the exit cell
+    Returns:
+        path: array of int - the cells on the route from start to goal
+    Raises:
+        ValueError: If the exit cannot be reached from the entrance.
+    '''
+    width = maze.width
+    walls = maze.walls
+    moves = neighbour_moves(width)
+    total_cells = width * maze.height
+    if start == goal:
+        return array("i", [start])
+
+    # One search from each end, each with its own queue and directions
+    searches = []
+    for origin in (start, goal):
+        came_from = bytearray(total_cells)
+        came_from[origin] = UP
+        # [came_from, queue, head]
+        searches.append([came_from, array("i", [origin]), 0])
+
+    while all(search[2] < len(search[1]) for search in searches):
+        # Grow the smaller frontier by one whole level
+        forward = len(searches[0][1]) - searches[0][2] <= \
+            len(searches[1][1]) - searches[1][2]
+        search, other = (searches if forward else searches[::-1])
+        came_from, queue, head = search
+        other_came_from = other[0]
+        level_end = len(queue)
+        append = queue.append
+        while head < level_end:
+            cell = queue[head]
+            head += 1
+            if other_came_from[cell]:
+                # The searches have met - join the two halves of the route
+                from_start = _trace(cell, searches[0][0], start, width)
+                from_start.reverse()
+                to_goal = _trace(cell, searches[1][0], goal, width)
+                return from_start + to_goal[1:]
+            for offset, back in moves[walls[cell]]:
+                neighbour = cell + offset
+                if not came_from[neighbour]:
+                    came_from[neighbour] = back
+                    append(neighbour)
+        search[2] = head
+    raise ValueError("The maze exit cannot be reached from the entrance.")
+
+
+def solution_mask(maze: Maze, path: array) -> bytearray:
+    '''
+    Converts a route through the maze into a mask for render_maze.
+    Args:
+        maze: Maze - the generated maze
+        path: array of int - flat row-major indexes of the cells on the
+        route
+    Returns:
+        mask: bytearray - 1 for each cell on the route, otherwise 0
+    '''
+    mask = bytearray(maze.width * maze.height)
+    for cell in path:
+        mask[cell] = 1
+    return mask
@@ -0,0 +1,70 @@
+import functools
+import random
+
+import aceyducey
+from aceyducey import AceyDuceyGame, STARTING_MONEY
+from helpers import CLEAR_SEQUENCE, MemorySink, redirect_output
+
+# Checks on the Acey Ducey state machine - a scripted game with a seeded
+# deck plays every kind of bet, and the console game prints the same
+# transcript for the same input.
+
+# usage: python -m pytest test_aceyducey.py
+
+SEED = 3
+
+# A bet that is not a number, CHICKEN!!, a bet of too much, a negative bet,
+# a win of 100 dollars, a loss of all 200, and the answers to TRY AGAIN
+SCRIPT = ["X", "0", "500", "-5", "100", "200", "MAYBE", "NO"]
+
+
+def play(game: AceyDuceyGame, lines) -> str:
+    """Plays lines of input and returns the transcript of the game."""
+    transcript = [game.start()]
+    for line in lines:
+        transcript.append(game.send(line))
+    return "".join(transcript)
+
+
+def test_scripted_game():
+    game = AceyDuceyGame(random.Random(SEED))
+    transcript = play(game, SCRIPT)
+    assert game.finished
+    assert game.current_money == 0
+    assert transcript.count("CHICKEN!!\n") == 1
+    assert transcript.count(
+        "SORRY, MY FRIEND, BUT YOU BET TOO MUCH.\n"
+        "YOU ONLY HAVE 100 DOLLARS LEFT TO BET.\n"
+        ) == 1
+    assert "YOU WIN!!!\n\nYOU NOW HAVE 200 DOLLARS\n" in transcript
+    assert transcript.endswith(
+        "SORRY, YOU LOSE\n\n\nSORRY, FRIEND, BUT YOU BLEW YOUR WAD.\n\n\n"
+        "TRY AGAIN (YES OR NO)\n\n\nTRY AGAIN (YES OR NO)\n"
+        "\n\nO.K., HOPE YOU HAD FUN!\n"
+        )
+    # The same seed deals the same cards
+    assert play(AceyDuceyGame(random.Random(SEED)), SCRIPT) == transcript
+
+
+def test_try_again_restores_money():
+    game = AceyDuceyGame(random.Random(SEED))
+    play(game, SCRIPT[:6])
+    assert game.state == "try_again"
+    assert game.send("YES").startswith(
+        f"\n\nYOU NOW HAVE {STARTING_MONEY} DOLLARS\n"
+        )
+    assert (game.state, game.current_money) == ("bet", STARTING_MONEY)
+
+
+def test_console_game_matches_state_machine(monkeypatch):
+    expected = play(AceyDuceyGame(random.Random(SEED)), SCRIPT)
+    lines = iter(SCRIPT)
+    monkeypatch.setattr("builtins.input", lambda: next(lines))
+    monkeypatch.setattr("sys.argv", ["aceyducey.py"])
+    monkeypatch.setattr(
+        aceyducey, "AceyDuceyGame",
+        functools.partial(AceyDuceyGame, random.Random(SEED)),
+        )
+    with redirect_output(MemorySink()) as sink:
+        aceyducey.main()
+    assert sink.getvalue() == CLEAR_SEQUENCE + expected
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from aceyducey_ruin import build_chain, solve_chain
+from aceyducey_sim import parse_strategy
+
+# Checks on the exact ruin solver - BiCGSTAB agrees with the banded direct
+# solver on chains wide enough to use its coarse grid, and the banded solver
+# gives probabilities summing to 1 for a strategy that always bets.
+
+# usage: python -m pytest test_aceyducey_ruin.py
+
+
+@pytest.mark.parametrize("spec", ["fraction:0.1", "kelly:0.5"])
+def test_bicgstab_matches_banded(spec):
+    chain = build_chain(parse_strategy(spec), 5000)
+    banded = solve_chain(chain, "banded")
+    iterative = solve_chain(chain, "bicgstab")
+    assert iterative.method == "bicgstab" and iterative.iterations > 0
+    np.testing.assert_allclose(iterative.ruin, banded.ruin, atol=1e-9)
+    np.testing.assert_allclose(iterative.target, banded.target, atol=1e-9)
+    np.testing.assert_array_equal(
+        np.isinf(iterative.expected_hands), np.isinf(banded.expected_hands)
+        )
+    finite = np.isfinite(banded.expected_hands)
+    np.testing.assert_allclose(
+        iterative.expected_hands[finite], banded.expected_hands[finite],
+        rtol=1e-8,
+        )
+
+
+def test_flat_bet_ends_in_ruin_or_target():
+    chain = build_chain(parse_strategy("flat:10"), 1000)
+    result = solve_chain(chain)
+    assert result.method == "banded"
+    np.testing.assert_allclose(result.ruin + result.target, 1, atol=1e-12)
+    assert np.isfinite(result.expected_hands).all()
@@ -0,0 +1,86 @@
+import animal
+from animal import THINKING_PROMPT, AnimalGame
+from animal_store import AnimalStore
+from animal_tree import AnimalTree
+from helpers import (
+    CLEAR_SEQUENCE, MemorySink, format_tabbed_text, redirect_output,
+    )
+
+# Checks on the Animal state machine - a scripted game lists the animals,
+# learns one, guesses it, refuses one it knows and ends, and the console
+# game prints the same transcript for the same input and saves the animal
+# learned to its store.
+
+# usage: python -m pytest test_animal.py
+
+# A LIST, a new animal learned, then guessed after an answer that is not
+# recognised, an animal already known, and a LIST showing the new animal
+SCRIPT = [
+    "LIST",
+    "YES", "YES", "NO", "WHALE", "IS IT A MAMMAL", "YES",
+    "Y", "Y", "MAYBE", "Y", "Y",
+    "YES", "N", "N", "FISH",
+    "LIST", "NO",
+    ]
+
+# The end of start() and the reply to each line of SCRIPT
+TRANSCRIPT = [
+    THINKING_PROMPT,
+    "ANIMALS I ALREADY KNOW ARE:\n" + format_tabbed_text(["BIRD", "FISH"])
+    + THINKING_PROMPT,
+    "DOES IT SWIM?\n",
+    "IS IT A FISH?\n",
+    "THE ANIMAL YOU WERE THINKING OF WAS A?\n",
+    "PLEASE TYPE IN A QUESTION TO DISTINGUISH A WHALE FROM A FISH?\n",
+    "FOR A WHALE THE ANSWER WOULD BE?\n",
+    THINKING_PROMPT,
+    "DOES IT SWIM?\n",
+    "IS IT A MAMMAL?\n",
+    "IS IT A MAMMAL?\n",
+    "IS IT A WHALE?\n",
+    "WHY NOT TRY ANOTHER ANIMAL?\n" + THINKING_PROMPT,
+    "DOES IT SWIM?\n",
+    "IS IT A BIRD?\n",
+    "THE ANIMAL YOU WERE THINKING OF WAS A?\n",
+    "I ALREADY KNOW A FISH. WHY NOT TRY ANOTHER ANIMAL?\n" + THINKING_PROMPT,
+    "ANIMALS I ALREADY KNOW ARE:\n"
+    + format_tabbed_text(["BIRD", "FISH", "WHALE"]) + THINKING_PROMPT,
+    "GAME OVER\n",
+    ]
+
+
+def play(game: AnimalGame, lines) -> str:
+    """Plays lines of input and returns the transcript of the game."""
+    transcript = [game.start()]
+    for line in lines:
+        transcript.append(game.send(line))
+    return "".join(transcript)
+
+
+def test_scripted_game():
+    game = AnimalGame()
+    replies = [game.start()] + [game.send(line) for line in SCRIPT]
+    assert replies[0].endswith(TRANSCRIPT[0])
+    assert replies[1:] == TRANSCRIPT[1:]
+    assert game.finished
+    assert game.tree.walk(["true", "true"]) == game.tree.leaves["WHALE"]
+    assert game.tree.animal_names() == ["BIRD", "FISH", "WHALE"]
+
+
+def test_console_game_matches_state_machine(monkeypatch, tmp_path):
+    expected = play(AnimalGame(), SCRIPT)
+    lines = iter(SCRIPT)
+    monkeypatch.setattr("builtins.input", lambda: next(lines))
+    monkeypatch.setattr(
+        "sys.argv", ["animal.py", "--store", str(tmp_path)]
+        )
+    with redirect_output(MemorySink()) as sink:
+        animal.main()
+    assert sink.getvalue() == CLEAR_SEQUENCE + expected
+
+    store = AnimalStore(str(tmp_path))
+    tree = store.load()
+    store.close()
+    learned = AnimalTree()
+    learned.insert(learned.walk(["true"]), "WHALE", "IS IT A MAMMAL", "YES")
+    assert tree == learned
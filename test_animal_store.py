@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+from animal_store import (
+    JOURNAL_MAGIC, JOURNAL_NAME, SNAPSHOT_MAGIC, SNAPSHOT_NAME, AnimalStore,
+    encode_entry, encode_tree,
+    )
+from animal_tree import AnimalTree
+
+# Checks on the snapshot and journal of animals - load() replays the
+# journal over the snapshot, drops a torn or corrupt journal line, and
+# skips a journal already compacted into the snapshot by a compaction that
+# crashed before starting the new journal.
+
+# usage: python -m pytest test_animal_store.py
+
+# Animals learned, as the path to the animal guessed, the new animal, its
+# question and its answer
+LEARNED = [
+    (["true"], "WHALE", "IS IT A MAMMAL", "YES"),
+    (["false"], "BAT", "IS IT A MAMMAL", "YES"),
+    (["true", "false"], "SHARK", "DOES IT BITE", "YES"),
+    (["false", "false"], "PENGUIN", "CAN IT FLY", "NO"),
+    ]
+
+
+def learn(tree: AnimalTree, learned) -> AnimalTree:
+    """Inserts animals into a tree, returning the tree."""
+    for path, new_animal, new_question, new_answer in learned:
+        tree.insert(tree.walk(path), new_animal, new_question, new_answer)
+    return tree
+
+
+def write_snapshot(directory, tree: AnimalTree, generation: int) -> None:
+    """Writes the snapshot of a tree, as compaction does."""
+    with open(os.path.join(directory, SNAPSHOT_NAME), "w") as snapshot:
+        snapshot.write(f"{SNAPSHOT_MAGIC} {generation}\n")
+        snapshot.writelines(line + "\n" for line in encode_tree(tree))
+
+
+def write_journal(directory, generation: int, learned, tail="") -> str:
+    """Writes a journal of animals learned followed by a tail, returning
+    its path."""
+    path = os.path.join(directory, JOURNAL_NAME)
+    with open(path, "w", newline="") as journal:
+        journal.write(f"{JOURNAL_MAGIC} {generation}\n")
+        journal.writelines(encode_entry(*entry) for entry in learned)
+        journal.write(tail)
+    return path
+
+
+def load(directory) -> AnimalTree:
+    """Loads the tree kept in a directory."""
+    store = AnimalStore(str(directory))
+    try:
+        return store.load()
+    finally:
+        store.close()
+
+
+def test_learned_animals_load_back(tmp_path):
+    store = AnimalStore(str(tmp_path), compact_every=3)
+    tree = store.load()
+    for path, new_animal, new_question, new_answer in LEARNED:
+        tree.insert(tree.walk(path), new_animal, new_question, new_answer)
+        store.add(tree, path, new_animal, new_question, new_answer)
+    store.close()
+    # Three animals were compacted into the snapshot and one journalled
+    assert (store.generation, store.entries) == (1, 1)
+    assert load(tmp_path) == learn(AnimalTree(), LEARNED)
+
+
+def test_journal_is_replayed_over_snapshot(tmp_path):
+    write_snapshot(tmp_path, learn(AnimalTree(), LEARNED[:2]), 4)
+    write_journal(tmp_path, 4, LEARNED[2:])
+    store = AnimalStore(str(tmp_path))
+    tree = store.load()
+    store.close()
+    assert tree == learn(AnimalTree(), LEARNED)
+    assert (store.generation, store.entries) == (4, 2)
+
+
+@pytest.mark.parametrize("tail", [
+    encode_entry(*LEARNED[3])[:-1],
+    encode_entry(*LEARNED[3])[:12],
+    "0000000" + encode_entry(*LEARNED[3])[7:],
+    "not a journal line\n",
+    ])
+def test_torn_or_corrupt_line_is_dropped(tmp_path, tail):
+    path = write_journal(tmp_path, 0, LEARNED[:3], tail)
+    kept = os.path.getsize(path) - len(tail)
+    assert load(tmp_path) == learn(AnimalTree(), LEARNED[:3])
+    assert os.path.getsize(path) == kept
+
+    # New animals follow the last complete line
+    store = AnimalStore(str(tmp_path))
+    tree = store.load()
+    path, new_animal, new_question, new_answer = LEARNED[3]
+    tree.insert(tree.walk(path), new_animal, new_question, new_answer)
+    store.add(tree, path, new_animal, new_question, new_answer)
+    store.close()
+    assert load(tmp_path) == learn(AnimalTree(), LEARNED)
+
+
+def test_lines_after_corrupt_line_are_dropped(tmp_path):
+    lines = [encode_entry(*entry) for entry in LEARNED]
+    lines[1] = lines[1].replace("BAT", "CAT")
+    with open(os.path.join(tmp_path, JOURNAL_NAME), "w") as journal:
+        journal.write(f"{JOURNAL_MAGIC} 0\n")
+        journal.writelines(lines)
+    assert load(tmp_path) == learn(AnimalTree(), LEARNED[:1])
+
+
+def test_older_journal_is_skipped_after_crashed_compaction(tmp_path):
+    # The crash came after the snapshot of generation 2 was written but
+    # before the journal of generation 1 it holds was replaced
+    write_snapshot(tmp_path, learn(AnimalTree(), LEARNED), 2)
+    path = write_journal(tmp_path, 1, LEARNED[2:])
+    store = AnimalStore(str(tmp_path))
+    tree = store.load()
+    store.close()
+    assert tree == learn(AnimalTree(), LEARNED)
+    assert (store.generation, store.entries) == (2, 0)
+    with open(path) as journal:
+        assert journal.read() == f"{JOURNAL_MAGIC} 2\n"
+
+
+def test_snapshot_of_something_else_is_rejected(tmp_path):
+    with open(os.path.join(tmp_path, SNAPSHOT_NAME), "w") as snapshot:
+        snapshot.write("MAZE 1\n")
+    with pytest.raises(ValueError):
+        load(tmp_path)
@@ -0,0 +1,118 @@
+import pytest
+
+from animal_tree import ANIMAL_TAG, NO_CHILD, QUESTION_TAG, AnimalTree
+
+# Checks on the array-backed animal tree - insert turns the animal guessed
+# into a question in place, and from_preorder rebuilds any tree preorder
+# yields, however deep, and rejects lines that are not a single tree. The
+# index of names follows each animal to its node and lists the names
+# sorted.
+
+# usage: python -m pytest test_animal_tree.py
+
+
+def deep_tree(depth: int) -> AnimalTree:
+    """Returns a tree whose NO answers lead down a chain of questions."""
+    tree = AnimalTree()
+    node = tree.walk(["false"])
+    for level in range(depth):
+        tree.insert(node, f"ANIMAL {level}", f"QUESTION {level}", "YES")
+        node = tree.no[node]
+    return tree
+
+
+def test_insert_turns_guess_into_question():
+    tree = AnimalTree()
+    guessed = tree.walk(["true"])
+    added = tree.insert(guessed, "WHALE", "IS IT A MAMMAL", "YES")
+    assert len(tree) == 5
+    assert tree.text[guessed] == "IS IT A MAMMAL"
+    assert not tree.is_animal(guessed)
+    assert tree.walk(["true", "true"]) == added
+    assert tree.text[added] == "WHALE"
+    assert tree.text[tree.walk(["true", "false"])] == "FISH"
+    assert tree.yes[added] == tree.no[added] == NO_CHILD
+
+
+def test_insert_for_no_answer():
+    tree = AnimalTree()
+    added = tree.insert(tree.walk(["false"]), "BAT", "DOES IT SING", "NO")
+    assert tree.walk(["false", "false"]) == added
+    assert tree.text[tree.walk(["false", "true"])] == "BIRD"
+
+
+def test_insert_rejects_question():
+    tree = AnimalTree()
+    with pytest.raises(ValueError):
+        tree.insert(tree.ROOT, "WHALE", "IS IT A MAMMAL", "YES")
+
+
+def test_walk_past_animal_is_rejected():
+    with pytest.raises(ValueError):
+        AnimalTree().walk(["true", "true"])
+
+
+def test_deep_tree_round_trips_through_preorder():
+    # Far deeper than the recursion limit
+    tree = deep_tree(10_000)
+    lines = list(tree.preorder())
+    assert len(lines) == len(tree) == 20_003
+    rebuilt = AnimalTree.from_preorder(lines)
+    assert rebuilt == tree
+    assert list(rebuilt.preorder()) == lines
+
+
+@pytest.mark.parametrize("lines", [
+    [],
+    [ANIMAL_TAG + "FISH"],
+    [QUESTION_TAG + "DOES IT SWIM", ANIMAL_TAG + "FISH"],
+    [QUESTION_TAG + "DOES IT SWIM", ANIMAL_TAG + "FISH", "BIRD"],
+    [
+        QUESTION_TAG + "DOES IT SWIM", ANIMAL_TAG + "FISH",
+        ANIMAL_TAG + "BIRD", ANIMAL_TAG + "CAT",
+        ],
+    ])
+def test_malformed_preorder_is_rejected(lines):
+    with pytest.raises(ValueError):
+        AnimalTree.from_preorder(lines)
+
+
+def test_index_follows_guessed_animal_to_new_node():
+    tree = AnimalTree()
+    guessed = tree.walk(["true"])
+    added = tree.insert(guessed, "WHALE", "IS IT A MAMMAL", "YES")
+    assert tree.leaves["FISH"] == tree.walk(["true", "false"]) != guessed
+    assert tree.leaves["WHALE"] == added
+    assert tree.leaves["BIRD"] == tree.walk(["false"])
+    assert "WHALE" in tree and "IS IT A MAMMAL" not in tree
+    for name, node in tree.leaves.items():
+        assert tree.is_animal(node) and tree.text[node] == name
+
+
+def test_duplicate_name_is_indexed_once():
+    tree = AnimalTree()
+    first = tree.insert(tree.walk(["true"]), "WHALE", "IS IT BIG", "YES")
+    tree.insert(tree.walk(["false"]), "WHALE", "IS IT A MAMMAL", "YES")
+    assert tree.leaves["WHALE"] == first
+    assert tree.animals == 3
+    assert tree.animal_names() == ["BIRD", "FISH", "WHALE"]
+
+    # Loading indexes a name in the tree twice once too
+    rebuilt = AnimalTree.from_preorder(list(tree.preorder()))
+    assert rebuilt.text[rebuilt.leaves["WHALE"]] == "WHALE"
+    assert rebuilt.animal_names() == ["BIRD", "FISH", "WHALE"]
+
+
+def test_pages_are_sorted_after_merging_new_names():
+    tree = AnimalTree()
+    assert tree.animal_names() == ["BIRD", "FISH"]
+    tree.insert(tree.walk(["true"]), "WHALE", "IS IT A MAMMAL", "YES")
+    tree.insert(tree.walk(["false"]), "ANT", "IS IT SMALL", "YES")
+    assert tree.animal_page(0, 2) == ["ANT", "BIRD"]
+    tree.insert(tree.walk(["true", "true"]), "DOLPHIN", "IS IT GREY", "NO")
+    tree.insert(tree.walk(["false", "false"]), "CROW", "IS IT BLACK", "YES")
+    names = ["ANT", "BIRD", "CROW", "DOLPHIN", "FISH", "WHALE"]
+    assert tree.animal_names() == names
+    assert tree.animal_page(2, 3) == names[2:5]
+    assert tree.animal_page(5, 10) == names[5:]
+    assert tree.animal_page(6, 10) == []
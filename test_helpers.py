@@ -0,0 +1,192 @@
+import pytest
+
+from helpers import (
+    MemorySink, Output, Terminal, changed_spans, get_output, print_text,
+    redirect_output,
+    )
+
+# Checks on helpers - Output passes its buffer on to the sink as each flush
+# policy says, cells added with Terminal.add_character keep any string, as
+# they did before rows were held as bytes, and Terminal.present() sends
+# only the spans of each row changed since the last frame.
+
+# usage: python -m pytest test_helpers.py
+
+
+def displayed(terminal: Terminal) -> str:
+    """Returns the text written by Terminal.display()."""
+    with redirect_output(MemorySink()) as sink:
+        terminal.display()
+    return sink.getvalue()
+
+
+def test_line_policy_flushes_on_newline():
+    sink = MemorySink()
+    output = Output(sink, "line")
+    output.write("ONE ")
+    output.write("TWO")
+    assert sink.chunks == []
+    output.write(" THREE\nFOUR")
+    assert sink.chunks == ["ONE TWO THREE\nFOUR"]
+
+
+def test_size_policy_flushes_full_buffer():
+    sink = MemorySink()
+    output = Output(sink, "size", buffer_size=10)
+    output.write("12345\n")
+    output.write("678")
+    assert sink.chunks == []
+    output.write("9X")
+    assert sink.chunks == ["12345\n6789X"]
+    output.write("Y")
+    output.flush()
+    assert sink.chunks == ["12345\n6789X", "Y"]
+
+
+def test_manual_policy_waits_for_flush():
+    sink = MemorySink()
+    output = Output(sink, "manual", buffer_size=1)
+    for line in ("A\n", "B" * 20, "C\n"):
+        output.write(line)
+    assert sink.chunks == []
+    output.flush()
+    output.flush()
+    assert sink.chunks == ["A\n" + "B" * 20 + "C\n"]
+
+
+def test_flush_policy_defaults_to_size_off_a_terminal():
+    assert Output(MemorySink()).flush_policy == "size"
+    with pytest.raises(ValueError):
+        Output(MemorySink(), "never")
+
+
+def test_write_bytes_follows_buffered_text():
+    sink = MemorySink()
+    output = Output(sink, "manual")
+    output.write("TEXT ")
+    output.write_bytes(b"\xe9")
+    assert sink.chunks == ["TEXT ", "\xe9"]
+
+
+def test_redirect_output_captures_and_restores():
+    previous = get_output()
+    with redirect_output(MemorySink()) as sink:
+        print_text("HELLO", 3, sep=", ")
+        assert sink.chunks == []
+    assert sink.getvalue() == "HELLO, 3\n"
+    assert get_output() is previous
+
+
+def presented(terminal: Terminal) -> str:
+    """Returns the text written for the next frame by Terminal.present()."""
+    sink = MemorySink()
+    terminal.present(sink)
+    return sink.getvalue()
+
+
+@pytest.mark.parametrize("previous, current, spans", [
+    (b"abcdefghijklmnop", b"abcdefghijklmnop", []),
+    (b"abcdefghijklmnop", b"Xbcdefghijklmnop", [(0, 1)]),
+    (b"abcdefghijklmnop", b"abcdefghijklmnoX", [(15, 16)]),
+    # Fewer than 8 unchanged characters between changes are resent
+    (b"abcdefghijklmnop", b"XbcdefgXijklmnop", [(0, 8)]),
+    (b"abcdefghijklmnop", b"XbcdefghiXklmnop", [(0, 1), (9, 10)]),
+    (b"abcdefghijklmnop", b"XbcdefgXijklmnoX", [(0, 16)]),
+    (bytearray(b"    "), bytearray(b"ab  "), [(0, 2)]),
+    ])
+def test_changed_spans(previous, current, spans):
+    assert changed_spans(previous, current) == spans
+
+
+def test_changed_spans_gap():
+    assert changed_spans(b"abcdef", b"XbcXeX", gap=2) == [(0, 1), (3, 6)]
+    assert changed_spans(b"abcdef", b"XbcXeX", gap=1) == [
+        (0, 1), (3, 4), (5, 6),
+        ]
+
+
+def test_present_sends_changed_spans():
+    terminal = Terminal(12)
+    terminal.write_string(0, 0, "HELLO")
+    terminal.write_string(2, 3, "AB")
+    # The first frame clears the console and draws what is not blank
+    frame = "\x1b[H\x1b[2J\x1b[1;1HHELLO\x1b[3;4HAB\x1b[4;1H"
+    assert presented(terminal) == frame
+    assert terminal.last_frame_bytes == len(frame)
+    # An unchanged frame only moves the cursor below the screen
+    assert presented(terminal) == "\x1b[4;1H"
+    terminal.write_string(0, 0, "JELLO")
+    terminal.write_string(0, 10, "Z")
+    assert presented(terminal) == "\x1b[1;1HJ\x1b[1;11HZ\x1b[4;1H"
+    assert terminal.frames == 3
+
+
+def test_present_after_reset_clears_removed_rows():
+    terminal = Terminal(12)
+    terminal.write_string(0, 0, "JELLO     Z")
+    terminal.write_string(2, 3, "AB")
+    presented(terminal)
+    terminal.reset()
+    terminal.write_string(0, 0, "HI")
+    # Row 1 is redrawn up to its last change, rows 2 and 3 are cleared
+    assert presented(terminal) == (
+        "\x1b[1;1HHI         \x1b[2;1H\x1b[2K\x1b[3;1H\x1b[2K\x1b[2;1H"
+        )
+    assert presented(terminal) == "\x1b[2;1H"
+    # Rows added again are drawn against blank rows
+    terminal.write_string(1, 0, "X")
+    assert presented(terminal) == "\x1b[2;1HX\x1b[3;1H"
+
+
+@pytest.mark.parametrize("char", ["█", "€", "│", "", "ab"])
+def test_add_character_keeps_any_string(char):
+    terminal = Terminal(5)
+    terminal.add_character(0, 0, "x")
+    terminal.add_character(0, 2, char)
+    terminal.add_character(1, 4, char)
+    assert terminal.text_cells == {0: {2: char}, 1: {4: char}}
+    assert displayed(terminal) == f"x {char}  \n    {char}\n"
+
+
+def test_add_character_stores_latin_1_as_bytes():
+    terminal = Terminal(3)
+    terminal.add_character(0, 1, "\xe9")
+    assert terminal.screen == [bytearray(b" \xe9 ")]
+    assert terminal.text_cells == {}
+    assert displayed(terminal) == " \xe9 \n"
+
+
+def test_overwriting_a_text_cell_forgets_it():
+    terminal = Terminal(4)
+    terminal.add_character(0, 0, "█")
+    terminal.add_character(0, 3, "█")
+    terminal.add_character(0, 0, "#")
+    assert terminal.text_cells == {0: {3: "█"}}
+    terminal.write_string(0, 2, "ab")
+    assert terminal.text_cells == {}
+    assert displayed(terminal) == "# ab\n"
+
+
+def test_reset_forgets_text_cells():
+    terminal = Terminal(2)
+    terminal.add_character(2, 1, "█")
+    terminal.reset()
+    assert terminal.text_cells == {}
+    assert displayed(terminal) == "  \n"
+
+
+def test_present_redraws_changed_text_cells():
+    terminal = Terminal(4)
+    terminal.add_character(0, 1, "█")
+    sink = MemorySink()
+    terminal.present(sink)
+    assert sink.getvalue() == "\x1b[H\x1b[2J\x1b[1;2H█\x1b[2;1H"
+    # The byte held for the cell does not change, only its text
+    terminal.add_character(0, 1, "▒")
+    sink = MemorySink()
+    terminal.present(sink)
+    assert sink.getvalue() == "\x1b[1;2H▒\x1b[2;1H"
+    terminal.add_character(0, 1, "?")
+    sink = MemorySink()
+    terminal.present(sink)
+    assert sink.getvalue() == "\x1b[1;2H?\x1b[2;1H"
@@ -0,0 +1,95 @@
+from collections import deque
+
+import pytest
+
+from maze import (
+    ALGORITHMS, DOWN, LEFT, RIGHT, UP, Maze, render_maze, render_maze_numpy,
+    stream_maze,
+)
+
+# Checks on the maze engine - every algorithm carves a perfect maze, and
+# the other renderers produce the same text as render_maze.
+
+# usage: python -m pytest test_maze.py
+
+SIZES = [(2, 2), (2, 9), (9, 2), (7, 5), (23, 17)]
+SEEDS = range(5)
+
+
+def assert_perfect(maze: Maze) -> None:
+    '''
+    Asserts that a maze is perfect - its wall openings are recorded on both
+    sides of each wall and never lead outside the maze, and the openings
+    form a spanning tree of the cells, with exactly cells - 1 openings
+    joining every cell to the entrance.
+    '''
+    width, height, walls = maze.width, maze.height, maze.walls
+    neighbours = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+    opposite = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+    openings = 0
+    for cell in range(width * height):
+        row, col = divmod(cell, width)
+        assert not walls[cell] & UP or row > 0
+        assert not walls[cell] & DOWN or row < height - 1
+        assert not walls[cell] & LEFT or col > 0
+        assert not walls[cell] & RIGHT or col < width - 1
+        for direction, offset in neighbours.items():
+            if walls[cell] & direction:
+                assert walls[cell + offset] & opposite[direction]
+                openings += 1
+    # Each opening was counted from both sides
+    assert openings // 2 == width * height - 1
+
+    start = maze.entrance_col - 1
+    reached = {start}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for direction, offset in neighbours.items():
+            if walls[cell] & direction and cell + offset not in reached:
+                reached.add(cell + offset)
+                queue.append(cell + offset)
+    assert len(reached) == width * height
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+@pytest.mark.parametrize("width, height", SIZES)
+def test_algorithms_carve_perfect_mazes(algorithm, width, height):
+    for seed in SEEDS:
+        assert_perfect(Maze(width, height, seed, algorithm).generate())
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_same_seed_carves_same_maze(width, height):
+    for algorithm in ALGORITHMS:
+        first = Maze(width, height, 3, algorithm).generate()
+        second = Maze(width, height, 3, algorithm).generate()
+        assert first.walls == second.walls
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_numpy_renderer_matches_render_maze(width, height):
+    pytest.importorskip("numpy")
+    for seed in SEEDS:
+        maze = Maze(width, height, seed).generate()
+        text = "".join(line + "\n" for line in render_maze(maze))
+        assert render_maze_numpy(maze) == text.encode("ascii")
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_stream_maze_matches_render_maze(width, height):
+    for seed in SEEDS:
+        maze = Maze(width, height, seed, "eller").generate()
+        assert list(stream_maze(width, height, seed)) == \
+            list(render_maze(maze))
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_steps_carve_same_maze_as_generate(width, height):
+    for seed in SEEDS:
+        plain = Maze(width, height, seed).generate()
+        watched = Maze(width, height, seed)
+        steps = list(watched.steps())
+        assert watched.walls == plain.walls
+        assert sum(step.kind == "carve" for step in steps) == \
+            width * height - 1
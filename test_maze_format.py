@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from maze import Maze, render_maze
+from maze_format import load_maze, render_viewport, save_maze
+
+# Checks on the binary maze format - saved mazes load back unchanged, and
+# every viewport is the matching crop of render_maze.
+
+# usage: python -m pytest test_maze_format.py
+
+SIZES = [(2, 2), (3, 7), (8, 5), (11, 11)]
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_saved_maze_loads_unchanged(tmp_path, width, height):
+    maze = Maze(width, height, 7).generate()
+    path = os.path.join(tmp_path, "maze.bin")
+    save_maze(maze, path)
+    loaded = load_maze(path)
+    assert (loaded.width, loaded.height) == (width, height)
+    assert (loaded.entrance_col, loaded.exit_col) == \
+        (maze.entrance_col, maze.exit_col)
+    assert loaded.walls == maze.walls
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_viewports_crop_render_maze(tmp_path, width, height):
+    maze = Maze(width, height, 11).generate()
+    path = os.path.join(tmp_path, "maze.bin")
+    save_maze(maze, path)
+    lines = list(render_maze(maze))
+    for row in range(1, height + 1):
+        for col in range(1, width + 1):
+            for rows in range(1, height - row + 2):
+                for cols in range(1, width - col + 2):
+                    expected = [
+                        line[(col - 1) * 3:(col - 1 + cols) * 3 + 1]
+                        for line in
+                        lines[(row - 1) * 2:(row - 1 + rows) * 2 + 1]
+                        ]
+                    assert list(
+                        render_viewport(path, row, col, rows, cols)
+                        ) == expected
+
+
+def test_viewport_outside_maze_is_rejected(tmp_path):
+    path = os.path.join(tmp_path, "maze.bin")
+    save_maze(Maze(4, 4, 1).generate(), path)
+    with pytest.raises(ValueError):
+        list(render_viewport(path, 3, 1, 3, 1))
+
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from maze import ALGORITHMS, DOWN, LEFT, RIGHT, UP, Maze
+from maze_format import load_maze, save_maze
+from maze_solver import solution_mask, solve_maze
+
+# Checks on the maze solver - the one-way and bidirectional searches find
+# the same route, which runs through open walls from the entrance to the
+# exit, for every algorithm and for mazes loaded from a file.
+
+# usage: python -m pytest test_maze_solver.py
+
+SIZES = [(2, 2), (3, 7), (8, 5), (11, 11), (40, 3)]
+
+
+def assert_route(maze: Maze, route) -> None:
+    '''
+    Asserts that a route starts at the entrance, ends at the exit and only
+    moves between neighbouring cells through knocked down walls.
+    '''
+    width = maze.width
+    moves = {-width: UP, width: DOWN, -1: LEFT, 1: RIGHT}
+    assert route[0] == maze.entrance_col - 1
+    assert route[-1] == (maze.height - 1) * width + maze.exit_col - 1
+    for cell, after in zip(route, route[1:]):
+        assert maze.walls[cell] & moves[after - cell]
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_bidirectional_search_finds_same_route(algorithm):
+    for seed in range(10):
+        for width, height in SIZES:
+            maze = Maze(width, height, seed, algorithm).generate()
+            route = solve_maze(maze)
+            assert_route(maze, route)
+            assert solve_maze(maze, bidirectional=True) == route
+
+
+def test_loaded_maze_solves_the_same(tmp_path):
+    maze = Maze(30, 20, 5).generate()
+    path = os.path.join(tmp_path, "maze.bin")
+    save_maze(maze, path)
+    assert solve_maze(load_maze(path)) == solve_maze(maze)
+
+
+def test_solution_mask_marks_route():
+    maze = Maze(9, 6, 2).generate()
+    route = solve_maze(maze)
+    mask = solution_mask(maze, route)
+    assert [cell for cell, on in enumerate(mask) if on] == sorted(route)
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_unreachable_exit_is_rejected(bidirectional):
+    # Every wall of an uncarved maze is standing
+    maze = Maze(4, 4, 1)
+    with pytest.raises(ValueError):
+        solve_maze(maze, bidirectional=bidirectional)